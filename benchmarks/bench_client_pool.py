@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Requests/sec of Client.create_event against a local stub server, with a new
+PoolManager per request (the old behaviour) and with the pooled Client.
+
+    python -m benchmarks.bench_client_pool [requests]
+"""
+
+import sys
+import time
+
+import urllib3
+
+from epr.client import Client
+
+from .stub import StubServer
+
+
+class UnpooledClient(Client):
+    """Client that builds a throwaway PoolManager on every call"""
+
+    def _post(self, url, data):
+        http = urllib3.PoolManager(timeout=self.timeout)
+        encoded_data = self._encode(data)
+        response = http.request("POST", url, body=encoded_data, headers=self.headers)
+        return response.data
+
+
+def respond(headers, body):
+    return {"data": {"create_event": "01HPW652DSJBHR5K4KCZQ97GJP"}}
+
+
+def run(client, count):
+    params = {"name": "foo", "version": "1.0.0", "payload": {"name": "foo"}}
+    start = time.perf_counter()
+    for _ in range(count):
+        client.create_event(params=params)
+    return count / (time.perf_counter() - start)
+
+
+def main(count=2000):
+    with StubServer(respond, record_requests=False) as server:
+        before = run(UnpooledClient(server.url), count)
+        with Client(server.url) as client:
+            after = run(client, count)
+    print(f"unpooled: {before:10.1f} req/s")
+    print(f"pooled:   {after:10.1f} req/s")
+    print(f"speedup:  {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
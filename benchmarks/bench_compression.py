@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Bytes on the wire and end-to-end latency of create_event (compressed request
+bodies) and search_events (compressed responses) against a local stub
+server, for a range of payload sizes.
+
+    python -m benchmarks.bench_compression [requests]
+"""
+
+import json
+import sys
+import time
+
+from epr.client import Client
+from epr.models import Event
+
+from .stub import StubServer
+
+SIZES = (1, 10, 100, 1000)
+
+
+def payload(kib):
+    entry = {"path": "dist/foo-1.0.0-x86_64.rpm", "digest": "sha256:" + "ab" * 32, "size": 1048576}
+    count = max(1, kib * 1024 // len(json.dumps(entry)))
+    return {"artifacts": [dict(entry, index=i) for i in range(count)]}
+
+
+def run(server, client, fn, count):
+    server.reset()
+    start = time.perf_counter()
+    for _ in range(count):
+        fn(client)
+    elapsed = (time.perf_counter() - start) / count
+    return server.bytes_in / count, server.bytes_out / count, elapsed * 1000
+
+
+def bench_size(kib, count):
+    data = payload(kib)
+    event = Event(name="foo", version="1.0.0", payload=data)
+    events = {"data": {"events": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP", "payload": data}]}}
+    with StubServer(lambda headers, body: events, compress_responses=True, record_requests=False) as server:
+        for compress in (None, "gzip"):
+            with Client(server.url, compress=compress) as client:
+                sent, _, ms = run(server, client, lambda c: c.create_event(params=event), count)
+            label = f"create {kib} KiB {compress or 'identity'}"
+            print(f"{label:28} {sent:10.0f} {'':>10} {ms:8.2f}")
+    for compress_responses in (False, True):
+        with StubServer(
+            lambda headers, body: events, compress_responses=compress_responses, record_requests=False
+        ) as server:
+            with Client(server.url) as client:
+                _, recv, ms = run(server, client, lambda c: c.search_events(params={"name": "foo"}), count)
+            label = f"search {kib} KiB {'gzip' if compress_responses else 'identity'}"
+            print(f"{label:28} {'':>10} {recv:10.0f} {ms:8.2f}")
+
+
+def main(count=50):
+    print(f"{'case':28} {'sent B':>10} {'recv B':>10} {'ms/req':>8}")
+    for kib in SIZES:
+        bench_size(kib, count)
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
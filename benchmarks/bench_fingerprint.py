@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Fingerprinting 100k receivers, and groups with many event_receiver_ids,
+with the original seed-string implementation, the v1 engine and
+fingerprint_many on a process pool.
+
+    python -m benchmarks.bench_fingerprint [receivers] [processes]
+"""
+
+import hashlib
+import os
+import sys
+import time
+
+from epr.fingerprint import GroupFingerprint, ReceiverFingerprint, fingerprint_many
+
+
+def seed_fingerprint(data, keys):
+    seed = "v1"
+    for k in keys:
+        v = data.get(k)
+        if isinstance(v, (list, tuple)):
+            for x in v:
+                seed += " " + str(x)
+        elif isinstance(v, dict):
+            for x, y in v.items():
+                seed += " " + str(x) + " " + str(y)
+        else:
+            seed += " " + str(v)
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+
+def timed(label, fn, baseline=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"{baseline / elapsed:6.2f}x" if baseline else ""
+    print(f"{label:36} {elapsed * 1000:9.1f} ms {speedup}")
+    return result, elapsed
+
+
+def main(count=100000, processes=None):
+    processes = processes or os.cpu_count() or 2
+    receivers = [
+        dict(name=f"receiver-{i}", type="dev.events.foo", version="1.0.0", description="The Foo of Brixton")
+        for i in range(count)
+    ]
+    old, baseline = timed("seed string", lambda: [seed_fingerprint(r, ReceiverFingerprint.keys) for r in receivers])
+    new, _ = timed("v1 engine", lambda: fingerprint_many(receivers), baseline)
+    pooled, _ = timed(
+        f"v1 engine, {processes} processes",
+        lambda: fingerprint_many(receivers, processes=processes, threshold=0),
+        baseline,
+    )
+    assert old == new == pooled
+
+    ids = [f"01HPW652DSJBHR5K4KCZ{i:06d}" for i in range(20000)]
+    groups = [
+        dict(
+            name=f"group-{i}",
+            type="dev.events.foo",
+            version="1.0.0",
+            description="foo",
+            enabled=True,
+            event_receiver_ids=ids,
+        )
+        for i in range(20)
+    ]
+    old, baseline = timed(
+        "seed string, 20 groups x 20k ids", lambda: [seed_fingerprint(g, GroupFingerprint.keys) for g in groups]
+    )
+    new, _ = timed("v1 engine, 20 groups x 20k ids", lambda: fingerprint_many(groups, kind=GroupFingerprint), baseline)
+    assert old == new
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Throughput of hashing a directory of build artifacts with the original
+sequential 64 KiB reader against hash_files on a thread pool.
+
+    python -m benchmarks.bench_hash [files] [MiB per file] [workers]
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from epr.common import hash_files
+
+
+def seed_hash_file(path):
+    BLOCKSIZE = 65536
+    hasher = hashlib.sha256()
+    with open(path, "rb") as fh:
+        buf = fh.read(BLOCKSIZE)
+        while len(buf) > 0:
+            hasher.update(buf)
+            buf = fh.read(BLOCKSIZE)
+    return "sha256:" + hasher.hexdigest()
+
+
+def main(count=32, mib=16, workers=None):
+    workers = workers or os.cpu_count() or 1
+    directory = tempfile.mkdtemp(prefix="epr-bench-hash-")
+    try:
+        block = os.urandom(1024 * 1024)
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, f"artifact-{i:04d}.bin")
+            with open(path, "wb") as fh:
+                for j in range(mib):
+                    fh.write(block[j:] + block[:j])
+            paths.append(path)
+        total = count * mib
+        # the first pass warms the page cache so both runs read from memory
+        for path in paths:
+            seed_hash_file(path)
+
+        start = time.perf_counter()
+        old = [(path, seed_hash_file(path)) for path in paths]
+        before = time.perf_counter() - start
+        start = time.perf_counter()
+        new = list(hash_files(paths, workers=workers))
+        after = time.perf_counter() - start
+        assert old == new
+        print(f"{count} files, {total} MiB")
+        print(f"sequential 64 KiB reads   {total / before:8.1f} MiB/s")
+        print(f"hash_files, {workers:2d} workers   {total / after:8.1f} MiB/s  {before / after:5.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+as_dict and as_dict_query on Events, EventReceivers and EventReceiverGroups
+with the generated accessors against dataclasses.asdict.
+
+    python -m benchmarks.bench_models_asdict [calls]
+"""
+
+import dataclasses
+import sys
+import timeit
+from functools import partial
+
+from epr.models import Event, EventReceiver, EventReceiverGroup
+
+
+def old_as_dict_query(model):
+    return {k: v for k, v in dataclasses.asdict(model).items() if v}
+
+
+def main(count=100000):
+    models = [
+        Event(
+            name="foo",
+            version="1.0.0",
+            release="2024.01.01",
+            platform_id="x86_64-gnu-linux-9",
+            package="rpm",
+            description="The Foo of Brixton",
+            payload={"name": "foo", "tags": ["a", "b"]},
+            success=True,
+            event_receiver_id="01HPW652DSJBHR5K4KCZQ97GJP",
+        ),
+        EventReceiver(
+            name="foo",
+            type="dev.events.foo",
+            version="1.0.0",
+            description="The Foo of Brixton",
+            schema={"type": "object", "properties": {"name": {"type": "string"}}},
+        ),
+        EventReceiverGroup(
+            name="foo",
+            type="dev.events.foo",
+            version="1.0.0",
+            description="The Foo of Brixton",
+            enabled=True,
+            event_receiver_ids=["01HPW652DSJBHR5K4KCZQ97GJP"] * 10,
+        ),
+    ]
+    for model in models:
+        name = type(model).__name__
+        cases = [
+            ("as_dict", partial(dataclasses.asdict, model), model.as_dict),
+            ("as_dict_query", partial(old_as_dict_query, model), model.as_dict_query),
+        ]
+        for label, old, new in cases:
+            assert old() == new()
+            before = timeit.timeit(old, number=count)
+            after = timeit.timeit(new, number=count)
+            print(
+                f"{name:20} {label:14} {before * 1e6 / count:7.2f} us -> {after * 1e6 / count:5.2f} us  {before / after:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
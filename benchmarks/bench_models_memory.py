@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Memory used by one million Events built as slotted models and as the
+equivalent __dict__-based dataclass, measured with tracemalloc.
+
+    python -m benchmarks.bench_models_memory [events]
+"""
+
+import dataclasses
+import gc
+import sys
+import tracemalloc
+
+from epr.models import Event
+
+
+def dict_model(cls):
+    """Rebuild a model as a plain dataclass with a per-instance __dict__"""
+    fields = []
+    for f in dataclasses.fields(cls):
+        kwargs = {"compare": f.compare}
+        if f.default is not dataclasses.MISSING:
+            kwargs["default"] = f.default
+        if f.default_factory is not dataclasses.MISSING:
+            kwargs["default_factory"] = f.default_factory
+        fields.append((f.name, f.type, dataclasses.field(**kwargs)))
+    return dataclasses.make_dataclass("Dict" + cls.__name__, fields)
+
+
+def measure(cls, count):
+    gc.collect()
+    tracemalloc.start()
+    events = [
+        cls(
+            name="foo",
+            version="1.0.0",
+            release="2024.01.01",
+            platform_id="x86_64-gnu-linux-9",
+            package="rpm",
+            description="The Foo of Brixton",
+            success=True,
+            event_receiver_id="01HPW652DSJBHR5K4KCZQ97GJP",
+        )
+        for _ in range(count)
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return current
+
+
+def main(count=1000000):
+    old = measure(dict_model(Event), count)
+    new = measure(Event, count)
+    mib = 1024 * 1024
+    print(f"__dict__ events: {old / mib:8.1f} MiB  {old / count:6.1f} B/event")
+    print(f"slotted events:  {new / mib:8.1f} MiB  {new / count:6.1f} B/event")
+    print(f"saved:           {(old - new) / mib:8.1f} MiB  {100.0 * (old - new) / old:5.1f}%")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
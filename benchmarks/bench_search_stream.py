@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Peak RSS of walking a large search_events response with the buffered
+search_events path against iter_search_events. Each client runs in its own
+process so the high-water marks do not mix.
+
+    python -m benchmarks.bench_search_stream [events]
+"""
+
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from epr.client import Client
+
+from .stub import StubServer
+
+
+def peak_rss():
+    # kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(mode, url):
+    client = Client(url)
+    before = peak_rss()
+    start = time.perf_counter()
+    count = 0
+    if mode == "buffered":
+        for _ in client.search_events(params={"name": "foo"}, fields=["id"])["data"]["events"]:
+            count += 1
+    else:
+        for _ in client.iter_search_events(params={"name": "foo"}, fields=["id"]):
+            count += 1
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"count": count, "seconds": elapsed, "peak": peak_rss() - before}))
+
+
+def main(count=500000):
+    event = {
+        "id": "01HPW652DSJBHR5K4KCZQ97GJP",
+        "name": "foo",
+        "version": "1.0.0",
+        "release": "2024.01.01",
+        "platform_id": "x86_64-gnu-linux-9",
+        "package": "rpm",
+        "description": "The Foo of Brixton",
+        "success": True,
+        "event_receiver_id": "01HPW652DSJBHR5K4KCZQ97GJP",
+    }
+    body = json.dumps({"data": {"events": [event] * count}}).encode("utf-8")
+    mib = 1024 * 1024
+    print(f"response: {count} events, {len(body) / mib:.1f} MiB")
+    with StubServer(lambda headers, request: body, record_requests=False) as server:
+        for mode in ("buffered", "streaming"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_search_stream", "--child", mode, server.url],
+                check=True,
+                capture_output=True,
+            ).stdout
+            result = json.loads(output)
+            assert result["count"] == count
+            print(f"{mode:10} peak RSS growth {result['peak'] / mib:8.1f} MiB  {result['seconds']:6.2f} s")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:4])
+    else:
+        main(*[int(x) for x in sys.argv[1:]])
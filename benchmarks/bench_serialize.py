@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Encoding time of GraphQL request bodies carrying Events with large payloads:
+the old dataclasses.asdict + json.dumps path against common.json_dumps with
+and without orjson.
+
+    python -m benchmarks.bench_serialize [events] [payload_keys]
+"""
+
+import dataclasses
+import json
+import sys
+import timeit
+
+import mock
+
+from epr import common
+from epr.models import Event, GraphQLQuery
+
+
+class AsdictJSONEncoder(json.JSONEncoder):
+    def default(self, o):
+        if dataclasses.is_dataclass(o):
+            return dataclasses.asdict(o)
+        return super().default(o)
+
+
+def old_encode(query):
+    return json.dumps(query.as_dict(), cls=AsdictJSONEncoder).encode("utf-8")
+
+
+def make_queries(count, payload_keys):
+    payload = {f"artifact-{i}": {"sha256": "0" * 64, "size": i, "tags": ["a", "b", "c"]} for i in range(payload_keys)}
+    return [
+        GraphQLQuery(
+            query="mutation ($obj: CreateEventInput!){create_event(event: $obj)}",
+            variables={"obj": Event(name="foo", version="1.0.0", release=str(i), payload=payload)},
+        )
+        for i in range(count)
+    ]
+
+
+def main(count=200, payload_keys=200):
+    queries = make_queries(count, payload_keys)
+    assert json.loads(old_encode(queries[0])) == json.loads(common.json_dumps(queries[0]))
+    old = min(timeit.repeat(lambda: [old_encode(q) for q in queries], number=1, repeat=5))
+    with mock.patch("epr.common.orjson", None):
+        stdlib = min(timeit.repeat(lambda: [common.json_dumps(q) for q in queries], number=1, repeat=5))
+    fast = None
+    if common.orjson is not None:
+        fast = min(timeit.repeat(lambda: [common.json_dumps(q) for q in queries], number=1, repeat=5))
+    print(f"asdict + json.dumps:  {old * 1000:8.1f} ms")
+    print(f"json_dumps (stdlib):  {stdlib * 1000:8.1f} ms  {old / stdlib:6.2f}x")
+    if fast is not None:
+        print(f"json_dumps (orjson):  {fast * 1000:8.1f} ms  {old / fast:6.2f}x")
+    else:
+        print("json_dumps (orjson):  not installed")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.bytes_in += len(body)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if self.server.requests is not None:
+            self.server.requests.append((self.client_address, dict(self.headers), body))
+        data = self.server.responder(self.headers, body)
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode("utf-8")
+        gzipped = self.server.compress_responses and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            data = gzip.compress(data)
+        self.server.bytes_out += len(data)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(object):
+    """
+    A local EPR stand-in answering every POST with `responder(headers, body)`. Used by the benchmarks and the
+    tests, which also read the recorded `requests`.
+    """
+
+    def __init__(self, responder=None, compress_responses=False, record_requests=True):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self._server.daemon_threads = True
+        self._server.compress_responses = compress_responses
+        self._server.requests = [] if record_requests else None
+        self._server.bytes_in = 0
+        self._server.bytes_out = 0
+        self._server.responder = responder or (lambda headers, body: {"data": {}})
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def bytes_in(self):
+        return self._server.bytes_in
+
+    @property
+    def bytes_out(self):
+        return self._server.bytes_out
+
+    def reset(self):
+        self._server.bytes_in = 0
+        self._server.bytes_out = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
@@ -0,0 +1,778 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+import ssl
+from typing import Any, AsyncIterator, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .cache import ResponseCache
+from .client import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_BYTES,
+    DEFAULT_PAGE_SIZE,
+    PERSISTED_QUERY_NOT_SUPPORTED,
+    BaseClient,
+    _document_hash,
+    _paging_rejected,
+    _persisted_error,
+)
+from .common import decompress, json_loads
+from .models import GraphQLQuery
+from .results import ResultSet
+from .singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncConnectionPool(object):
+    """
+    A small keep-alive HTTP/1.1 connection pool built on asyncio streams.
+
+    read_timeout bounds the whole response, from the end of the request to the last byte of the body, not
+    each read as urllib3's read timeout does.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.maxsize = maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context
+        self._idle = {}
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            ssl_context = self.ssl_context or ssl.create_default_context()
+        return await asyncio.wait_for(asyncio.open_connection(host, port, ssl=ssl_context), self.connect_timeout)
+
+    def _release(self, key, conn):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.maxsize:
+            idle.append(conn)
+        else:
+            conn[1].close()
+
+    async def _read_response(self, reader):
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split(None, 2)[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, data
+
+    async def _write(self, conn, head, body):
+        writer = conn[1]
+        try:
+            writer.write(head + body)
+            await writer.drain()
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _receive(self, key, conn):
+        reader, writer = conn
+        try:
+            status, headers, data = await asyncio.wait_for(self._read_response(reader), self.read_timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._release(key, conn)
+        return status, headers, data
+
+    async def request(self, method: str, url: str, body: bytes = b"", headers: Optional[dict] = None):
+        """
+        Sends a request over a pooled connection, opening a new one when none is idle.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            body (bytes, optional): The request body. Defaults to b"".
+            headers (dict, optional): The request headers. Defaults to None.
+
+        Returns:
+            tuple: The status code, the lower-cased response headers and the response body.
+        """
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", f"Content-Length: {len(body)}"]
+        lines.extend(f"{k}: {v}" for k, v in (headers or {}).items())
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn[0].at_eof():
+                conn[1].close()
+                continue
+            try:
+                await self._write(conn, head, body)
+            except ConnectionError:
+                # the server dropped an idle keep-alive connection, try another one. Once the request is
+                # written it is never sent again, since the server may have acted on it
+                logger.debug("stale connection to %s:%s", key[1], key[2])
+                continue
+            return await self._receive(key, conn)
+        conn = await self._connect(key)
+        await self._write(conn, head, body)
+        return await self._receive(key, conn)
+
+    async def close(self):
+        """
+        Closes every idle connection.
+        """
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+
+class AsyncClient(BaseClient):
+    def __init__(
+        self,
+        url,
+        headers=None,
+        concurrency: int = 100,
+        maxsize: int = 100,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        persisted_queries: bool = False,
+        cache: Optional[ResponseCache] = None,
+        compress: Optional[str] = None,
+        compress_threshold: int = 1024,
+        replica=None,
+        coalesce: bool = False,
+    ):
+        """
+        Initializes an asyncio client with the same surface as epr.client.Client.
+
+        Args:
+            url (str): The EPR server URL. Defaults to http://localhost:8042 when None.
+            headers (dict, optional): Extra headers sent with every request. Defaults to None.
+            concurrency (int, optional): Maximum number of requests in flight at once. Defaults to 100.
+            maxsize (int, optional): Number of idle keep-alive connections kept per host. Defaults to 100.
+            connect_timeout (float, optional): Connect timeout in seconds. Defaults to 2.0.
+            read_timeout (float, optional): Seconds to wait for the whole response once a request is sent.
+                Defaults to 10.0.
+            ssl_context (ssl.SSLContext, optional): TLS settings for https URLs. Defaults to None.
+            persisted_queries (bool, optional): Send only the sha256 of a query document once the server
+                has seen it. Defaults to False.
+            cache (ResponseCache, optional): Cache for search responses. Defaults to None.
+            compress (str, optional): Content-Encoding for request bodies. Defaults to None.
+            compress_threshold (int, optional): Smallest body in bytes that gets compressed. Defaults to 1024.
+            replica (epr.replica.Replica, optional): Answer searches from this local replica when it has
+                synced the kind searched for. Defaults to None.
+            coalesce (bool, optional): Let identical searches started while one is in flight share its
+                response. Counters are in `flights.stats`. Defaults to False.
+        """
+        super(AsyncClient, self).__init__(
+            url,
+            headers=headers,
+            persisted_queries=persisted_queries,
+            cache=cache,
+            compress=compress,
+            compress_threshold=compress_threshold,
+            replica=replica,
+        )
+        self.concurrency = concurrency
+        self.flights = AsyncSingleFlight() if coalesce else None
+        self.pool = AsyncConnectionPool(
+            maxsize=maxsize, connect_timeout=connect_timeout, read_timeout=read_timeout, ssl_context=ssl_context
+        )
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # created lazily so it binds to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _query(self, query: GraphQLQuery) -> Any:
+        """
+        Sends a GraphQL query to the server.
+
+        Args:
+            query (GraphQLQuery): The GraphQL query and variables.
+
+        Returns:
+            Any: The response data from the server.
+        """
+        if self.persisted_queries:
+            return await self._persisted_query(query)
+        response = await self._post(self.target, data=query)
+        return json_loads(response)
+
+    async def _persisted_query(self, query: GraphQLQuery) -> Any:
+        """
+        Sends a GraphQL query as a persisted query.
+
+        Args:
+            query (GraphQLQuery): The GraphQL query and variables.
+
+        Returns:
+            Any: The response data from the server.
+        """
+        digest = _document_hash(query.query)
+        if digest in self._persisted:
+            response = json_loads(await self._post(self.target, data=self._persisted_request(query, full=False)))
+            if not self._persisted_miss(response, digest):
+                return response
+        if not self.persisted_queries:
+            return json_loads(await self._post(self.target, data=query))
+        response = json_loads(await self._post(self.target, data=self._persisted_request(query, full=True)))
+        error = _persisted_error(response)
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            self.persisted_queries = False
+            return json_loads(await self._post(self.target, data=query))
+        if error is None:
+            self._persisted.add(digest)
+        return response
+
+    async def _post(self, url: str, data: Any) -> bytes:
+        """
+        Sends a POST request to the specified URL with the provided data.
+
+        Args:
+            url (str): The URL to which the POST request will be sent.
+            data (Any): The data to be sent in the POST request, a dict or a dataclass model.
+
+        Returns:
+            bytes: The data received in the response to the POST request.
+        """
+        body, headers = self._request_body(data)
+        async with self.semaphore:
+            _, response_headers, response = await self.pool.request("POST", url, body=body, headers=headers)
+        return decompress(response, response_headers.get("content-encoding"))
+
+    async def close(self):
+        """
+        Closes every pooled connection held by the client.
+        """
+        await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        await self.close()
+
+    async def _search(self, operation: str, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
+        """
+        Sends a GraphQL search query to the server.
+
+        Args:
+            operation (str): The operation to be performed.
+            params (dict, optional): The parameters for the search query. Defaults to None.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+
+        Returns:
+            Any: The response data from the server.
+        """
+        local = self._replica_search(operation, params, fields)
+        if local is not None:
+            return local
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(operation, params, fields, self.target)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        query = self._new_graphql_search_query(operation, params, fields)
+
+        async def fetch():
+            response = await self._query(query=query)
+            self._cache_store(operation, key, response)
+            return response
+
+        if self.flights is not None:
+            return await self.flights.do(self._encode(query), fetch)
+        return await fetch()
+
+    async def _search_batch(
+        self,
+        operation: str,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches using as few requests as the batch limits allow. Batches are sent concurrently and
+        are not cached.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (iterable): The parameters for each search.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded variables per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError.
+        """
+
+        async def send(batch):
+            query = self._new_graphql_batch_search_query(operation, batch, fields)
+            return self._batch_results(await self._query(query), len(batch))
+
+        batches = self._iter_batches(params_list, batch_size, max_batch_bytes)
+        results = await asyncio.gather(*[send(batch) for batch in batches])
+        return [result for batch in results for result in batch]
+
+    async def _iter_pages(
+        self,
+        operation: str,
+        params: Optional[dict] = None,
+        fields: Optional[list] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[dict]:
+        """
+        Walks the pages of a search, fetching the next page in the background while the current one is used.
+
+        A server that rejects limit and offset is sent the search once without them.
+
+        Args:
+            operation (str): The operation to be performed.
+            params (dict, optional): The parameters for the search query. Defaults to None.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            AsyncIterator[dict]: The records of every page, in order.
+        """
+
+        async def fetch(offset, previous=None):
+            response = await self._search(operation, self._page_params(params, page_size, offset), fields)
+            if offset == 0 and _paging_rejected(response, operation):
+                logger.debug("%s does not support paging, searching without it", operation)
+                response = await self._search(operation, params, fields)
+                return ResultSet.from_response(response, operation).records, False
+            return self._page_records(operation, response, page_size, previous)
+
+        offset = 0
+        page = asyncio.ensure_future(fetch(offset))
+        try:
+            while page is not None:
+                records, more = await page
+                offset += page_size
+                page = asyncio.ensure_future(fetch(offset, records[0])) if more else None
+                for record in records:
+                    yield record
+        finally:
+            if page is not None:
+                page.cancel()
+
+    async def _mutation(self, operation: str, params: Optional[dict] = None) -> Any:
+        """
+        Sends a GraphQL mutation query to the server.
+
+        Args:
+            operation (str): The operation to be performed.
+            params (dict, optional): The parameters for the mutation query. Defaults to None.
+
+        Returns:
+            Any: The response data from the server.
+        """
+        query = self._new_graphql_mutation_query(operation, params)
+        response = await self._query(query)
+        self._cache_invalidate(operation)
+        return response
+
+    async def _mutation_batch(
+        self,
+        operation: str,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Sends many mutations using as few requests as the batch limits allow. Batches are sent concurrently,
+        at most `concurrency` at a time, and are built from params_list only as they are sent.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (iterable): The parameters for each mutation.
+            batch_size (int, optional): Maximum mutations per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded variables per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each item in input order, the created id or a GraphQLError. A batch whose request
+            failed does not fail the other batches.
+        """
+        batches = enumerate(self._iter_batches(params_list, batch_size, max_batch_bytes))
+        results = {}
+
+        async def send():
+            # each sender takes the next batch from the shared iterator once its previous batch is answered
+            for i, batch in batches:
+                query = self._new_graphql_batch_mutation_query(operation, batch)
+                try:
+                    response = await self._query(query)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                    results[i] = self._batch_lost(e, len(batch))
+                    continue
+                results[i] = self._batch_results(response, len(batch))
+
+        senders = [asyncio.ensure_future(send()) for _ in range(max(self.concurrency, 1))]
+        try:
+            await asyncio.gather(*senders)
+        finally:
+            for sender in senders:
+                sender.cancel()
+            # batches sent before an unexpected error may have created records too
+            self._cache_invalidate(operation)
+        return [result for i in range(len(results)) for result in results[i]]
+
+    async def search_events(self, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
+        """
+        Searches for events based on the provided parameters and fields.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            Any: The search results for events based on the provided parameters and fields.
+        """
+        return await self._search("events", params, fields)
+
+    async def search_event_receivers(self, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
+        """
+        Search for event receivers based on the given parameters and fields.
+
+        Args:
+            params (dict, optional): The parameters to filter the search by. Defaults to None.
+            fields (list, optional): The fields to include in the search results. Defaults to None.
+
+        Returns:
+            Any: The search results.
+        """
+        return await self._search("event_receivers", params, fields)
+
+    async def search_event_receiver_groups(self, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
+        """
+        Search for event receiver groups based on the given parameters and fields.
+
+        Args:
+            params (dict, optional): The parameters to filter the search by. Defaults to None.
+            fields (list, optional): The fields to include in the search results. Defaults to None.
+
+        Returns:
+            Any: The search results for event receiver groups based on the provided parameters and fields.
+        """
+        return await self._search("event_receiver_groups", params, fields)
+
+    async def search_events_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for events with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return await self._search_batch("events", params_list, fields, batch_size, max_batch_bytes)
+
+    async def search_event_receivers_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for event receivers with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return await self._search_batch("event_receivers", params_list, fields, batch_size, max_batch_bytes)
+
+    async def search_event_receiver_groups_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for event receiver groups with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return await self._search_batch("event_receiver_groups", params_list, fields, batch_size, max_batch_bytes)
+
+    async def find_events(self, params: Optional[dict] = None, fields: Optional[list] = None) -> ResultSet:
+        """
+        Searches for events and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(await self._search("events", params, fields), "events")
+
+    async def find_event_receivers(self, params: Optional[dict] = None, fields: Optional[list] = None) -> ResultSet:
+        """
+        Searches for event receivers and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(await self._search("event_receivers", params, fields), "event_receivers")
+
+    async def find_event_receiver_groups(
+        self, params: Optional[dict] = None, fields: Optional[list] = None
+    ) -> ResultSet:
+        """
+        Searches for event receiver groups and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(
+            await self._search("event_receiver_groups", params, fields), "event_receiver_groups"
+        )
+
+    async def iter_events(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Pages through every events matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            AsyncIterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        async for record in self._iter_pages("events", params, fields, page_size):
+            yield record
+
+    async def iter_event_receivers(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Pages through every event receivers matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            AsyncIterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        async for record in self._iter_pages("event_receivers", params, fields, page_size):
+            yield record
+
+    async def iter_event_receiver_groups(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Pages through every event receiver groups matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            AsyncIterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        async for record in self._iter_pages("event_receiver_groups", params, fields, page_size):
+            yield record
+
+    async def create_event(self, params: Optional[dict] = None) -> Any:
+        """
+        Creates an event using the provided parameters.
+
+        Args:
+            params (dict, optional): The parameters for creating the event. Defaults to None.
+
+        Returns:
+            Any: The result of creating the event.
+        """
+        return await self._mutation("create_event", params)
+
+    async def create_event_receiver(self, params: Optional[dict] = None) -> Any:
+        """
+        Creates an event receiver using the provided parameters.
+
+        Args:
+            params (dict, optional): The parameters for creating the event receiver. Defaults to None.
+
+        Returns:
+            Any: The result of creating the event receiver.
+        """
+        return await self._mutation("create_event_receiver", params)
+
+    async def create_event_receiver_group(self, params: Optional[dict] = None) -> Any:
+        """
+        Creates an event receiver group using the provided parameters.
+
+        Args:
+            params (dict, optional): The parameters for creating the event receiver group. Defaults to None.
+
+        Returns:
+            Any: The result of creating the event receiver group.
+        """
+        return await self._mutation("create_event_receiver_group", params)
+
+    async def create_events(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many events, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event, or an EventBatch.
+            batch_size (int, optional): Maximum events per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded events per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event ids in input order. Events that failed hold a GraphQLError instead.
+        """
+        return await self._mutation_batch("create_event", params_list, batch_size, max_batch_bytes)
+
+    async def create_event_receivers(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many event receivers, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event receiver.
+            batch_size (int, optional): Maximum event receivers per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded event receivers per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event receiver ids in input order. Failures hold a GraphQLError instead.
+        """
+        return await self._mutation_batch("create_event_receiver", params_list, batch_size, max_batch_bytes)
+
+    async def create_event_receiver_groups(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many event receiver groups, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event receiver group.
+            batch_size (int, optional): Maximum event receiver groups per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded event receiver groups per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event receiver group ids in input order. Failures hold a GraphQLError instead.
+        """
+        return await self._mutation_batch("create_event_receiver_group", params_list, batch_size, max_batch_bytes)
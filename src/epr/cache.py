@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .common import EnhancedJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir():
+    """Return $EPR_CACHE_DIR, or the epr directory under the user cache directory"""
+    cache_dir = os.environ.get("EPR_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "epr")
+
+
+class SQLiteDatabase(object):
+    """
+    A SQLite file in autocommit and WAL mode, shared by the threads of a process behind a lock and by every
+    process that opens the same file. Subclasses create their tables after calling __init__.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SQLiteStore(SQLiteDatabase):
+    """Persistent cache tier shared by every process that opens the same file"""
+
+    def __init__(self, path):
+        super(SQLiteStore, self).__init__(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, operation TEXT, expires REAL, value TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_operation ON responses (operation)")
+        self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT operation, expires, value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row
+
+    def set(self, key, operation, expires, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, operation, expires, value) VALUES (?, ?, ?, ?)",
+                (key, operation, expires, value),
+            )
+
+    def invalidate(self, operation):
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE operation = ?", (operation,))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+
+class ResponseCache(object):
+    """
+    LRU cache of search responses with a time to live and an optional persistent tier.
+
+    Responses are stored as JSON text so callers can never modify a cached entry through a returned object.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, store: Optional[SQLiteStore] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dir(cls, cache_dir=None, maxsize: int = 1024, ttl: float = 300.0):
+        """Create a cache whose persistent tier lives in cache_dir (the default cache dir when None)"""
+        cache_dir = cache_dir or default_cache_dir()
+        return cls(maxsize=maxsize, ttl=ttl, store=SQLiteStore(os.path.join(cache_dir, "responses.db")))
+
+    @staticmethod
+    def key(
+        operation: str, params: Optional[dict] = None, fields: Optional[list] = None, url: Optional[str] = None
+    ) -> str:
+        """
+        Build a cache key that does not depend on the order of params. The persistent tier is shared by every
+        client using the cache dir, so the key includes the server URL.
+        """
+        return json.dumps(
+            [url, operation, params, fields], cls=EnhancedJSONEncoder, sort_keys=True, separators=(",", ":")
+        )
+
+    def get(self, key: str) -> Any:
+        """Return the cached response for key, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[2])
+                del self._entries[key]
+        row = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._insert(key, row)
+        return json.loads(row[2])
+
+    def set(self, operation: str, key: str, response: Any):
+        """Cache response for key until the time to live runs out"""
+        entry = (operation, time.time() + self.ttl, json.dumps(response, separators=(",", ":")))
+        with self._lock:
+            self._insert(key, entry)
+        if self.store is not None:
+            self.store.set(key, *entry)
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, operation: str):
+        """Drop every cached response for operation"""
+        with self._lock:
+            for key in [k for k, v in self._entries.items() if v[0] == operation]:
+                del self._entries[key]
+        if self.store is not None:
+            self.store.invalidate(operation)
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters and the number of entries held in memory"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
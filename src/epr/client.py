@@ -2,23 +2,92 @@
 # SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import logging
-from typing import Any, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Optional
 from urllib.parse import urljoin
 
 import urllib3
 
-from .common import EnhancedJSONEncoder
-from .models import GraphQLQuery
+from .cache import ResponseCache
+from .common import ACCEPT_ENCODING, COMPRESSORS, RawJSON, hash_string, json_dumps, json_loads
+from .errors import GraphQLError, OutcomeUnknownError
+from .hedge import HedgePolicy, Hedger
+from .models import EventBatch, GraphQLQuery
+from .results import ResultSet
+from .singleflight import SingleFlight
+from .stream import iter_json_array
 
 urllib3.disable_warnings()
 
 logger = logging.getLogger(__name__)
 
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+# the paging arguments named in a validation error, e.g. unknown field "limit" or Field "offset" is not defined
+_PAGING_FIELD = re.compile(r'"(limit|offset)"')
 
-class Client(object):
-    def __init__(self, url, headers=None):
+
+@lru_cache(maxsize=512)
+def _search_template(method: str, operation: str, op: str, fields: Optional[tuple]) -> str:
+    _fields = ",".join(fields) if fields is not None else "id"
+    return f"""query ($obj: {method}){{{operation}({op}: $obj) {{ {_fields} }}}}"""
+
+
+@lru_cache(maxsize=64)
+def _mutation_template(method: str, operation: str, op: str) -> str:
+    return f"""mutation ($obj: {method}){{{operation}({op}: $obj)}}"""
+
+
+@lru_cache(maxsize=512)
+def _document_hash(query: str) -> str:
+    return hash_string(query)
+
+
+def _persisted_error(response: dict) -> Optional[str]:
+    """Returns the persisted query error reported in a GraphQL response, if any"""
+    for error in response.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        if error.get("message") == PERSISTED_QUERY_NOT_FOUND or code == "PERSISTED_QUERY_NOT_FOUND":
+            return PERSISTED_QUERY_NOT_FOUND
+        if error.get("message") == PERSISTED_QUERY_NOT_SUPPORTED or code == "PERSISTED_QUERY_NOT_SUPPORTED":
+            return PERSISTED_QUERY_NOT_SUPPORTED
+    return None
+
+
+def _paging_rejected(response: dict, operation: str) -> bool:
+    """
+    Returns whether a paged search failed schema validation because the server does not know limit or offset.
+    Only a validation error that names one of them counts, any other error is an answer to the search.
+    """
+    if (response.get("data") or {}).get(operation) is not None:
+        return False
+    for error in response.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        message = str(error.get("message"))
+        path = error.get("path") or []
+        named = "limit" in path or "offset" in path or _PAGING_FIELD.search(message) is not None
+        invalid = code == "GRAPHQL_VALIDATION_FAILED" or "unknown field" in message.lower() or "not defined" in message
+        if named and invalid:
+            return True
+    return False
+
+
+class BaseClient(object):
+    """Holds the endpoint, headers and GraphQL query builders shared by Client and AsyncClient"""
+
+    def __init__(
+        self,
+        url,
+        headers=None,
+        persisted_queries: bool = False,
+        cache: Optional[ResponseCache] = None,
+        compress: Optional[str] = None,
+        compress_threshold: int = 1024,
+        replica=None,
+    ):
         self.url = url
         self.api_version = "v1"
         self.graphql_query = "graphql/query"
@@ -26,9 +95,17 @@ class Client(object):
             self.url = "http://localhost:8042"
         self.endpoint = "/".join(["api", self.api_version, self.graphql_query])
         self.target = urljoin(self.url, self.endpoint)
-        self.headers = {"Content-Type": "application/json"}
+        self.headers = {"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
         if headers is not None:
             self.headers.update(headers)
+        if compress is not None and compress not in COMPRESSORS:
+            raise ValueError(f"Invalid compression: {compress} (available: {', '.join(COMPRESSORS)})")
+        self.compress = compress
+        self.compress_threshold = compress_threshold
+        self.persisted_queries = persisted_queries
+        self._persisted = set()
+        self.cache = cache
+        self.replica = replica
         self._operation_map = {
             "search": {
                 "events": "FindEventInput!",
@@ -50,6 +127,11 @@ class Client(object):
                 "create_event_receiver": "event_receiver",
                 "create_event_receiver_group": "event_receiver_group",
             },
+            "invalidate": {
+                "create_event": "events",
+                "create_event_receiver": "event_receivers",
+                "create_event_receiver_group": "event_receiver_groups",
+            },
         }
 
     def _new_graphql_search_query(
@@ -79,8 +161,39 @@ class Client(object):
         variables = dict(obj=params)
         method = self._operation_map["search"][operation]
         op = self._operation_map["operation"][operation]
+        query = _search_template(method, operation, op, tuple(fields) if fields is not None else None)
+        return GraphQLQuery(query=query, variables=variables)
+
+    def _new_graphql_batch_search_query(
+        self, operation: str, params_list: List[dict], fields: Optional[list] = None
+    ) -> GraphQLQuery:
+        """
+        Creates a GraphQL search document with one aliased field per set of parameters.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (list): The parameters for each search, in order.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+
+        Returns:
+            GraphQLQuery: The query and variables for the batched search.
+
+        Example:
+            new_graphql_batch_search_query("events", [{"name": "foo"}, {"name": "bar"}], ["id"])
+            # Returns:
+            # GraphQLQuery({
+            #     "query": "query ($o0: FindEventInput!, $o1: FindEventInput!)"
+            #              "{e0: events(event: $o0) { id } e1: events(event: $o1) { id }}",
+            #     "variables": {"o0": {"name": "foo"}, "o1": {"name": "bar"}}
+            # })
+        """
+        method = self._operation_map["search"][operation]
+        op = self._operation_map["operation"][operation]
         _fields = ",".join(fields) if fields is not None else "id"
-        query = f"""query ($obj: {method}){{{operation}({op}: $obj) {{ {_fields} }}}}"""
+        declarations = ", ".join(f"$o{i}: {method}" for i in range(len(params_list)))
+        selections = " ".join(f"e{i}: {operation}({op}: $o{i}) {{ {_fields} }}" for i in range(len(params_list)))
+        query = f"""query ({declarations}){{{selections}}}"""
+        variables = {f"o{i}": params for i, params in enumerate(params_list)}
         return GraphQLQuery(query=query, variables=variables)
 
     def _new_graphql_mutation_query(self, operation: str, params: Optional[dict] = None) -> GraphQLQuery:
@@ -105,9 +218,342 @@ class Client(object):
         variables = dict(obj=params)
         method = self._operation_map["mutation"][operation]
         op = self._operation_map["create"][operation]
-        query = f"""mutation ($obj: {method}){{{operation}({op}: $obj)}}"""
+        query = _mutation_template(method, operation, op)
         return GraphQLQuery(query=query, variables=variables)
 
+    def _new_graphql_batch_mutation_query(self, operation: str, params_list: List[dict]) -> GraphQLQuery:
+        """
+        Creates a GraphQL mutation document with one aliased field per set of parameters.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (list): The parameters for each mutation, in order. Parameters already encoded as
+                JSON bytes are spliced into the request body as they are.
+
+        Returns:
+            GraphQLQuery: The query and variables for the batched mutation.
+
+        Example:
+            new_graphql_batch_mutation_query("create_event", [{"name": "foo"}, {"name": "bar"}])
+            # Returns:
+            # GraphQLQuery({
+            #     "query": "mutation ($o0: CreateEventInput!, $o1: CreateEventInput!)"
+            #              "{e0: create_event(event: $o0) e1: create_event(event: $o1)}",
+            #     "variables": {"o0": {"name": "foo"}, "o1": {"name": "bar"}}
+            # })
+        """
+        method = self._operation_map["mutation"][operation]
+        op = self._operation_map["create"][operation]
+        declarations = ", ".join(f"$o{i}: {method}" for i in range(len(params_list)))
+        selections = " ".join(f"e{i}: {operation}({op}: $o{i})" for i in range(len(params_list)))
+        query = f"""mutation ({declarations}){{{selections}}}"""
+        if params_list and isinstance(params_list[0], bytes):
+            variables = RawJSON(b"{" + b",".join(b'"o%d":%s' % (i, p) for i, p in enumerate(params_list)) + b"}")
+        else:
+            variables = {f"o{i}": params for i, params in enumerate(params_list)}
+        return GraphQLQuery(query=query, variables=variables)
+
+    def _iter_batches(self, params_list: Iterable, batch_size: int, max_batch_bytes: int) -> Iterator[list]:
+        """
+        Splits parameters into batches bounded by count and by encoded size.
+
+        Args:
+            params_list (iterable): The parameters to split, or an EventBatch. Consumed lazily.
+            batch_size (int): Maximum number of parameters per batch.
+            max_batch_bytes (int): Maximum encoded size of a batch. A single larger item gets a batch of its own.
+
+        Returns:
+            Iterator[list]: The batches, in input order.
+        """
+        if isinstance(params_list, EventBatch):
+            params_list = params_list.encoded_rows()
+        batch, size = [], 0
+        for params in params_list:
+            encoded = len(params) if isinstance(params, bytes) else len(self._encode(params))
+            if batch and (len(batch) >= batch_size or size + encoded > max_batch_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(params)
+            size += encoded
+        if batch:
+            yield batch
+
+    def _batch_results(self, response: dict, count: int) -> list:
+        """
+        Maps a batched mutation or search response back to per-item results.
+
+        Results survive per alias only when the fields are nullable: an error in a non-null field nulls the
+        whole of "data", and then only the aliases named by an error path are known to have failed. The
+        others may already have been applied, so they get an OutcomeUnknownError and must be checked before
+        they are retried. A response without "data" failed before anything ran.
+
+        Args:
+            response (dict): The decoded GraphQL response.
+            count (int): The number of aliased fields in the request.
+
+        Returns:
+            list: For each item in order, the created id or a GraphQLError describing why it failed.
+        """
+        errors = {}
+        for error in response.get("errors") or []:
+            path = error.get("path") or [None]
+            errors.setdefault(path[0], GraphQLError(error.get("message")))
+        if "data" in response and response["data"] is None:
+            return [
+                errors.get(f"e{i}") or OutcomeUnknownError(f"data was nulled before the result of e{i} was returned")
+                for i in range(count)
+            ]
+        data = response.get("data") or {}
+        results = []
+        for i in range(count):
+            alias = f"e{i}"
+            if data.get(alias) is not None:
+                results.append(data[alias])
+            else:
+                results.append(errors.get(alias) or errors.get(None) or GraphQLError(f"no result for {alias}"))
+        return results
+
+    def _batch_lost(self, error: Exception, count: int) -> list:
+        """
+        Maps a batched mutation whose response never arrived or could not be decoded to per-item results.
+
+        The request may have reached the server, so every item gets an OutcomeUnknownError and must be
+        checked before it is retried.
+
+        Args:
+            error (Exception): The transport or decode error.
+            count (int): The number of aliased fields in the request.
+
+        Returns:
+            list: An OutcomeUnknownError for each item.
+        """
+        return [OutcomeUnknownError(f"no response for the batch of e{i}: {error}") for i in range(count)]
+
+    def _persisted_request(self, query: GraphQLQuery, full: bool) -> dict:
+        """
+        Builds a persisted query request body.
+
+        Args:
+            query (GraphQLQuery): The GraphQL query and variables.
+            full (bool): Include the query document so the server can register its hash.
+
+        Returns:
+            dict: The request body, carrying the sha256 of the document in its extensions.
+        """
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": _document_hash(query.query)}}
+        data = {"variables": query.variables, "extensions": extensions}
+        if full:
+            data["query"] = query.query
+        return data
+
+    def _persisted_miss(self, response: dict, digest: str) -> bool:
+        """
+        Checks whether the server failed to answer a hash-only request.
+
+        A server that has evicted the hash answers PersistedQueryNotFound and the document is registered
+        again. A server that answers PersistedQueryNotSupported gets full documents from then on. Any other
+        error, such as invalid input, is an answer to the query itself and is returned to the caller.
+
+        Args:
+            response (dict): The decoded response to the hash-only request.
+            digest (str): The sha256 of the query document.
+
+        Returns:
+            bool: True when the full document has to be sent.
+        """
+        error = _persisted_error(response)
+        if error is None:
+            return False
+        self._persisted.discard(digest)
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            logger.debug("server does not support persisted queries, sending full documents")
+            self.persisted_queries = False
+        return True
+
+    def _page_params(self, params: Optional[dict], page_size: int, offset: int) -> dict:
+        """
+        Adds the page window to search parameters.
+
+        Args:
+            params (dict, optional): The search parameters.
+            page_size (int): Maximum records per page.
+            offset (int): Number of records to skip.
+
+        Returns:
+            dict: A copy of params with limit and offset set.
+        """
+        page = dict(params or {})
+        page["limit"] = page_size
+        page["offset"] = offset
+        return page
+
+    def _page_records(self, operation: str, response: dict, page_size: int, previous: Optional[dict] = None) -> tuple:
+        """
+        Extracts the records of one page.
+
+        Args:
+            operation (str): The search operation.
+            response (dict): The decoded response for the page.
+            page_size (int): The page size that was asked for.
+            previous (dict, optional): The first record of the previous page. Defaults to None.
+
+        Returns:
+            tuple: The records and whether another page may follow. A short page is the last one, and so is a
+            page longer than asked for, which means the server does not paginate and sent everything. A page
+            that starts with the first record of the previous one means the server ignores the offset, so it
+            is dropped and ends the walk.
+        """
+        records = ResultSet.from_response(response, operation).records
+        if previous is not None and records and records[0] == previous:
+            logger.debug("%s ignores the page offset, stopping after the first page", operation)
+            return [], False
+        return records, len(records) == page_size
+
+    def _replica_search(self, operation: str, params: Optional[dict], fields: Optional[list]) -> Optional[dict]:
+        """
+        Answers a search from the local replica.
+
+        Args:
+            operation (str): The search operation.
+            params (dict, optional): The parameters for the search query.
+            fields (list, optional): The fields to be included in the search results.
+
+        Returns:
+            dict: A response shaped like the server's, or None when there is no replica or it cannot answer.
+        """
+        if self.replica is None:
+            return None
+        records = self.replica.search(self.url, operation, params)
+        if records is None:
+            return None
+        fields = fields if fields is not None else ["id"]
+        return {"data": {operation: [{f: record.get(f) for f in fields} for record in records]}}
+
+    def _cache_store(self, operation: str, key: Optional[str], response: Any):
+        """
+        Caches a search response unless it carries errors.
+
+        Args:
+            operation (str): The search operation.
+            key (str): The cache key, None when caching is off.
+            response (Any): The decoded response.
+        """
+        if key is not None and isinstance(response, dict) and not response.get("errors"):
+            self.cache.set(operation, key, response)
+
+    def _cache_invalidate(self, operation: str):
+        """
+        Drops cached searches that a mutation may have changed.
+
+        Args:
+            operation (str): The mutation operation.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(self._operation_map["invalidate"][operation])
+
+    def _request_body(self, data: Any):
+        """
+        Encodes a request body and compresses it when it is at least `compress_threshold` bytes.
+
+        Args:
+            data (Any): The data to be sent in the request.
+
+        Returns:
+            tuple: The body and the headers to send it with.
+        """
+        body = self._encode(data)
+        if self.compress is None or len(body) < self.compress_threshold:
+            return body, self.headers
+        headers = dict(self.headers)
+        headers["Content-Encoding"] = self.compress
+        return COMPRESSORS[self.compress](body), headers
+
+    def _encode(self, data: dict) -> bytes:
+        """
+        Encodes a request body as UTF-8 JSON. Models are written field by field without being copied and
+        variables that are already encoded are spliced in as they are.
+
+        Args:
+            data (dict): The data to be sent in the request.
+
+        Returns:
+            bytes: The encoded request body.
+        """
+        variables = data.get("variables") if isinstance(data, dict) else getattr(data, "variables", None)
+        if not isinstance(variables, RawJSON):
+            return json_dumps(data)
+        if isinstance(data, dict):
+            rest = {k: v for k, v in data.items() if k != "variables"}
+        else:
+            rest = {k: v for k, v in data.as_dict().items() if k != "variables"}
+        return b'{"variables":' + variables + b"," + json_dumps(rest)[1:]
+
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_PAGE_SIZE = 500
+
+
+class Client(BaseClient):
+    def __init__(
+        self,
+        url,
+        headers=None,
+        num_pools: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+        timeout: Optional[urllib3.Timeout] = None,
+        persisted_queries: bool = False,
+        cache: Optional[ResponseCache] = None,
+        hedge: Optional[HedgePolicy] = None,
+        compress: Optional[str] = None,
+        compress_threshold: int = 1024,
+        replica=None,
+        coalesce: bool = False,
+    ):
+        """
+        Initializes the client and the connection pool it owns for its whole life.
+
+        Args:
+            url (str): The EPR server URL. Defaults to http://localhost:8042 when None.
+            headers (dict, optional): Extra headers sent with every request. Defaults to None.
+            num_pools (int, optional): Number of per-host pools to keep. Defaults to 10.
+            maxsize (int, optional): Number of keep-alive connections kept per host. Defaults to 10.
+            block (bool, optional): Wait for a free connection instead of opening a throwaway one
+                when all `maxsize` connections are busy. Defaults to False.
+            timeout (urllib3.Timeout, optional): Request timeout. Defaults to connect=2.0, read=10.0.
+            persisted_queries (bool, optional): Send only the sha256 of a query document once the server
+                has seen it, falling back to the full document when the server does not know the hash.
+                Defaults to False.
+            cache (ResponseCache, optional): Cache for search responses. Mutations invalidate the
+                searches they affect. Defaults to None.
+            hedge (HedgePolicy, optional): Hedge slow searches with a duplicate request once they run past
+                a percentile of this client's recent latencies. Mutations are never hedged. Defaults to None.
+            compress (str, optional): Content-Encoding for request bodies: gzip, deflate, and br or zstd when
+                brotli or zstandard is installed. Compressed responses are always accepted. Defaults to None.
+            compress_threshold (int, optional): Smallest body in bytes that gets compressed. Defaults to 1024.
+            replica (epr.replica.Replica, optional): Answer searches from this local replica when it has
+                synced the kind searched for. It is only as fresh as its last sync. Defaults to None.
+            coalesce (bool, optional): Let threads that send an identical search while one is in flight share
+                its response instead of sending their own. Counters are in `flights.stats`. Defaults to False.
+        """
+        super(Client, self).__init__(
+            url,
+            headers=headers,
+            persisted_queries=persisted_queries,
+            cache=cache,
+            compress=compress,
+            compress_threshold=compress_threshold,
+            replica=replica,
+        )
+        if timeout is None:
+            timeout = urllib3.Timeout(connect=2.0, read=10.0)
+        self.timeout = timeout
+        self.http = urllib3.PoolManager(num_pools=num_pools, maxsize=maxsize, block=block, timeout=timeout)
+        self.hedger = Hedger(hedge) if hedge is not None else None
+        self.flights = SingleFlight() if coalesce else None
+
     def _query(self, query: GraphQLQuery) -> Any:
         """
         Sends a GraphQL query to the server.
@@ -119,26 +565,66 @@ class Client(object):
         Returns:
             Any: The response data from the server.
         """
-        response = self._post(self.target, data=query.as_dict())
-        return json.loads(response.decode("utf-8"))
+        if self.persisted_queries:
+            return self._persisted_query(query)
+        response = self._post(self.target, data=query)
+        return json_loads(response)
+
+    def _persisted_query(self, query: GraphQLQuery) -> Any:
+        """
+        Sends a GraphQL query as a persisted query.
+
+        Args:
+            query (GraphQLQuery): The GraphQL query and variables.
+
+        Returns:
+            Any: The response data from the server.
+        """
+        digest = _document_hash(query.query)
+        if digest in self._persisted:
+            response = json_loads(self._post(self.target, data=self._persisted_request(query, full=False)))
+            if not self._persisted_miss(response, digest):
+                return response
+        if not self.persisted_queries:
+            return json_loads(self._post(self.target, data=query))
+        response = json_loads(self._post(self.target, data=self._persisted_request(query, full=True)))
+        error = _persisted_error(response)
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            self.persisted_queries = False
+            return json_loads(self._post(self.target, data=query))
+        if error is None:
+            self._persisted.add(digest)
+        return response
 
-    def _post(self, url: str, data: dict) -> bytes:
+    def _post(self, url: str, data: Any) -> bytes:
         """
         Sends a POST request to the specified URL with the provided data.
 
         Args:
             url (str): The URL to which the POST request will be sent.
-            data (dict): The data to be sent in the POST request.
+            data (Any): The data to be sent in the POST request, a dict or a dataclass model.
 
         Returns:
             bytes: The data received in the response to the POST request.
         """
-        timeout = urllib3.Timeout(connect=2.0, read=10.0)
-        http = urllib3.PoolManager(timeout=timeout)
-        encoded_data = json.dumps(data, cls=EnhancedJSONEncoder).encode("utf-8")
-        response = http.request("POST", url, body=encoded_data, headers=self.headers)
+        body, headers = self._request_body(data)
+        response = self.http.request("POST", url, body=body, headers=headers)
         return response.data
 
+    def close(self):
+        """
+        Closes every pooled connection held by the client.
+        """
+        if self.hedger is not None:
+            self.hedger.close()
+        self.http.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
     def _search(self, operation: str, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
         """
         Sends a GraphQL search query to the server.
@@ -151,9 +637,129 @@ class Client(object):
         Returns:
             Any: The response data from the server.
         """
+        local = self._replica_search(operation, params, fields)
+        if local is not None:
+            return local
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(operation, params, fields, self.target)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
         query = self._new_graphql_search_query(operation, params, fields)
 
-        return self._query(query=query)
+        def fetch():
+            if self.hedger is not None:
+                response = self.hedger.call(lambda: self._query(query=query))
+            else:
+                response = self._query(query=query)
+            self._cache_store(operation, key, response)
+            return response
+
+        if self.flights is not None:
+            return self.flights.do(self._encode(query), fetch)
+        return fetch()
+
+    def _search_batch(
+        self,
+        operation: str,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches using as few requests as the batch limits allow. Batched searches are not cached.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (iterable): The parameters for each search.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded variables per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError.
+        """
+        results = []
+        for batch in self._iter_batches(params_list, batch_size, max_batch_bytes):
+            query = self._new_graphql_batch_search_query(operation, batch, fields)
+            results.extend(self._batch_results(self._query(query), len(batch)))
+        return results
+
+    def _iter_pages(
+        self,
+        operation: str,
+        params: Optional[dict] = None,
+        fields: Optional[list] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[dict]:
+        """
+        Walks the pages of a search, fetching the next page in the background while the current one is used.
+
+        A server that rejects limit and offset is sent the search once without them.
+
+        Args:
+            operation (str): The operation to be performed.
+            params (dict, optional): The parameters for the search query. Defaults to None.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            Iterator[dict]: The records of every page, in order.
+        """
+
+        def fetch(offset, previous=None):
+            response = self._search(operation, self._page_params(params, page_size, offset), fields)
+            if offset == 0 and _paging_rejected(response, operation):
+                logger.debug("%s does not support paging, searching without it", operation)
+                return ResultSet.from_response(self._search(operation, params, fields), operation).records, False
+            return self._page_records(operation, response, page_size, previous)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="epr-page") as pool:
+            offset = 0
+            page = pool.submit(fetch, offset)
+            while page is not None:
+                records, more = page.result()
+                offset += page_size
+                page = pool.submit(fetch, offset, records[0]) if more else None
+                yield from records
+
+    def _iter_search(
+        self,
+        operation: str,
+        params: Optional[dict] = None,
+        fields: Optional[list] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[dict]:
+        """
+        Sends a GraphQL search query and parses the response as it arrives.
+
+        The full query document is always sent and the response is neither cached nor hedged, since it is
+        never held in memory as a whole.
+
+        Args:
+            operation (str): The operation to be performed.
+            params (dict, optional): The parameters for the search query. Defaults to None.
+            fields (list, optional): The fields to be included in the search results. Defaults to None.
+            chunk_size (int, optional): Bytes read from the response at a time. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[dict]: The records under data.<operation>, one at a time.
+        """
+        query = self._new_graphql_search_query(operation, params, fields)
+        body, headers = self._request_body(query)
+        response = self.http.request("POST", self.target, body=body, headers=headers, preload_content=False)
+        finished = False
+        try:
+            yield from iter_json_array(response.stream(chunk_size), ("data", operation))
+            response.drain_conn()
+            finished = True
+        finally:
+            # a connection left with part of a response unread can not be reused
+            if not finished:
+                response.close()
+            response.release_conn()
 
     def _mutation(self, operation: str, params: Optional[dict] = None) -> Any:
         """
@@ -170,7 +776,44 @@ class Client(object):
         It then sends the query to the server using the `query` method and returns the response data.
         """
         query = self._new_graphql_mutation_query(operation, params)
-        return self._query(query)
+        response = self._query(query)
+        self._cache_invalidate(operation)
+        return response
+
+    def _mutation_batch(
+        self,
+        operation: str,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Sends many mutations using as few requests as the batch limits allow.
+
+        Args:
+            operation (str): The operation to be performed.
+            params_list (iterable): The parameters for each mutation.
+            batch_size (int, optional): Maximum mutations per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded variables per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each item in input order, the created id or a GraphQLError. A failed item does not
+            fail the rest of its batch, and a batch whose request failed does not fail the other batches.
+        """
+        results = []
+        try:
+            for batch in self._iter_batches(params_list, batch_size, max_batch_bytes):
+                query = self._new_graphql_batch_mutation_query(operation, batch)
+                try:
+                    response = self._query(query)
+                except (urllib3.exceptions.HTTPError, ValueError) as e:
+                    results.extend(self._batch_lost(e, len(batch)))
+                    continue
+                results.extend(self._batch_results(response, len(batch)))
+        finally:
+            # batches sent before an unexpected error may have created records too
+            self._cache_invalidate(operation)
+        return results
 
     def search_events(self, params: Optional[dict] = None, fields: Optional[list] = None) -> Any:
         """
@@ -217,6 +860,243 @@ class Client(object):
         """
         return self._search("event_receiver_groups", params, fields)
 
+    def search_events_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for events with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return self._search_batch("events", params_list, fields, batch_size, max_batch_bytes)
+
+    def search_event_receivers_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for event receivers with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return self._search_batch("event_receivers", params_list, fields, batch_size, max_batch_bytes)
+
+    def search_event_receiver_groups_many(
+        self,
+        params_list: Iterable,
+        fields: Optional[list] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Runs many searches for event receiver groups with one aliased query per `batch_size` criteria.
+
+        Args:
+            params_list (iterable): Parameters for each search.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            batch_size (int, optional): Maximum searches per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded parameters per request. Defaults to 1 MiB.
+
+        Returns:
+            list: For each search in input order, the list of hits or a GraphQLError. Pass it to
+            epr.common.merge_hits for the distinct hits of all searches.
+        """
+        return self._search_batch("event_receiver_groups", params_list, fields, batch_size, max_batch_bytes)
+
+    def find_events(self, params: Optional[dict] = None, fields: Optional[list] = None) -> ResultSet:
+        """
+        Searches for events and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(self._search("events", params, fields), "events")
+
+    def find_event_receivers(self, params: Optional[dict] = None, fields: Optional[list] = None) -> ResultSet:
+        """
+        Searches for event receivers and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(self._search("event_receivers", params, fields), "event_receivers")
+
+    def find_event_receiver_groups(self, params: Optional[dict] = None, fields: Optional[list] = None) -> ResultSet:
+        """
+        Searches for event receiver groups and returns lazy views over the hits instead of nested dicts.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+
+        Returns:
+            ResultSet: One read-only view per hit. Call to_model() or to_models() for model instances.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return ResultSet.from_response(self._search("event_receiver_groups", params, fields), "event_receiver_groups")
+
+    def iter_search_events(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[dict]:
+        """
+        Searches for events and yields each hit as soon as it has been read from the response.
+
+        Memory use stays bounded by one hit and one chunk of the response however many hits there are.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            chunk_size (int, optional): Bytes read from the response at a time. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[dict]: The hits in the order the server sent them.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_search("events", params, fields, chunk_size)
+
+    def iter_search_event_receivers(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[dict]:
+        """
+        Searches for event receivers and yields each hit as soon as it has been read from the response.
+
+        Memory use stays bounded by one hit and one chunk of the response however many hits there are.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            chunk_size (int, optional): Bytes read from the response at a time. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[dict]: The hits in the order the server sent them.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_search("event_receivers", params, fields, chunk_size)
+
+    def iter_search_event_receiver_groups(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[dict]:
+        """
+        Searches for event receiver groups and yields each hit as soon as it has been read from the response.
+
+        Memory use stays bounded by one hit and one chunk of the response however many hits there are.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            chunk_size (int, optional): Bytes read from the response at a time. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[dict]: The hits in the order the server sent them.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_search("event_receiver_groups", params, fields, chunk_size)
+
+    def iter_events(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[dict]:
+        """
+        Pages through every events matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            Iterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_pages("events", params, fields, page_size)
+
+    def iter_event_receivers(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[dict]:
+        """
+        Pages through every event receivers matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            Iterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_pages("event_receivers", params, fields, page_size)
+
+    def iter_event_receiver_groups(
+        self, params: Optional[dict] = None, fields: Optional[list] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[dict]:
+        """
+        Pages through every event receiver groups matching the parameters, prefetching the next page while the current
+        one is consumed.
+
+        Args:
+            params (dict, optional): Parameters for the search query. Defaults to None.
+            fields (list, optional): Fields to be included in the search results. Defaults to None.
+            page_size (int, optional): Records fetched per request. Defaults to 500.
+
+        Returns:
+            Iterator[dict]: Every hit, in order.
+
+        Raises:
+            GraphQLError: The server returned errors and no results.
+        """
+        return self._iter_pages("event_receiver_groups", params, fields, page_size)
+
     def create_event(self, params: Optional[dict] = None) -> Any:
         """
         Creates an event using the provided parameters.
@@ -258,3 +1138,60 @@ class Client(object):
         This function sends a mutation query to create an event receiver group using the provided parameters.
         """
         return self._mutation("create_event_receiver_group", params)
+
+    def create_events(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many events, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event, or an EventBatch.
+            batch_size (int, optional): Maximum events per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded events per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event ids in input order. Events that failed hold a GraphQLError instead.
+        """
+        return self._mutation_batch("create_event", params_list, batch_size, max_batch_bytes)
+
+    def create_event_receivers(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many event receivers, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event receiver.
+            batch_size (int, optional): Maximum event receivers per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded event receivers per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event receiver ids in input order. Failures hold a GraphQLError instead.
+        """
+        return self._mutation_batch("create_event_receiver", params_list, batch_size, max_batch_bytes)
+
+    def create_event_receiver_groups(
+        self,
+        params_list: Iterable,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    ) -> list:
+        """
+        Creates many event receiver groups, packing up to `batch_size` of them into each request.
+
+        Args:
+            params_list (iterable): The parameters for each event receiver group.
+            batch_size (int, optional): Maximum event receiver groups per request. Defaults to 100.
+            max_batch_bytes (int, optional): Maximum encoded event receiver groups per request. Defaults to 1 MiB.
+
+        Returns:
+            list: The created event receiver group ids in input order. Failures hold a GraphQLError instead.
+        """
+        return self._mutation_batch("create_event_receiver_group", params_list, batch_size, max_batch_bytes)
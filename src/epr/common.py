@@ -3,16 +3,37 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import dataclasses
+import gzip
 import hashlib
 import json
 import logging
+import mmap
 import os
 import sys
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from jsonpath_ng import parse
+from jsonpath_ng import Child, Fields, Root, Slice, This, parse
 
 from .errors import debug_except_hook
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,32 +43,255 @@ if debug:
     logger.setLevel(logging.DEBUG)
 
 
+# files at least this large are hashed through mmap instead of buffered reads
+MMAP_THRESHOLD = 4 * 1024 * 1024
+# data handed to hashlib per call. hashlib releases the GIL while it hashes, so threads hash files in parallel
+HASH_BLOCKSIZE = 8 * 1024 * 1024
+
+
 def hash_file(path):
-    BLOCKSIZE = 65536
+    """Return the "sha256:<hex>" digest of a file"""
     hasher = hashlib.sha256()
     with open(path, "rb") as fh:
-        buf = fh.read(BLOCKSIZE)
-        while len(buf) > 0:
-            hasher.update(buf)
-            buf = fh.read(BLOCKSIZE)
+        size = os.fstat(fh.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(view), HASH_BLOCKSIZE):
+                        hasher.update(view[offset : offset + HASH_BLOCKSIZE])
+                finally:
+                    view.release()
+        else:
+            buf = fh.read(HASH_BLOCKSIZE)
+            while len(buf) > 0:
+                hasher.update(buf)
+                buf = fh.read(HASH_BLOCKSIZE)
     result = "sha256:" + hasher.hexdigest()
     return result
 
 
+def iter_files(paths):
+    """Yield the given files and every file below the given directories, in a stable order"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                yield os.path.join(root, name)
+
+
+def _hash_or_error(path):
+    try:
+        return path, hash_file(path)
+    except OSError as e:
+        return path, e
+
+
+def hash_files(paths, workers=None):
+    """
+    Hash many files on a thread pool.
+
+    Args:
+        paths (iterable): Files to hash. Directories are walked.
+        workers (int, optional): Files hashed at once. Defaults to the number of CPUs.
+
+    Returns:
+        Iterator[tuple]: (path, "sha256:<hex>") in input order as each digest is ready. A file that can not
+        be read yields its OSError instead of a digest.
+    """
+    workers = workers or os.cpu_count() or 1
+    return imap_ordered(_hash_or_error, iter_files(paths), workers)
+
+
 def hash_string(data):
     hasher = hashlib.sha256()
     hasher.update(data.encode("utf-8"))
     return hasher.hexdigest()
 
 
+COMPRESSORS = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+    "deflate": zlib.compress,
+}
+DECOMPRESSORS = {
+    "gzip": gzip.decompress,
+    "deflate": zlib.decompress,
+}
+if brotli is not None:
+    COMPRESSORS["br"] = brotli.compress
+    DECOMPRESSORS["br"] = brotli.decompress
+if zstandard is not None:
+    COMPRESSORS["zstd"] = lambda data: zstandard.ZstdCompressor().compress(data)
+    DECOMPRESSORS["zstd"] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+ACCEPT_ENCODING = ",".join(DECOMPRESSORS)
+
+
+def decompress(data, encoding):
+    """Decode a body sent with the given Content-Encoding. Unknown or identity encodings are returned as is"""
+    decoder = DECOMPRESSORS.get((encoding or "").strip().lower())
+    return decoder(data) if decoder is not None else data
+
+
+@lru_cache(maxsize=128)
+def compile_jsonpath(expr):
+    """Parse a jsonpath expression once. Parsing is far slower than applying the expression"""
+    return parse(expr)
+
+
 def find_jsonpath(data, expr):
-    jsonpath_expression = parse(expr)
+    jsonpath_expression = compile_jsonpath(expr)
     match = jsonpath_expression.find(data)
     return [x.value for x in match]
 
 
+@lru_cache(maxsize=128)
+def split_jsonpath(expr):
+    """
+    Split an expression of the form $.<key>[*]<rest> into <key> and <rest>, so that <rest> can be applied to
+    the records under <key> one at a time. Returns None for expressions that need the whole document.
+    """
+    parts = []
+    node = compile_jsonpath(expr)
+    while isinstance(node, Child):
+        parts.append(node.right)
+        node = node.left
+    parts.append(node)
+    parts.reverse()
+    if isinstance(parts[0], Root):
+        parts = parts[1:]
+    if len(parts) < 2 or not isinstance(parts[0], Fields) or len(parts[0].fields) != 1 or parts[0].fields[0] == "*":
+        return None
+    if not isinstance(parts[1], Slice) or (parts[1].start, parts[1].end, parts[1].step) != (None, None, None):
+        return None
+    rest = This()
+    for part in parts[2:]:
+        rest = Child(rest, part)
+    return parts[0].fields[0], rest
+
+
+class JSONPathOutput(object):
+    """
+    Prints the values a jsonpath expression matches in a results dict, one JSON value per line.
+
+    Expressions of the form $.<key>[*]<rest> are applied to each record as it arrives. Any other expression
+    is applied to the whole results once they are complete.
+    """
+
+    def __init__(self, expr, out=None):
+        self.expr = expr
+        self.out = out or sys.stdout
+        self._split = split_jsonpath(expr)
+
+    def record(self, key, record):
+        """Print the matches of one record found under key"""
+        if self._split is not None and self._split[0] == key:
+            for match in self._split[1].find(record):
+                self._write(match.value)
+
+    def finish(self, results):
+        """Print the matches of an expression that could not be applied record by record"""
+        if self._split is None:
+            for value in find_jsonpath(results, self.expr):
+                self._write(value)
+
+    def _write(self, value):
+        self.out.write(json.dumps(value) + "\n")
+        self.out.flush()
+
+
+class TemplateOutput(object):
+    """Prints every record of a results dict through a str.format template, one line per record"""
+
+    def __init__(self, template, out=None):
+        self.template = template
+        self.out = out or sys.stdout
+
+    def record(self, key, record):
+        self.out.write(self.template.format_map(record) + "\n")
+        self.out.flush()
+
+    def finish(self, results):
+        pass
+
+
+def map_ordered(func, items, workers=1):
+    """Apply func to every item, on a thread pool when workers > 1. Results keep input order."""
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [func(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def imap_ordered(func, items, workers=1):
+    """
+    Apply func to every item, on a thread pool when workers > 1, and yield the results in input order as
+    soon as each one is ready. At most 2 * workers items are in flight, so items are consumed lazily.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def merge_hits(results, key="id"):
+    """
+    Merge the hit lists of many searches into one list of distinct hits, in the order they are first seen.
+
+    Hits are indexed by their key, so overlapping searches cost one dict lookup per hit. Hits without the
+    key cannot be matched and are all kept. A GraphQLError in results is raised.
+    """
+    seen = {}
+    for hits in results:
+        if isinstance(hits, Exception):
+            raise hits
+        for hit in hits:
+            ident = hit.get(key)
+            if ident is None:
+                ident = object()
+            seen.setdefault(ident, hit)
+    return list(seen.values())
+
+
+def shallow_asdict(o):
+    """Map dataclass fields to their values without copying them. The JSON encoder walks nested values itself"""
+    return {f.name: getattr(o, f.name) for f in dataclasses.fields(o)}
+
+
 class EnhancedJSONEncoder(json.JSONEncoder):
     def default(self, o):
         if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)
+            return shallow_asdict(o)
         return super().default(o)
+
+
+_encoder = EnhancedJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def json_dumps(data):
+    """Encode data, including dataclass models, as compact UTF-8 JSON bytes. Uses orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return _encoder.encode(data).encode("utf-8")
+
+
+def json_loads(data):
+    """Decode UTF-8 JSON bytes. Uses orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RawJSON(bytes):
+    """Already encoded JSON text, sent as it is wherever the client expects a JSON value"""
@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from dataclasses import asdict, dataclass, field
-from typing import List
+from typing import List, Optional
 
 from .models import Event, EventReceiver, EventReceiverGroup
 
@@ -15,6 +15,17 @@ class Config:
     url: str
     token: str
     debug: bool = False
+    workers: int = 1
+    cache_dir: Optional[str] = None
+    cache_ttl: float = 300.0
+    if_absent: bool = False
+    jsonpath: Optional[str] = None
+    template: Optional[str] = None
+    search_all: bool = False
+    page_size: int = 500
+    bulk: bool = False
+    batch_size: int = 100
+    local: bool = False
 
     events: List[Event] = field(default_factory=list)
     event_receivers: List[EventReceiver] = field(default_factory=list)
@@ -4,8 +4,64 @@
 
 import json
 
+from .cache import ResponseCache
 from .client import Client
+from .common import JSONPathOutput, map_ordered
 from .config import Config
+from .fingerprint import GroupFingerprint, ReceiverFingerprint, fingerprint_of
+from .index import FingerprintIndex
+
+# fields that identify a receiver or group in the search that checks whether it already exists
+_LOOKUP_PARAMS = ("name", "type", "version")
+_LOOKUP_FIELDS = {
+    "event_receivers": ["id", "name", "type", "version", "description"],
+    "event_receiver_groups": ["id", "name", "type", "version", "description", "enabled", "event_receiver_ids"],
+}
+_FINGERPRINTS = {"event_receivers": ReceiverFingerprint, "event_receiver_groups": GroupFingerprint}
+_SEARCH_MANY = {
+    "event_receivers": "search_event_receivers_many",
+    "event_receiver_groups": "search_event_receiver_groups_many",
+}
+
+
+def find_existing(client: Client, index: FingerprintIndex, operation: str, models: list) -> dict:
+    """
+    Find the server ids of receivers or groups that already exist.
+
+    Fingerprints are looked up in the local index first. The misses are checked with one batched search and
+    whatever the server already has is added to the index.
+
+    Args:
+        client (Client): The client.
+        index (FingerprintIndex): The local fingerprint index.
+        operation (str): event_receivers or event_receiver_groups.
+        models (list): The receivers or groups.
+
+    Returns:
+        dict: The ids of the models that exist, keyed by fingerprint.
+    """
+    fingerprints = [fp for fp in (model.compute_fingerprint() for model in models) if fp]
+    known = index.get_many(client.url, operation, fingerprints)
+    misses = {}
+    for model in models:
+        fp = model.compute_fingerprint()
+        if fp and fp not in known:
+            misses.setdefault(fp, model)
+    if not misses:
+        return known
+    params = [{k: getattr(model, k) for k in _LOOKUP_PARAMS if getattr(model, k)} for model in misses.values()]
+    found = {}
+    keys = _FINGERPRINTS[operation].keys
+    for fp, hits in zip(misses, getattr(client, _SEARCH_MANY[operation])(params, _LOOKUP_FIELDS[operation])):
+        if isinstance(hits, Exception):
+            continue
+        for hit in hits:
+            if fingerprint_of(hit, keys) == fp:
+                found[fp] = hit["id"]
+                break
+    index.set_many(client.url, operation, found.items())
+    known.update(found)
+    return known
 
 
 def create(config: Config):
@@ -16,26 +72,87 @@ def create(config: Config):
         url = "http://localhost:8042"
     # headers = {"Authorization": "Bearer " + config.token}
     headers = {}
-    client = Client(url, headers=headers)
-
-    events = []
-    for e in config.events:
-        event = client.create_event(params=e.as_dict())
-        event_id = event["data"]["create_event"]
-        events.append(event_id)
-    event_receivers = []
-    for er in config.event_receivers:
-        event_receiver = client.create_event_receiver(params=er.as_dict())
-        event_receiver_id = event_receiver["data"]["create_event_receiver"]
-        event_receivers.append(event_receiver_id)
-    event_receiver_groups = []
-    for erg in config.event_receiver_groups:
-        event_receiver_group = client.create_event_receiver_group(params=erg.as_dict())
-        event_receiver_group_id = event_receiver_group["data"]["create_event_receiver_group"]
-        event_receiver_groups.append(event_receiver_group_id)
+    workers = max(config.workers, 1)
+    cache = None
+    if config.cache_dir is not None:
+        cache = ResponseCache.from_dir(config.cache_dir, ttl=config.cache_ttl)
+    client = Client(url, headers=headers, maxsize=max(workers, 10), cache=cache)
+    index = FingerprintIndex.from_dir(config.cache_dir) if config.if_absent else None
+
+    def create_event(e):
+        event = client.create_event(params=e)
+        return event["data"]["create_event"]
+
+    def create_event_receiver(er):
+        event_receiver = client.create_event_receiver(params=er)
+        return event_receiver["data"]["create_event_receiver"]
+
+    def create_event_receiver_group(erg):
+        event_receiver_group = client.create_event_receiver_group(params=erg)
+        return event_receiver_group["data"]["create_event_receiver_group"]
+
+    def plan(operation, models):
+        # (indexes of the models to create, ids of the models that exist). Identical models are created once
+        if index is None:
+            return list(range(len(models))), {}
+        existing = find_existing(client, index, operation, models)
+        pending, seen = [], set()
+        for i, model in enumerate(models):
+            fp = model.compute_fingerprint()
+            if fp is None or (fp not in existing and fp not in seen):
+                pending.append(i)
+                seen.add(fp)
+        return pending, existing
+
+    def merge(operation, models, pending, created, existing):
+        results = [None] * len(models)
+        new = {}
+        for i, result in zip(pending, created):
+            results[i] = result
+            fp = models[i].compute_fingerprint()
+            if fp is not None and isinstance(result, str):
+                new[fp] = result
+        if index is None:
+            return results
+        index.set_many(client.url, operation, new.items())
+        ids = {**existing, **new}
+        pending = set(pending)
+        for i, model in enumerate(models):
+            if i not in pending:
+                results[i] = ids.get(model.compute_fingerprint())
+        return results
+
+    # groups and events reference event receiver ids, so every receiver is created first
+    receivers_pending, receivers_existing = plan("event_receivers", config.event_receivers)
+    created = map_ordered(create_event_receiver, [config.event_receivers[i] for i in receivers_pending], workers)
+    event_receivers = merge("event_receivers", config.event_receivers, receivers_pending, created, receivers_existing)
+    groups_pending, groups_existing = plan("event_receiver_groups", config.event_receiver_groups)
+    tasks = [(create_event_receiver_group, config.event_receiver_groups[i]) for i in groups_pending]
+    tasks += [(create_event, e) for e in config.events]
+    created = map_ordered(lambda task: task[0](task[1]), tasks, workers)
+    event_receiver_groups = merge(
+        "event_receiver_groups",
+        config.event_receiver_groups,
+        groups_pending,
+        created[: len(groups_pending)],
+        groups_existing,
+    )
+    events = created[len(groups_pending) :]
+    client.close()
+    if cache is not None:
+        cache.close()
+    if index is not None:
+        index.close()
 
     results = {"events": events, "event_receivers": event_receivers, "event_receiver_groups": event_receiver_groups}
-    stdout = json.dumps(results)
-    print(f"{stdout}")
+    if config.jsonpath:
+        output = JSONPathOutput(config.jsonpath)
+        for key, records in results.items():
+            for record in records:
+                output.record(key, record)
+        output.finish(results)
+    else:
+        stdout = json.dumps(results)
+        print(f"{stdout}")
 
     return results
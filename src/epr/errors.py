@@ -52,6 +52,12 @@ class GraphQLError(EPRError):
     message = "Error making GraphQL request to EPR"
 
 
+class OutcomeUnknownError(GraphQLError):
+    """Raised for a batched mutation whose result was lost when an error in another field nulled the response"""
+
+    message = "Outcome of the batched GraphQL mutation is unknown, it may have been applied"
+
+
 def debug_except_hook(type, value, tb):
     print(f"epr python hates {type.__name__}")
     print(str(type))
@@ -3,41 +3,50 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+VERSION = "v1"
+
+
+def fingerprint_of(data, keys):
+    """Return the v1 fingerprint of the keys of a dict or model, or None when one of them is missing"""
+    get = data.get if isinstance(data, dict) else lambda k: getattr(data, k, None)
+    # the pieces of the "v1 <value> <value> ..." seed are joined once and hashed in a single update,
+    # which is linear in the size of the seed where repeated concatenation was quadratic
+    parts = [VERSION]
+    for k in keys:
+        v = get(k)
+        if v is None:
+            return None
+        if isinstance(v, str):
+            if not v:
+                return None
+            parts.append(str(v))
+        elif isinstance(v, (list, tuple)):
+            if not v:
+                return None
+            parts.extend(map(str, v))
+        elif isinstance(v, dict):
+            if not v:
+                return None
+            for x, y in v.items():
+                parts.append(str(x))
+                parts.append(str(y))
+        else:
+            # False and 0 are real values, only absent or empty ones leave the fingerprint undefined
+            parts.append(str(v))
+    return hashlib.sha256(" ".join(parts).encode("utf-8")).hexdigest()
 
 
 class Fingerprint(object):
-    def __init__(self, data, keys):
+    keys = ()
+
+    def __init__(self, data, keys=None):
         self._data = data
-        self._keys = sorted(keys)
-        self._fingerprint = None
-        if self._check():
-            self._fingerprint = self._calculate()
-
-    def _hash_string(self, data):
-        hasher = hashlib.sha256()
-        hasher.update(data.encode("utf-8"))
-        return hasher.hexdigest()
-
-    def _check(self):
-        for k in self._keys:
-            if not self._data.get(k, False):
-                return False
-        return True
-
-    def _calculate(self):
-        seed = "v1"
-        for k in self._keys:
-            v = self._data.get(k)
-            if isinstance(v, (list, tuple)):
-                for x in v:
-                    seed += " " + str(x)
-            elif isinstance(v, dict):
-                for x, y in v.items():
-                    seed += " " + str(x) + " " + str(y)
-            else:
-                seed += " " + str(v)
-        print("SEED : %s" % seed)
-        return self._hash_string(seed)
+        self._keys = sorted(keys) if keys is not None else self.keys
+        self._fingerprint = fingerprint_of(data, self._keys)
 
     @property
     def fingerprint(self):
@@ -49,12 +58,10 @@ class Fingerprint(object):
 
 
 class ReceiverFingerprint(Fingerprint):
+    keys = ("type", "description", "name", "version")
+
     def __init__(self, data):
-        self._data = data
-        self._keys = ("type", "description", "name", "version")
-        self._fingerprint = None
-        if self._check():
-            self._fingerprint = self._calculate()
+        super(ReceiverFingerprint, self).__init__(data)
 
     @classmethod
     def new(cls, data):
@@ -62,13 +69,46 @@ class ReceiverFingerprint(Fingerprint):
 
 
 class GroupFingerprint(Fingerprint):
+    keys = ("type", "description", "name", "version", "enabled", "event_receiver_ids")
+
     def __init__(self, data):
-        self._data = data
-        self._keys = ("type", "description", "name", "version", "enabled", "event_receiver_ids")
-        self._fingerprint = None
-        if self._check():
-            self._fingerprint = self._calculate()
+        super(GroupFingerprint, self).__init__(data)
 
     @classmethod
     def new(cls, data):
         return cls(data)
+
+
+def _fingerprint_chunk(keys, chunk):
+    return [fingerprint_of(data, keys) for data in chunk]
+
+
+def _chunks(items, size):
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def fingerprint_many(items, kind=ReceiverFingerprint, processes=None, threshold=50000, chunksize=2000):
+    """
+    Fingerprint a list of receivers or groups, given as dicts or models.
+
+    Args:
+        items (list): The receivers or groups.
+        kind (type, optional): ReceiverFingerprint or GroupFingerprint. Defaults to ReceiverFingerprint.
+        processes (int, optional): Size of the process pool used for lists of at least `threshold` items.
+            Defaults to None, which never starts a pool.
+        threshold (int, optional): Smallest list worth the cost of a process pool. Defaults to 50000.
+        chunksize (int, optional): Items sent to a worker process at a time. Defaults to 2000.
+
+    Returns:
+        list: The fingerprints in input order, None where a required field is missing.
+    """
+    items = list(items)
+    if not processes or len(items) < threshold:
+        return _fingerprint_chunk(kind.keys, items)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = pool.map(partial(_fingerprint_chunk, kind.keys), _chunks(items, chunksize))
+        return [fingerprint for chunk in results for fingerprint in chunk]
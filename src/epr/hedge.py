@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgePolicy:
+    """Settings for hedged requests. The hedge delay is the given percentile of recent latencies"""
+
+    percentile: float = 95.0
+    min_delay: float = 0.005
+    max_delay: float = 2.0
+    initial_delay: float = 0.25
+    window: int = 512
+    min_samples: int = 20
+    max_workers: int = 32
+
+
+class LatencyTracker(object):
+    """Sliding window of request latencies"""
+
+    def __init__(self, window: int = 512):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(p / 100.0 * len(samples)) - 1))
+        return samples[index]
+
+
+class Hedger(object):
+    """
+    Runs idempotent calls with a hedge: when the first attempt has not answered within the hedge delay
+    a second identical attempt starts, and whichever finishes first wins.
+    """
+
+    def __init__(self, policy: Optional[HedgePolicy] = None):
+        self.policy = policy or HedgePolicy()
+        self.latency = LatencyTracker(self.policy.window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait for the first attempt before sending the hedge"""
+        if len(self.latency) < self.policy.min_samples:
+            return self.policy.initial_delay
+        delay = self.latency.percentile(self.policy.percentile)
+        return min(self.policy.max_delay, max(self.policy.min_delay, delay))
+
+    @property
+    def stats(self) -> dict:
+        return {"calls": self.calls, "hedged": self.hedged, "hedge_wins": self.hedge_wins, "delay": self.delay}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.policy.max_workers, thread_name_prefix="epr-hedge")
+            return self._pool
+
+    def _timed(self, fn: Callable, started: Optional[threading.Event] = None):
+        if started is not None:
+            started.set()
+        start = time.monotonic()
+        result = fn()
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    def call(self, fn: Callable):
+        """Call fn, hedging it once if it is slower than the current hedge delay"""
+        pool = self._executor()
+        with self._lock:
+            self.calls += 1
+        delay = self.delay
+        started = threading.Event()
+        first = pool.submit(self._timed, fn, started)
+        # the hedge delay runs from when a worker picks up the attempt: time spent queued behind other calls
+        # says nothing about the server and would only queue more hedges
+        started.wait()
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        with self._lock:
+            self.hedged += 1
+        logger.debug("hedging request after %.3fs", delay)
+        second = pool.submit(self._timed, fn)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
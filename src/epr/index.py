@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from .cache import SQLiteDatabase, default_cache_dir
+
+# sqlite refuses statements with more host parameters than this on older builds
+_MAX_PARAMS = 900
+
+
+class FingerprintIndex(SQLiteDatabase):
+    """
+    Local map of receiver and group fingerprints to the ids the server gave them, per server URL.
+
+    Lets `create` skip the round trip for definitions it has already created or found on the server.
+    """
+
+    def __init__(self, path):
+        super(FingerprintIndex, self).__init__(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints "
+            "(url TEXT, kind TEXT, fingerprint TEXT, id TEXT, PRIMARY KEY (url, kind, fingerprint))"
+        )
+
+    @classmethod
+    def from_dir(cls, cache_dir=None):
+        """Open the index in cache_dir (the default cache dir when None)"""
+        cache_dir = cache_dir or default_cache_dir()
+        return cls(os.path.join(cache_dir, "fingerprints.db"))
+
+    def get_many(self, url: str, kind: str, fingerprints: Iterable[str]) -> Dict[str, str]:
+        """Return the known ids of fingerprints, keyed by fingerprint"""
+        fingerprints = list(dict.fromkeys(fingerprints))
+        found = {}
+        with self._lock:
+            for i in range(0, len(fingerprints), _MAX_PARAMS):
+                chunk = fingerprints[i : i + _MAX_PARAMS]
+                rows = self._db.execute(
+                    "SELECT fingerprint, id FROM fingerprints WHERE url = ? AND kind = ? "
+                    f"AND fingerprint IN ({', '.join('?' * len(chunk))})",
+                    (url, kind, *chunk),
+                )
+                found.update(rows)
+        return found
+
+    def get(self, url: str, kind: str, fingerprint: str) -> Optional[str]:
+        return self.get_many(url, kind, [fingerprint]).get(fingerprint)
+
+    def set_many(self, url: str, kind: str, items: Iterable[Tuple[str, str]]):
+        """Record (fingerprint, id) pairs"""
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO fingerprints (url, kind, fingerprint, id) VALUES (?, ?, ?, ?)",
+                [(url, kind, fingerprint, server_id) for fingerprint, server_id in items],
+            )
+            self._db.execute("COMMIT")
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM fingerprints")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from .cache import ResponseCache
+from .client import DEFAULT_BATCH_SIZE, Client
+from .config import Config
+from .models import Event
+
+
+def iter_lines(path):
+    """Yield lines from an NDJSON file, or from stdin when path is "-" """
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, "r", encoding="utf-8") as fh:
+        yield from fh
+
+
+def parse_records(lines):
+    """Yield (line number, record) pairs. A line that is not valid JSON yields its ValueError instead"""
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield lineno, json.loads(line)
+        except ValueError as e:
+            yield lineno, e
+
+
+def to_models(records, model=Event):
+    """Turn (line number, record) pairs into (line number, model) pairs"""
+    for lineno, record in records:
+        if isinstance(record, Exception):
+            yield lineno, record
+            continue
+        try:
+            yield lineno, model(**record)
+        except TypeError as e:
+            yield lineno, e
+
+
+def iter_batches(items, size):
+    """Yield lists of at most size items without reading ahead any further"""
+    items = iter(items)
+    batch = list(islice(items, size))
+    while batch:
+        yield batch
+        batch = list(islice(items, size))
+
+
+def submit(client: Client, models, batch_size=DEFAULT_BATCH_SIZE, workers=1):
+    """
+    Create events from (line number, model) pairs and yield (line number, id or exception) in input order.
+
+    At most `workers` batches are held in memory at once, so memory use does not grow with the input.
+    """
+
+    def send(batch):
+        valid = [model for _, model in batch if not isinstance(model, Exception)]
+        created = iter(client.create_events(valid, batch_size=batch_size))
+        return [(lineno, model if isinstance(model, Exception) else next(created)) for lineno, model in batch]
+
+    if workers <= 1:
+        for batch in iter_batches(models, batch_size):
+            yield from send(batch)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in iter_batches(models, batch_size):
+            pending.append(pool.submit(send, batch))
+            if len(pending) >= workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def create_from_file(config: Config, path, batch_size=DEFAULT_BATCH_SIZE, out=None):
+    """Create one Event per NDJSON record in path and write one NDJSON result line per record to out"""
+
+    url = config.url
+    if url is None:
+        url = "http://localhost:8042"
+    # headers = {"Authorization": "Bearer " + config.token}
+    headers = {}
+    workers = max(config.workers, 1)
+    out = out or sys.stdout
+    summary = {"created": 0, "failed": 0}
+    # the cache is passed so that the new events invalidate the cached event searches
+    cache = None
+    if config.cache_dir is not None:
+        cache = ResponseCache.from_dir(config.cache_dir, ttl=config.cache_ttl)
+    try:
+        with Client(url, headers=headers, maxsize=max(workers, 10), cache=cache) as client:
+            models = to_models(parse_records(iter_lines(path)), Event)
+            for lineno, result in submit(client, models, batch_size=batch_size, workers=workers):
+                if isinstance(result, Exception):
+                    summary["failed"] += 1
+                    record = {"line": lineno, "error": str(result)}
+                else:
+                    summary["created"] += 1
+                    record = {"line": lineno, "id": result}
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        if cache is not None:
+            cache.close()
+    return summary
@@ -3,13 +3,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import json
 import logging
 import os
 import sys
 
-from . import constants, create, errors, search
+from . import common, constants, create, errors, ingest, replica, search
+from .client import DEFAULT_PAGE_SIZE, Client
 from .config import Config
-from .models import Event, EventReceiver, EventReceiverGroup
+from .models import REQUIRED_EVENT_FIELDS, Event, EventReceiver, EventReceiverGroup
 
 debug = os.environ.get("EPR_DEBUG", False)
 level = logging.INFO
@@ -30,6 +32,8 @@ class CmdLine(object):
             eprcli commands are:
                 create      create Events, Event Receivers, and Event Receiver Groups
                 search      search Events, Event Receivers, and Event Receiver Groups
+                hash        hash build artifacts
+                sync        mirror Event Receivers and Event Receiver Groups into a local replica
 
             """,
         )
@@ -45,6 +49,8 @@ class CmdLine(object):
         # use dispatch pattern to invoke method with same name
         getattr(self, args.command)()
 
+    _event_required = REQUIRED_EVENT_FIELDS
+
     def _handle_fields(self, value):
         fields = None
         ulid_length = 26  # a valid ULID length is 26 characters
@@ -60,6 +66,24 @@ class CmdLine(object):
             raise ValueError(f"Invalid value: {value}")
         return fields
 
+    def _artifacts_payload(self, payload, artifacts, parser):
+        """
+        Hash the artifacts and add their digests to the payload given on the command line. The payload is
+        returned as a JSON string, the way --payload is sent without --artifacts.
+        """
+        try:
+            payload = json.loads(payload) if payload else {}
+        except ValueError as e:
+            parser.error(f"--payload must be a JSON object to add --artifacts to it: {e}")
+        if not isinstance(payload, dict):
+            parser.error("--payload must be a JSON object to add --artifacts to it")
+        payload["artifacts"] = []
+        for path, digest in common.hash_files(artifacts):
+            if isinstance(digest, Exception):
+                parser.error(f"cannot hash {path}: {digest}")
+            payload["artifacts"].append({"path": path, "digest": digest})
+        return json.dumps(payload)
+
     def create(self):
         """
         create Events, Event Receivers, and Event Receiver Groups
@@ -98,6 +122,37 @@ class CmdLine(object):
             default=False,
             help="Turn debug on",
         )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            action="store",
+            type=int,
+            default=1,
+            help="Number of requests to run concurrently",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            action="store",
+            default=os.environ.get("EPR_CACHE_DIR"),
+            help="Directory for the persistent response cache (default $EPR_CACHE_DIR, off when unset)",
+        )
+        parser.add_argument(
+            "--cache-ttl",
+            dest="cache_ttl",
+            action="store",
+            type=float,
+            default=300.0,
+            help="Seconds a cached search response stays valid",
+        )
+        parser.add_argument(
+            "--if-absent",
+            dest="if_absent",
+            action="store_true",
+            default=False,
+            help="Reuse Event Receivers and Groups that already exist, found through a local fingerprint index "
+            "in the cache dir and a batched search",
+        )
         subparsers = parser.add_subparsers(dest="subparser_name", help="Sub-commands for create")
         event_parser = subparsers.add_parser("event", help="Event related options")
         event_parser.add_argument(
@@ -105,7 +160,6 @@ class CmdLine(object):
             dest="name",
             action="store",
             default=None,
-            required=True,
             help="Name of the Event",
         )
         event_parser.add_argument(
@@ -113,7 +167,6 @@ class CmdLine(object):
             dest="version",
             action="store",
             default=None,
-            required=True,
             help="Version of the Event",
         )
         event_parser.add_argument(
@@ -121,7 +174,6 @@ class CmdLine(object):
             dest="release",
             action="store",
             default=None,
-            required=True,
             help="Release of the Event",
         )
         event_parser.add_argument(
@@ -129,7 +181,6 @@ class CmdLine(object):
             dest="platform_id",
             action="store",
             default=None,
-            required=True,
             help="Platform ID of the Event",
         )
         event_parser.add_argument(
@@ -137,7 +188,6 @@ class CmdLine(object):
             dest="package",
             action="store",
             default=None,
-            required=True,
             help="Package of the Event",
         )
         event_parser.add_argument(
@@ -145,7 +195,6 @@ class CmdLine(object):
             dest="description",
             action="store",
             default=None,
-            required=True,
             help="Description of the Event",
         )
         event_parser.add_argument(
@@ -153,7 +202,6 @@ class CmdLine(object):
             dest="payload",
             action="store",
             default=None,
-            required=True,
             help="Payload of the Event",
         )
         event_parser.add_argument(
@@ -169,9 +217,31 @@ class CmdLine(object):
             dest="event_receiver_id",
             action="store",
             default=None,
-            required=True,
             help="Event Receiver ID of the Event",
         )
+        event_parser.add_argument(
+            "--artifacts",
+            dest="artifacts",
+            action="store",
+            nargs="+",
+            default=None,
+            help="Files or directories to hash, their sha256 digests are added to the payload as 'artifacts'",
+        )
+        event_parser.add_argument(
+            "--from-file",
+            dest="from_file",
+            action="store",
+            default=None,
+            help="Create one Event per record of an NDJSON file ('-' reads stdin)",
+        )
+        event_parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            action="store",
+            type=int,
+            default=100,
+            help="Number of Events sent per request with --from-file",
+        )
         event_receiver_parser = subparsers.add_parser("event-receiver", help="Event Receiver related options")
         event_receiver_parser.add_argument(
             "--name",
@@ -269,7 +339,29 @@ class CmdLine(object):
         cfg = Config(url=url, token=token)
 
         cfg.debug = args["debug"]
+        cfg.workers = args["workers"]
+        cfg.cache_dir = args["cache_dir"]
+        cfg.cache_ttl = args["cache_ttl"]
+        cfg.jsonpath = args["jsonpath_expr"]
+        cfg.if_absent = args["if_absent"]
         if args["subparser_name"] == "event":
+            if args["from_file"] is not None:
+                summary = ingest.create_from_file(cfg, args["from_file"], batch_size=args["batch_size"])
+                if summary["failed"]:
+                    # every error is already printed as a record, the exit status tells scripts that some failed
+                    logger.error("%d of %d events could not be created", summary["failed"], sum(summary.values()))
+                    sys.exit(1)
+                return summary
+            payload = args["payload"]
+            if args["artifacts"] is not None:
+                payload = self._artifacts_payload(payload, args["artifacts"], event_parser)
+            missing = [
+                f"--{k.replace('_', '-')}"
+                for k in self._event_required
+                if args[k] is None and not (k == "payload" and payload is not None)
+            ]
+            if missing:
+                event_parser.error(f"the following arguments are required: {', '.join(missing)}")
             event = Event()
             event.name = args["name"]
             event.version = args["version"]
@@ -277,7 +369,7 @@ class CmdLine(object):
             event.platform_id = args["platform_id"]
             event.package = args["package"]
             event.description = args["description"]
-            event.payload = args["payload"]
+            event.payload = payload
             event.success = args["success"]
             event.event_receiver_id = args["event_receiver_id"]
             cfg.events.append(event)
@@ -323,6 +415,12 @@ class CmdLine(object):
             action="store",
             help="Apply jsonpath to the results",
         )
+        parser.add_argument(
+            "--template",
+            dest="template",
+            action="store",
+            help="Print each hit through a format template such as '{id} {name}'",
+        )
 
         parser.add_argument(
             "--dry-run",
@@ -338,6 +436,66 @@ class CmdLine(object):
             default=False,
             help="Turn debug on",
         )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            action="store",
+            type=int,
+            default=1,
+            help="Number of requests to run concurrently",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            action="store",
+            default=os.environ.get("EPR_CACHE_DIR"),
+            help="Directory for the persistent response cache (default $EPR_CACHE_DIR, off when unset)",
+        )
+        parser.add_argument(
+            "--cache-ttl",
+            dest="cache_ttl",
+            action="store",
+            type=float,
+            default=300.0,
+            help="Seconds a cached search response stays valid",
+        )
+        parser.add_argument(
+            "--all",
+            dest="search_all",
+            action="store_true",
+            default=False,
+            help="Page through every hit and print each one as a JSON line instead of only the last hit",
+        )
+        parser.add_argument(
+            "--page-size",
+            dest="page_size",
+            action="store",
+            type=int,
+            default=500,
+            help="Hits fetched per request with --all",
+        )
+        parser.add_argument(
+            "--bulk",
+            dest="bulk",
+            action="store_true",
+            default=False,
+            help="Send the criteria as batched GraphQL documents and print every distinct hit",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            action="store",
+            type=int,
+            default=100,
+            help="Criteria per request with --bulk",
+        )
+        parser.add_argument(
+            "--local",
+            dest="local",
+            action="store_true",
+            default=False,
+            help="Answer from the replica written by eprcli sync where it has the records",
+        )
         subparsers = parser.add_subparsers(dest="subparser_name", help="Sub-commands for create")
         event_parser = subparsers.add_parser("event", help="Event related options")
         event_parser.add_argument(
@@ -533,6 +691,16 @@ class CmdLine(object):
         fields = self._handle_fields(args["fields"])
 
         cfg.debug = args["debug"]
+        cfg.workers = args["workers"]
+        cfg.cache_dir = args["cache_dir"]
+        cfg.cache_ttl = args["cache_ttl"]
+        cfg.jsonpath = args["jsonpath_expr"]
+        cfg.template = args["template"]
+        cfg.search_all = args["search_all"]
+        cfg.page_size = max(args["page_size"], 1)
+        cfg.bulk = args["bulk"]
+        cfg.batch_size = max(args["batch_size"], 1)
+        cfg.local = args["local"]
         if args["subparser_name"] == "event":
             event = Event()
             event.id = args["id"]
@@ -569,6 +737,90 @@ class CmdLine(object):
             cfg.event_receiver_group_fields = fields
         return search.search(cfg)
 
+    def hash(self):
+        """
+        hash build artifacts
+        """
+        parser = argparse.ArgumentParser(description="hash build artifacts and print their sha256 digests as NDJSON\n")
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help="Files or directories to hash",
+        )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            action="store",
+            type=int,
+            default=None,
+            help="Number of files hashed concurrently (default: number of CPUs)",
+        )
+        args = vars(parser.parse_args(sys.argv[2:]))
+
+        summary = {"hashed": 0, "failed": 0}
+        for path, digest in common.hash_files(args["paths"], workers=args["workers"]):
+            if isinstance(digest, Exception):
+                summary["failed"] += 1
+                record = {"path": path, "error": str(digest)}
+            else:
+                summary["hashed"] += 1
+                record = {"path": path, "digest": digest}
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+        if summary["failed"]:
+            # every error is already printed as a record, the exit status tells scripts that some failed
+            logger.error("%d of %d paths could not be hashed", summary["failed"], sum(summary.values()))
+            sys.exit(1)
+        return summary
+
+    def sync(self):
+        """
+        mirror Event Receivers and Event Receiver Groups into a local replica
+        """
+        parser = argparse.ArgumentParser(
+            description="mirror Event Receivers and Event Receiver Groups, and optionally Events, into a local "
+            "replica that search --local answers from\n"
+        )
+        parser.add_argument(
+            "--url",
+            dest="epr_url",
+            action="store",
+            help="EPR Server URL",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            action="store",
+            default=os.environ.get("EPR_CACHE_DIR"),
+            help="Directory of the replica (default $EPR_CACHE_DIR, else the user cache dir)",
+        )
+        parser.add_argument(
+            "--events",
+            dest="events",
+            action="store_true",
+            default=False,
+            help="Mirror Events too",
+        )
+        parser.add_argument(
+            "--page-size",
+            dest="page_size",
+            action="store",
+            type=int,
+            default=DEFAULT_PAGE_SIZE,
+            help="Records fetched per request",
+        )
+        args = vars(parser.parse_args(sys.argv[2:]))
+
+        kinds = replica.KINDS if args["events"] else replica.KINDS[:2]
+        local = replica.Replica.from_dir(args["cache_dir"])
+        try:
+            with Client(args["epr_url"]) as client:
+                written = replica.sync(client, local, kinds, page_size=max(args["page_size"], 1))
+        finally:
+            local.close()
+        print(json.dumps(written))
+        return written
+
     def version(self):
         """
         Prints version of eprcli
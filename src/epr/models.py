@@ -2,11 +2,19 @@
 # SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
 # SPDX-License-Identifier: Apache-2.0
 
-from dataclasses import asdict, dataclass, field
+import re
+import sys
+from array import array
+from dataclasses import MISSING, asdict, dataclass, field, fields, is_dataclass
 from enum import Enum
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from .fingerprint import GroupFingerprint, ReceiverFingerprint
+from .common import json_dumps
+from .fingerprint import GroupFingerprint, ReceiverFingerprint, fingerprint_of
+
+# slotted models have no per-instance __dict__, dataclass(slots=True) needs python 3.10
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class ModelType(Enum):
@@ -21,20 +29,135 @@ class ModelType(Enum):
         return self.lower() + "s"
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _accessors(cls):
+    """
+    Generate as_dict and as_dict_query for a model class. Both read every field once and build the dict
+    in one pass. Values are not copied, except nested models which become dicts as dataclasses.asdict does.
+    """
+    values = {}
+    for f in fields(cls):
+        values[f.name] = f"_asdict(self.{f.name})" if is_dataclass(f.type) else f"self.{f.name}"
+    items = ", ".join(f"{name!r}: {value}" for name, value in values.items())
+    lines = ["def as_dict(self):", f"    return {{{items}}}", "", "def as_dict_query(self):", "    d = {}"]
+    for name, value in values.items():
+        lines += [f"    v = {value}", "    if v:", f"        d[{name!r}] = v"]
+    lines.append("    return d")
+    namespace = {"_asdict": asdict}
+    exec("\n".join(lines), namespace)
+    return namespace["as_dict"], namespace["as_dict_query"]
+
+
+@dataclass(**SLOTS)
 class Model:
     """Base class for data objects. Provides as_dict"""
 
-    def as_dict(self):
-        """Get a dictionary contain object properties"""
-        return asdict(self)
+    def as_dict(self, deep=False):
+        """
+        Get a dictionary contain object properties.
+
+        Args:
+            deep (bool, optional): Return deep copies of the values instead of the values held by the model.
+                Defaults to False.
+        """
+        if deep:
+            return asdict(self)
+        return _accessors(type(self))[0](self)
+
+    def as_dict_query(self, deep=False):
+        """Get a dictionary contain the object properties that are set"""
+        if deep:
+            return {k: v for k, v in asdict(self).items() if v}
+        return _accessors(type(self))[1](self)
+
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _snapshot(value):
+    # an immutable copy to compare against later. Types are kept because 1, 1.0 and True compare
+    # equal but give different fingerprints, and nested lists and dicts are copied all the way down
+    if isinstance(value, dict):
+        return (type(value), tuple(map(_snapshot, value)), tuple(map(_snapshot, value.values())))
+    if isinstance(value, (list, tuple)):
+        types = tuple(map(type, value))
+        if _SCALARS.issuperset(types):
+            return (type(value), tuple(value), types)
+        return (type(value), tuple(map(_snapshot, value)))
+    return (type(value), value)
+
+
+def _direct_init(cls):
+    """
+    Replace the dataclass __init__ of a fingerprinted model with one that stores the fields through their
+    slots, or with object.__setattr__ when the model has none, so that building a model does not pay for
+    the __setattr__ that invalidates its cached fingerprint.
+    """
+    namespace = {"_set": object.__setattr__, "_MISSING": MISSING}
+    params, lines = [], []
+    for f in fields(cls):
+        value = f.name
+        if f.default_factory is not MISSING:
+            namespace[f"_factory_{f.name}"] = f.default_factory
+            params.append(f"{f.name}=_MISSING")
+            value = f"_factory_{f.name}() if {f.name} is _MISSING else {f.name}"
+        else:
+            namespace[f"_default_{f.name}"] = f.default
+            params.append(f"{f.name}=_default_{f.name}")
+        slot = cls.__dict__.get(f.name)
+        if hasattr(slot, "__set__"):
+            namespace[f"_set_{f.name}"] = slot.__set__
+            lines.append(f"    _set_{f.name}(self, {value})")
+        else:
+            lines.append(f"    _set(self, {f.name!r}, {value})")
+    exec("\n".join([f"def __init__(self, {', '.join(params)}):", *lines]), namespace)
+    init = namespace["__init__"]
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    cls.__init__ = init
+    return cls
 
-    def as_dict_query(self):
-        """Get a dictionary contain object properties"""
-        return {k: v for k, v in self.as_dict().items() if v}
 
+class FingerprintedModel(Model):
+    """
+    Base class for models with a fingerprint. The computed fingerprint is cached until a field it depends on
+    is assigned. The lists and dicts among those fields can also change in place, so the cache keeps a
+    snapshot of them and is only reused while they still compare equal.
+    """
 
-@dataclass
+    __slots__ = ("_fingerprint_cache",)
+    _fingerprint_kind = None
+    _fingerprint_keys = frozenset()
+
+    def __setattr__(self, name, value, _set=object.__setattr__):
+        _set(self, name, value)
+        if name in self._fingerprint_keys:
+            _set(self, "_fingerprint_cache", None)
+
+    def __getstate__(self):
+        # only the fields are pickled or copied, the cache is rebuilt by the first compute_fingerprint
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def compute_fingerprint(self):
+        cached = getattr(self, "_fingerprint_cache", None)
+        # a receiver has no mutable key fields, so a cached fingerprint is returned without any comparison
+        if cached is not None and all(_snapshot(getattr(self, k)) == snapshot for k, snapshot in cached[0]):
+            return cached[1]
+        keys = self._fingerprint_kind.keys
+        mutable = tuple(
+            (k, _snapshot(value))
+            for k, value in ((k, getattr(self, k)) for k in keys)
+            if isinstance(value, (list, dict))
+        )
+        fingerprint = fingerprint_of(self, keys)
+        object.__setattr__(self, "_fingerprint_cache", (mutable, fingerprint))
+        return fingerprint
+
+
+@dataclass(**SLOTS)
 class Event(Model):
     """Data class for Events"""
 
@@ -52,8 +175,152 @@ class Event(Model):
     event_receiver: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
-class EventReceiver(Model):
+REQUIRED_EVENT_FIELDS = (
+    "name",
+    "version",
+    "release",
+    "platform_id",
+    "package",
+    "description",
+    "payload",
+    "event_receiver_id",
+)
+
+ULID_PATTERN = re.compile(r"^[0-7][0-9A-HJKMNP-TV-Z]{25}$")
+
+
+class EventBatch(object):
+    """
+    Events stored column-wise for bulk handling.
+
+    String columns are interned: each distinct value is held once and rows store a small integer code, so
+    millions of events sharing a name, version or receiver id cost a few bytes per row. `success` is a byte
+    array. `payload` and `event_receiver` keep a reference to each row's dict.
+    """
+
+    _interned = tuple(f.name for f in fields(Event) if f.name not in ("payload", "success", "event_receiver"))
+
+    def __init__(self, events: Optional[Iterable[Event]] = None):
+        self._values = {name: [] for name in self._interned}
+        self._lookup = {name: {} for name in self._interned}
+        self._codes = {name: array("I") for name in self._interned}
+        self._encoded = {name: [] for name in self._interned}
+        self._success = array("b")
+        self._payload = []
+        self._event_receiver = []
+        if events is not None:
+            self.extend(events)
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventBatch":
+        return cls(events)
+
+    def to_events(self) -> List[Event]:
+        return list(self)
+
+    def __len__(self):
+        return len(self._success)
+
+    def __iter__(self) -> Iterator[Event]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> Event:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("EventBatch index out of range")
+        row = {name: self._values[name][self._codes[name][i]] for name in self._interned}
+        return Event(
+            success=bool(self._success[i]), payload=self._payload[i], event_receiver=self._event_receiver[i], **row
+        )
+
+    def append(self, event: Event):
+        for name in self._interned:
+            value = getattr(event, name)
+            lookup = self._lookup[name]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self._values[name])
+                self._values[name].append(value)
+            self._codes[name].append(code)
+        self._success.append(bool(event.success))
+        self._payload.append(event.payload)
+        self._event_receiver.append(event.event_receiver)
+
+    def extend(self, events: Iterable[Event]):
+        for event in events:
+            self.append(event)
+
+    def column(self, name: str) -> list:
+        """Return the values of one field for every row"""
+        if name == "success":
+            return [bool(x) for x in self._success]
+        if name in ("payload", "event_receiver"):
+            return list(getattr(self, "_" + name))
+        values = self._values[name]
+        return [values[code] for code in self._codes[name]]
+
+    def distinct(self, name: str) -> tuple:
+        """Return the distinct values of an interned column, each stored once however many rows share it"""
+        return tuple(self._values[name])
+
+    def _rows_where(self, name: str, bad) -> list:
+        # tests run once per distinct value, only the matching codes are looked up per row
+        codes = {code for code, value in enumerate(self._values[name]) if bad(value)}
+        if not codes:
+            return []
+        return [i for i, code in enumerate(self._codes[name]) if code in codes]
+
+    def validate(self, required: Iterable[str] = REQUIRED_EVENT_FIELDS) -> List[tuple]:
+        """
+        Check every row for missing required fields and malformed event receiver ids.
+
+        Args:
+            required (iterable, optional): The fields that must be set. Defaults to REQUIRED_EVENT_FIELDS.
+
+        Returns:
+            list: (row, message) pairs sorted by row, empty when every row is valid.
+        """
+        errors = []
+        for name in required:
+            if name in self._values:
+                rows = self._rows_where(name, lambda value: not value)
+            else:
+                rows = [i for i, value in enumerate(self.column(name)) if not value]
+            errors += [(i, f"missing {name}") for i in rows]
+        rows = self._rows_where("event_receiver_id", lambda value: value and not ULID_PATTERN.match(value))
+        errors += [(i, "event_receiver_id is not a ULID") for i in rows]
+        errors.sort(key=lambda error: error[0])
+        return errors
+
+    def encoded_rows(self) -> Iterator[bytes]:
+        """
+        Yield each row as the JSON object a bulk create sends for it. Every distinct value is encoded once and
+        reused by all the rows that share it.
+        """
+        for name in self._interned:
+            encoded = self._encoded[name]
+            prefix = json_dumps(name) + b":"
+            encoded.extend(prefix + json_dumps(value) for value in self._values[name][len(encoded) :])
+        # rows use Event's field order so they match the JSON of the equivalent Event
+        for i in range(len(self)):
+            parts = []
+            for name in Event.__dataclass_fields__:
+                if name == "success":
+                    parts.append(b'"success":true' if self._success[i] else b'"success":false')
+                elif name == "payload":
+                    parts.append(b'"payload":' + json_dumps(self._payload[i]))
+                elif name == "event_receiver":
+                    parts.append(b'"event_receiver":' + json_dumps(self._event_receiver[i]))
+                else:
+                    parts.append(self._encoded[name][self._codes[name][i]])
+            yield b"{" + b",".join(parts) + b"}"
+
+
+@_direct_init
+@dataclass(**SLOTS)
+class EventReceiver(FingerprintedModel):
     """Data class for EventReceivers"""
 
     id: str = field(default="", compare=False)
@@ -65,12 +332,13 @@ class EventReceiver(Model):
     fingerprint: str = ""
     created_at: str = field(default="", compare=False)
 
-    def compute_fingerprint(self):
-        return ReceiverFingerprint.new(self.as_dict()).fingerprint
+    _fingerprint_kind = ReceiverFingerprint
+    _fingerprint_keys = frozenset(ReceiverFingerprint.keys)
 
 
-@dataclass
-class EventReceiverGroup(Model):
+@_direct_init
+@dataclass(**SLOTS)
+class EventReceiverGroup(FingerprintedModel):
     """Data class for EventReceiverGroups"""
 
     id: str = field(default="", compare=False)
@@ -84,11 +352,11 @@ class EventReceiverGroup(Model):
     updated_at: str = field(default="", compare=False)
     fingerprint: str = ""
 
-    def compute_fingerprint(self):
-        return GroupFingerprint.new(self.as_dict()).fingerprint
+    _fingerprint_kind = GroupFingerprint
+    _fingerprint_keys = frozenset(GroupFingerprint.keys)
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Data(Model):
     """Data class for Data"""
 
@@ -97,7 +365,7 @@ class Data(Model):
     receiver_groups = List[EventReceiverGroup]
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Message(Model):
     """Data class for message to be sent to the message bus"""
 
@@ -115,7 +383,7 @@ class Message(Model):
     data: Data
 
 
-@dataclass
+@dataclass(**SLOTS)
 class GraphQLQuery(Model):
     query: str
     variables: str
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import string
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from jsonpath_ng import Child, Fields
+
+from .common import split_jsonpath
+from .errors import InvalidKeyError
+from .results import MODELS
+
+# the top-level field of a str.format field name such as "name", "payload[build]" or "event_receiver.name"
+_FIELD_NAME = re.compile(r"[^.\[]*")
+# fields holding an object, which cannot be selected without a sub-selection of its own fields
+NESTED_FIELDS = frozenset(["event_receiver"])
+
+
+@lru_cache(maxsize=None)
+def model_fields(operation: str) -> Tuple[str, ...]:
+    """Return the fields a search operation can select, read from the fields of its model"""
+    return tuple(f.name for f in dataclass_fields(MODELS[operation]))
+
+
+def validate_fields(operation: str, names) -> List[str]:
+    """
+    Check field names against the fields of the model of operation.
+
+    Returns:
+        list: The names, without duplicates, in order.
+
+    Raises:
+        InvalidKeyError: A name is not a field of the model.
+    """
+    known = model_fields(operation)
+    names = list(dict.fromkeys(names))
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise InvalidKeyError(f"{MODELS[operation].__name__} has no field {', '.join(unknown)}")
+    return names
+
+
+def _planned(operation: str, names) -> Optional[List[str]]:
+    # a nested object is not planned, its record is read with the default fields instead
+    names = validate_fields(operation, names)
+    if any(name in NESTED_FIELDS for name in names):
+        return None
+    return names
+
+
+def jsonpath_fields(expr: str, operation: str) -> Optional[List[str]]:
+    """
+    Derive the fields a search for operation needs to answer a jsonpath expression.
+
+    Only expressions that are applied record by record ($.<key>[*].<field>...) can be planned. Records of
+    other operations are not printed by such an expression, so they only need their id.
+
+    Returns:
+        list: The fields to select, or None when the expression needs whole records or reads a nested object.
+    """
+    split = split_jsonpath(expr)
+    if split is None:
+        return None
+    key, rest = split
+    if key != operation:
+        return ["id"]
+    first = None
+    while isinstance(rest, Child):
+        first, rest = rest.right, rest.left
+    if not isinstance(first, Fields) or "*" in first.fields:
+        return None
+    return _planned(operation, first.fields)
+
+
+def template_fields(template: str, operation: str) -> Optional[List[str]]:
+    """
+    Derive the fields a search for operation needs to fill a str.format template such as "{id} {name}".
+
+    Returns:
+        list: The fields to select, or None when the template reads a nested object.
+
+    Raises:
+        InvalidKeyError: The template has a positional field or a field that is not in the model.
+    """
+    names = []
+    for _, name, _, _ in string.Formatter().parse(template):
+        if name is None:
+            continue
+        base = _FIELD_NAME.match(name).group()
+        if not base or base.isdigit():
+            raise InvalidKeyError(f"template fields must be named, found {{{name}}}")
+        names.append(base)
+    return _planned(operation, names)
+
+
+def plan(
+    operation: str,
+    fields: Optional[list] = None,
+    jsonpath: Optional[str] = None,
+    template: Optional[str] = None,
+) -> Optional[List[str]]:
+    """
+    Choose the selection set of a search from what its output uses.
+
+    Explicit fields are used as given. Otherwise, and for an empty list, which selects nothing, the fields
+    are derived from the output template or the jsonpath expression, in that order.
+
+    Returns:
+        list: The fields to select, or None when the output needs every default field.
+    """
+    if fields:
+        return fields
+    if template:
+        return template_fields(template, operation)
+    if jsonpath:
+        return jsonpath_fields(jsonpath, operation)
+    return None
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+from .cache import SQLiteDatabase, default_cache_dir
+from .client import DEFAULT_PAGE_SIZE, Client
+from .projection import NESTED_FIELDS, model_fields
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("event_receivers", "event_receiver_groups", "events")
+_ITER_PAGES = {
+    "event_receivers": "iter_event_receivers",
+    "event_receiver_groups": "iter_event_receiver_groups",
+    "events": "iter_events",
+}
+# record fields copied into indexed columns, the rest of a lookup is matched against the stored record
+_COLUMNS = ("id", "name", "version", "type", "fingerprint")
+# rows written per transaction while syncing
+_SYNC_CHUNK = 1000
+
+
+def sync_fields(kind: str) -> List[str]:
+    """The fields a sync selects: every field of the model except nested objects, which need a sub-selection"""
+    return [name for name in model_fields(kind) if name not in NESTED_FIELDS]
+
+
+def _changed(record: dict) -> str:
+    return record.get("updated_at") or record.get("created_at") or ""
+
+
+class Replica(SQLiteDatabase):
+    """
+    Local copy of the receivers and groups, and optionally the events, of EPR servers, keyed by server URL.
+
+    Lookups by id, name, version, type or fingerprint are answered from indexes. A kind is only answered
+    locally once it has been synced for the server.
+    """
+
+    def __init__(self, path):
+        super(Replica, self).__init__(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS records (url TEXT, kind TEXT, id TEXT, name TEXT, version TEXT, type TEXT, "
+            "fingerprint TEXT, changed TEXT, record TEXT, PRIMARY KEY (url, kind, id))"
+        )
+        for column in _COLUMNS[1:]:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS records_{column} ON records (url, kind, {column})")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks (url TEXT, kind TEXT, watermark TEXT, PRIMARY KEY (url, kind))"
+        )
+
+    @classmethod
+    def from_dir(cls, cache_dir=None):
+        """Open the replica in cache_dir (the default cache dir when None)"""
+        cache_dir = cache_dir or default_cache_dir()
+        return cls(os.path.join(cache_dir, "replica.db"))
+
+    def watermark(self, url: str, kind: str) -> Optional[str]:
+        """Return the newest created_at or updated_at synced for kind, or None before its first sync"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark FROM watermarks WHERE url = ? AND kind = ?", (url, kind)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def upsert(self, url: str, kind: str, records: Iterable[dict], watermark: Optional[str] = None):
+        """Store records, replacing those with the same id, and move the watermark of kind forward"""
+        rows = [
+            (url, kind, *(record.get(c) for c in _COLUMNS), _changed(record), json.dumps(record)) for record in records
+        ]
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO records (url, kind, id, name, version, type, fingerprint, changed, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if watermark is not None:
+                self._db.execute(
+                    "INSERT INTO watermarks (url, kind, watermark) VALUES (?, ?, ?) ON CONFLICT (url, kind) "
+                    "DO UPDATE SET watermark = max(watermark, excluded.watermark)",
+                    (url, kind, watermark),
+                )
+            self._db.execute("COMMIT")
+
+    def search(self, url: str, kind: str, params: Optional[dict] = None) -> Optional[List[dict]]:
+        """
+        Find the records of kind whose fields equal params.
+
+        Args:
+            url (str): The server URL.
+            kind (str): The search operation, e.g. event_receivers.
+            params (dict, optional): Field values to match. Defaults to None, which matches every record.
+
+        Returns:
+            list: The matching records in the order they were synced, or None when the replica cannot answer:
+            kind was never synced or params has a key that is not a field of the model.
+        """
+        params = params or {}
+        # paging and other parameters that are not fields of the model are left to the server
+        if self.watermark(url, kind) is None or any(k not in model_fields(kind) for k in params):
+            return None
+        indexed = {k: v for k, v in params.items() if k in _COLUMNS and isinstance(v, str)}
+        rest = {k: v for k, v in params.items() if k not in indexed}
+        where = "".join(f" AND {column} = ?" for column in indexed)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT record FROM records WHERE url = ? AND kind = ?{where} ORDER BY rowid",
+                (url, kind, *indexed.values()),
+            ).fetchall()
+        records = [json.loads(row[0]) for row in rows]
+        if rest:
+            records = [r for r in records if all(r.get(k) == v for k, v in rest.items())]
+        return records
+
+    def count(self, url: str, kind: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT count(*) FROM records WHERE url = ? AND kind = ?", (url, kind)).fetchone()
+        return row[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM records")
+            self._db.execute("DELETE FROM watermarks")
+
+
+def sync(
+    client: Client, replica: Replica, kinds: Iterable[str] = KINDS[:2], page_size: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, int]:
+    """
+    Bring the replica of client's server up to date.
+
+    Every record is paged in, since searches cannot filter on creation time, but only records created or
+    updated after the watermark of the last sync are written.
+
+    Args:
+        client (Client): The client of the server to mirror.
+        replica (Replica): The replica.
+        kinds (iterable, optional): The kinds to sync. Defaults to event_receivers and event_receiver_groups.
+        page_size (int, optional): Records fetched per request. Defaults to 500.
+
+    Returns:
+        dict: The number of records written for each kind.
+    """
+    written = {}
+    for kind in kinds:
+        since = replica.watermark(client.url, kind) or ""
+        newest = since
+        pending = []
+        written[kind] = 0
+        for record in getattr(client, _ITER_PAGES[kind])({}, sync_fields(kind), page_size):
+            # records stamped with the watermark itself are written again, they may not all have been seen
+            changed = _changed(record)
+            if changed >= since:
+                pending.append(record)
+                newest = max(newest, changed)
+            if len(pending) >= _SYNC_CHUNK:
+                replica.upsert(client.url, kind, pending)
+                written[kind] += len(pending)
+                pending = []
+        # the watermark moves only once the whole kind has been read, so an interrupted sync is redone
+        replica.upsert(client.url, kind, pending, watermark=newest)
+        written[kind] += len(pending)
+        logger.debug("synced %d %s from %s", written[kind], kind, client.url)
+    return written
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from collections.abc import Sequence
+from dataclasses import MISSING, fields
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+
+from .errors import GraphQLError
+from .models import Event, EventReceiver, EventReceiverGroup, Model
+
+MODELS = {
+    "events": Event,
+    "event_receivers": EventReceiver,
+    "event_receiver_groups": EventReceiverGroup,
+}
+
+
+@lru_cache(maxsize=None)
+def _defaults(model: Type[Model]) -> dict:
+    """Map each field of model to a callable returning its default"""
+    defaults = {}
+    for f in fields(model):
+        if f.default_factory is not MISSING:
+            defaults[f.name] = f.default_factory
+        else:
+            defaults[f.name] = lambda value=f.default: value
+    return defaults
+
+
+class ModelView(object):
+    """
+    Read-only view of one record of a search response.
+
+    Attributes are read from the decoded record when they are accessed. A field the search did not ask for
+    reads as the model default. to_model() builds the real model instance.
+    """
+
+    __slots__ = ("_model", "_record")
+
+    def __init__(self, record: Dict[str, Any], model: Type[Model]):
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_model", model)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        default = _defaults(self._model).get(name)
+        if default is None:
+            raise AttributeError(f"{self._model.__name__} has no field {name}")
+        if name in self._record:
+            return self._record[name]
+        return default()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, name):
+        return self._record[name]
+
+    def __contains__(self, name):
+        return name in self._record
+
+    def __eq__(self, other):
+        if isinstance(other, ModelView):
+            return self._model is other._model and self._record == other._record
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{self._model.__name__}View({self._record!r})"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as decoded from the response, without copying it"""
+        return self._record
+
+    def to_model(self) -> Model:
+        """Build the model instance. Keys that are not fields of the model are ignored"""
+        defaults = _defaults(self._model)
+        return self._model(**{k: v for k, v in self._record.items() if k in defaults})
+
+
+class ResultSet(Sequence):
+    """The records of a search response. Views are created as records are accessed and are not kept"""
+
+    def __init__(self, records: List[Dict[str, Any]], model: Type[Model]):
+        self.records = records
+        self.model = model
+
+    @classmethod
+    def from_response(cls, response: dict, operation: str, model: Optional[Type[Model]] = None) -> "ResultSet":
+        """
+        Wrap the records of a decoded search response.
+
+        Args:
+            response (dict): The decoded GraphQL response.
+            operation (str): The search operation, the key of the records under "data".
+            model (type, optional): The model the records describe. Defaults to the model of the operation.
+
+        Returns:
+            ResultSet: The records of the response.
+
+        Raises:
+            GraphQLError: The response holds no data for the operation.
+        """
+        data = response.get("data") or {}
+        if data.get(operation) is None and response.get("errors"):
+            raise GraphQLError("; ".join(str(e.get("message")) for e in response["errors"]))
+        return cls(data.get(operation) or [], model or MODELS[operation])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return type(self)(self.records[i], self.model)
+        return ModelView(self.records[i], self.model)
+
+    def __repr__(self):
+        return f"ResultSet({self.model.__name__}, {len(self.records)} records)"
+
+    def to_models(self) -> List[Model]:
+        """Build a model instance for every record"""
+        return [view.to_model() for view in self]
@@ -3,9 +3,112 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import sys
 
+from . import projection
+from .cache import ResponseCache
 from .client import Client
+from .common import JSONPathOutput, TemplateOutput, imap_ordered, split_jsonpath
 from .config import Config
+from .replica import Replica
+
+_DEFAULT_FIELDS = {
+    "events": (
+        "id",
+        "name",
+        "version",
+        "release",
+        "platform_id",
+        "package",
+        "description",
+        "success",
+        "event_receiver_id",
+    ),
+    "event_receivers": ("id", "name", "type", "version", "description", "schema", "fingerprint", "created_at"),
+    "event_receiver_groups": ("id", "name", "type", "version", "description", "enabled", "created_at"),
+}
+
+
+def _fields(config: Config, fields, key):
+    # only what the output reads is fetched. The default fields are used when the output needs whole records.
+    # Kinds without criteria are not searched, so the output is not checked against their model
+    if not getattr(config, key):
+        return list(_DEFAULT_FIELDS[key])
+    planned = projection.plan(key, fields, config.jsonpath, config.template)
+    return list(_DEFAULT_FIELDS[key]) if planned is None else planned
+
+
+def _output(config: Config):
+    if config.template:
+        return TemplateOutput(config.template)
+    if config.jsonpath:
+        return JSONPathOutput(config.jsonpath)
+    return None
+
+
+def _stream_all(config: Config, criteria: list) -> dict:
+    """
+    Print every hit of every criterion as it is paged in, one JSON record per line.
+
+    Hits are not kept, so memory stays flat however many there are, unless a --jsonpath expression can only
+    be applied to the complete results.
+
+    Returns:
+        dict: The number of hits of each kind.
+    """
+    counts = {"events": 0, "event_receivers": 0, "event_receiver_groups": 0}
+    output = _output(config)
+    whole = isinstance(output, JSONPathOutput) and split_jsonpath(config.jsonpath) is None
+    results = {key: [] for key in counts}
+    for key, pages, model, fields in criteria:
+        for record in pages(params=model.as_dict_query(), fields=fields, page_size=config.page_size):
+            counts[key] += 1
+            if whole:
+                results[key].append(record)
+            elif output is not None:
+                output.record(key, record)
+            else:
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+    if whole:
+        output.finish(results)
+    return counts
+
+
+def _search_bulk(client: Client, config: Config, batches: list, workers: int) -> dict:
+    """
+    Run the criteria of each kind as aliased batch searches and merge the hits of all of them.
+
+    Every criterion contributes all of its hits. A hit found by several criteria is kept once, by id.
+
+    Returns:
+        dict: The distinct hits of each kind, in the order they were first found.
+    """
+    results = {"events": {}, "event_receivers": {}, "event_receiver_groups": {}}
+    output = _output(config)
+
+    def run(batch):
+        key, params, fields = batch
+        return key, client._search_batch(key, params, fields, batch_size=len(params))
+
+    # hits are merged batch by batch, the way merge_hits does, so --jsonpath prints each new hit when it is found
+    for key, found in imap_ordered(run, batches, workers):
+        seen = results[key]
+        for hits in found:
+            if isinstance(hits, Exception):
+                raise hits
+            for hit in hits:
+                ident = hit.get("id")
+                if ident is None:
+                    ident = object()
+                if ident not in seen:
+                    seen[ident] = hit
+                    if output is not None:
+                        output.record(key, hit)
+    results = {key: list(hits.values()) for key, hits in results.items()}
+    if output is not None:
+        output.finish(results)
+    return results
 
 
 def search(config: Config):
@@ -16,45 +119,94 @@ def search(config: Config):
         url = "http://localhost:8042"
     # headers = {"Authorization": "Bearer " + config.token}
     headers = {}
-    client = Client(url, headers=headers)
-
-    events = []
-    for e in config.events:
-        fields = config.event_fields
-        if fields is None:
-            fields = [
-                "id",
-                "name",
-                "version",
-                "release",
-                "platform_id",
-                "package",
-                "description",
-                "success",
-                "event_receiver_id",
-            ]
-        event = client.search_events(params=e.as_dict_query(), fields=fields)
-        event_result = event["data"]["events"][-1]
-        events.append(event_result)
-    event_receivers = []
-    for er in config.event_receivers:
-        fields = config.event_receiver_fields
-        if fields is None:
-            fields = ["id", "name", "type", "version", "description", "schema", "fingerprint", "created_at"]
-        event_receiver = client.search_event_receivers(params=er.as_dict_query(), fields=fields)
-        event_receiver_result = event_receiver["data"]["event_receivers"][-1]
-        event_receivers.append(event_receiver_result)
-    event_receiver_groups = []
-    for erg in config.event_receiver_groups:
-        fields = config.event_receiver_group_fields
-        if fields is None:
-            fields = ["id", "name", "type", "version", "description", "enabled", "created_at"]
-        event_receiver_group = client.search_event_receiver_groups(params=erg.as_dict_query(), fields=fields)
-        event_receiver_group_result = event_receiver_group["data"]["event_receiver_groups"][-1]
-        event_receiver_groups.append(event_receiver_group_result)
-
-    results = {"events": events, "event_receivers": event_receivers, "event_receiver_groups": event_receiver_groups}
-    stdout = json.dumps(results)
-    print(f"{stdout}")
+    workers = max(config.workers, 1)
+    event_fields = _fields(config, config.event_fields, "events")
+    event_receiver_fields = _fields(config, config.event_receiver_fields, "event_receivers")
+    event_receiver_group_fields = _fields(config, config.event_receiver_group_fields, "event_receiver_groups")
+
+    cache = None
+    if config.cache_dir is not None:
+        cache = ResponseCache.from_dir(config.cache_dir, ttl=config.cache_ttl)
+    local = Replica.from_dir(config.cache_dir) if config.local else None
+    # identical criteria searched by several workers at once share one request
+    client = Client(url, headers=headers, maxsize=max(workers, 10), cache=cache, replica=local, coalesce=workers > 1)
+
+    def close():
+        client.close()
+        if cache is not None:
+            cache.close()
+        if local is not None:
+            local.close()
+
+    if config.search_all:
+        criteria = [("events", client.iter_events, e, event_fields) for e in config.events]
+        criteria += [
+            ("event_receivers", client.iter_event_receivers, er, event_receiver_fields) for er in config.event_receivers
+        ]
+        criteria += [
+            ("event_receiver_groups", client.iter_event_receiver_groups, erg, event_receiver_group_fields)
+            for erg in config.event_receiver_groups
+        ]
+        try:
+            return _stream_all(config, criteria)
+        finally:
+            close()
+
+    if config.bulk:
+        batches = []
+        for key, models, fields in (
+            ("events", config.events, event_fields),
+            ("event_receivers", config.event_receivers, event_receiver_fields),
+            ("event_receiver_groups", config.event_receiver_groups, event_receiver_group_fields),
+        ):
+            params = [m.as_dict_query() for m in models]
+            # hits are merged by id, so it is fetched even when the output does not use it
+            fields = fields if "id" in fields else ["id", *fields]
+            batch_size = max(config.batch_size, 1)
+            batches += [(key, params[i : i + batch_size], fields) for i in range(0, len(params), batch_size)]
+        try:
+            results = _search_bulk(client, config, batches, workers)
+        finally:
+            close()
+        if not (config.jsonpath or config.template):
+            stdout = json.dumps(results)
+            print(f"{stdout}")
+        return results
+
+    def search_event(e):
+        event = client.search_events(params=e.as_dict_query(), fields=event_fields)
+        return event["data"]["events"][-1]
+
+    def search_event_receiver(er):
+        event_receiver = client.search_event_receivers(params=er.as_dict_query(), fields=event_receiver_fields)
+        return event_receiver["data"]["event_receivers"][-1]
+
+    def search_event_receiver_group(erg):
+        event_receiver_group = client.search_event_receiver_groups(
+            params=erg.as_dict_query(), fields=event_receiver_group_fields
+        )
+        return event_receiver_group["data"]["event_receiver_groups"][-1]
+
+    # searches are independent, so all of them share one pool of workers. Results are taken in order as
+    # they complete so --jsonpath can print matches without waiting for the last search
+    tasks = [("events", search_event, e) for e in config.events]
+    tasks += [("event_receivers", search_event_receiver, er) for er in config.event_receivers]
+    tasks += [("event_receiver_groups", search_event_receiver_group, erg) for erg in config.event_receiver_groups]
+    results = {"events": [], "event_receivers": [], "event_receiver_groups": []}
+    output = _output(config)
+    found = imap_ordered(lambda task: (task[0], task[1](task[2])), tasks, workers)
+    try:
+        for key, record in found:
+            results[key].append(record)
+            if output is not None:
+                output.record(key, record)
+    finally:
+        close()
+
+    if output is not None:
+        output.finish(results)
+    else:
+        stdout = json.dumps(results)
+        print(f"{stdout}")
 
     return results
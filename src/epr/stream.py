@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from .errors import GraphQLError
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+# consumed text is dropped from the buffer once this much of it has piled up
+_COMPACT_AT = 64 * 1024
+
+
+class _Reader(object):
+    """A text buffer filled on demand from an iterable of UTF-8 byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decode = json.JSONDecoder().raw_decode
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer. Returns False once the input is exhausted"""
+        if self.eof:
+            return False
+        if self.pos >= _COMPACT_AT:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += self._decoder.decode(chunk)
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it, "" at the end of the input"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the JSON value at the current position, reading more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number or literal cut off by the end of a chunk may decode as a shorter valid value
+            if isinstance(value, (dict, list, str)):
+                complete = True
+            else:
+                complete = end < len(self.buffer) and self.buffer[end] in _DELIMITERS
+            if complete or not self.fill():
+                self.pos = end
+                return value
+
+
+def _iter_array(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+def _find(reader: _Reader, path: Sequence[str], errors: Optional[list] = None) -> bool:
+    """Move the reader to the array at path inside the current object, collecting its "errors" into errors"""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return False
+    want = "[" if len(path) == 1 else "{"
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == path[0] and reader.peek() == want:
+            if len(path) == 1 or _find(reader, path[1:]):
+                return True
+        elif key == "errors" and errors is not None:
+            errors.extend(reader.value() or [])
+        else:
+            reader.value()
+        if reader.peek() == "}":
+            reader.pos += 1
+            return False
+        reader.expect(",")
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Sequence[str]) -> Iterator[Any]:
+    """
+    Yield the items of the JSON array found at path in a JSON object read from byte chunks.
+
+    Only the item being decoded and one chunk of input are held in memory at a time, so a response of any
+    size can be walked with bounded memory. Values that are not on the path are decoded and dropped.
+
+    Args:
+        chunks (iterable): The UTF-8 encoded document in chunks of any size.
+        path (sequence): The keys leading to the array, e.g. ("data", "events").
+
+    Returns:
+        Iterator[Any]: The decoded items of the array, in order.
+
+    Raises:
+        GraphQLError: The array is missing or null and the document carries GraphQL errors.
+        ValueError: The document is not valid JSON.
+    """
+    reader = _Reader(chunks)
+    errors = []
+    if _find(reader, path, errors):
+        yield from _iter_array(reader)
+        return
+    if errors:
+        raise GraphQLError("; ".join(str(e.get("message")) for e in errors))
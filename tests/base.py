@@ -8,6 +8,8 @@ import shutil
 import tempfile
 import unittest
 
+from benchmarks.stub import StubServer  # noqa: F401
+
 
 class BaseTestCase(unittest.TestCase):
     test_dir = "epr-test-"
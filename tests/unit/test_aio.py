@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import threading
+import time
+
+from epr import errors
+from epr.aio import AsyncClient, AsyncConnectionPool
+from tests import base
+
+
+class AsyncClientTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(AsyncClientTestCase, self).setUp()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        query = json.loads(body)
+        if query["query"].startswith("mutation"):
+            return {"data": {"create_event_receiver": "01HPW652DSJBHR5K4KCZQ97GJP"}}
+        return {
+            "data": {
+                "event_receivers": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP", "name": query["variables"]["obj"]["name"]}]
+            }
+        }
+
+    def run_client(self, coro_fn, **kwargs):
+        async def runner():
+            async with AsyncClient(self.server.url, **kwargs) as client:
+                return await coro_fn(client)
+
+        return asyncio.run(runner())
+
+    def test_search_event_receivers(self):
+        result = self.run_client(lambda c: c.search_event_receivers(params={"name": "foo"}, fields=["id", "name"]))
+        assert result["data"]["event_receivers"][-1]["name"] == "foo"
+        sent = json.loads(self.server.requests[-1][2])
+        assert (
+            sent["query"] == "query ($obj: FindEventReceiverInput!){event_receivers(event_receiver: $obj) { id,name }}"
+        )
+
+    def test_create_event_receiver(self):
+        result = self.run_client(lambda c: c.create_event_receiver(params={"name": "foo"}))
+        assert result["data"]["create_event_receiver"] == "01HPW652DSJBHR5K4KCZQ97GJP"
+
+    def test_concurrency_limit(self):
+        async def fan_out(client):
+            names = [f"foo-{i}" for i in range(20)]
+            return await asyncio.gather(*[client.search_event_receivers(params={"name": n}) for n in names])
+
+        results = self.run_client(fan_out, concurrency=4)
+        assert [r["data"]["event_receivers"][0]["name"] for r in results] == [f"foo-{i}" for i in range(20)]
+        assert self.max_in_flight <= 4
+        ports = {address for address, _, _ in self.server.requests}
+        assert len(ports) <= 4
+
+    def test_connection_reuse(self):
+        async def sequential(client):
+            for _ in range(5):
+                await client.search_event_receivers(params={"name": "foo"})
+
+        self.run_client(sequential)
+        ports = {address for address, _, _ in self.server.requests}
+        assert len(ports) == 1
+
+    def test_create_event_receivers_batched(self):
+        self.server._server.responder = lambda headers, body: {
+            "data": {"e" + k[1:]: "id-" + v["name"] for k, v in json.loads(body)["variables"].items()}
+        }
+        params = [{"name": str(i)} for i in range(30)]
+        results = self.run_client(lambda c: c.create_event_receivers(params, batch_size=8))
+        assert results == ["id-" + str(i) for i in range(30)]
+        assert len(self.server.requests) == 4
+
+    def test_create_event_receivers_lost_batch(self):
+        def respond(headers, body):
+            variables = json.loads(body)["variables"]
+            if any(v["name"] == "lost" for v in variables.values()):
+                return b"<html>"
+            return {"data": {"e" + k[1:]: "id-" + v["name"] for k, v in variables.items()}}
+
+        self.server._server.responder = respond
+        params = [{"name": str(i)} for i in range(6)] + [{"name": "lost"}]
+        results = self.run_client(lambda c: c.create_event_receivers(params, batch_size=2), concurrency=2)
+        assert results[:6] == ["id-" + str(i) for i in range(6)]
+        assert isinstance(results[6], errors.OutcomeUnknownError)
+
+    def test_compression(self):
+        self.server._server.compress_responses = True
+        params = {"name": "foo", "description": "x" * 2000}
+        result = self.run_client(lambda c: c.search_event_receivers(params=params), compress="gzip")
+        assert result["data"]["event_receivers"][0]["name"] == "foo"
+        _, headers, _ = self.server.requests[-1]
+        assert headers["Content-Encoding"] == "gzip"
+
+    def test_iter_event_receivers_pages(self):
+        def respond(headers, body):
+            params = json.loads(body)["variables"]["obj"]
+            end = min(params["offset"] + params["limit"], 5)
+            return {"data": {"event_receivers": [{"id": str(i)} for i in range(params["offset"], end)]}}
+
+        self.server._server.responder = respond
+
+        async def collect(client):
+            return [hit["id"] async for hit in client.iter_event_receivers(params={"name": "foo"}, page_size=2)]
+
+        assert self.run_client(collect) == ["0", "1", "2", "3", "4"]
+        assert len(self.server.requests) == 3
+
+    def test_iter_event_receivers_ignored_offset(self):
+        self.server._server.responder = lambda headers, body: {"data": {"event_receivers": [{"id": "0"}, {"id": "1"}]}}
+
+        async def collect(client):
+            return [hit["id"] async for hit in client.iter_event_receivers(page_size=2)]
+
+        assert self.run_client(collect) == ["0", "1"]
+        assert len(self.server.requests) == 2
+
+    def test_iter_event_receivers_paging_rejected(self):
+        def respond(headers, body):
+            if "limit" in (json.loads(body)["variables"]["obj"] or {}):
+                return {"errors": [{"message": 'unknown field "limit"'}]}
+            return {"data": {"event_receivers": [{"id": str(i)} for i in range(3)]}}
+
+        self.server._server.responder = respond
+
+        async def collect(client):
+            return [hit["id"] async for hit in client.iter_event_receivers(page_size=2)]
+
+        assert self.run_client(collect) == ["0", "1", "2"]
+        assert len(self.server.requests) == 2
+
+    def test_search_event_receivers_many(self):
+        def respond(headers, body):
+            variables = json.loads(body)["variables"]
+            return {"data": {"e" + k[1:]: [{"id": p["name"]}] for k, p in variables.items()}}
+
+        self.server._server.responder = respond
+        names = [f"foo-{i}" for i in range(5)]
+        results = self.run_client(lambda c: c.search_event_receivers_many([{"name": n} for n in names], batch_size=2))
+        assert results == [[{"id": n}] for n in names]
+        assert len(self.server.requests) == 3
+
+
+class AsyncConnectionPoolTestCase(base.BaseTestCase):
+    def test_request_not_resent_after_write(self):
+        received = []
+
+        async def handle(reader, writer):
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+                received.append(await reader.readexactly(length))
+                if len(received) > 1:
+                    # the second request reached the server, which drops the connection before answering
+                    break
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            url = "http://127.0.0.1:%d/" % server.sockets[0].getsockname()[1]
+            pool = AsyncConnectionPool()
+            try:
+                assert (await pool.request("POST", url, body=b"first"))[2] == b"{}"
+                with self.assertRaises(asyncio.IncompleteReadError):
+                    await pool.request("POST", url, body=b"second")
+            finally:
+                await pool.close()
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(run())
+        assert received == [b"first", b"second"]
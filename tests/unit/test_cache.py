@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+
+import mock
+
+from epr.cache import ResponseCache, SQLiteStore
+from epr.client import Client
+from tests import base
+
+
+class ResponseCacheTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+
+    def test_key_is_canonical(self):
+        first = ResponseCache.key("events", {"name": "foo", "version": "1.0.0"}, ["id"])
+        second = ResponseCache.key("events", {"version": "1.0.0", "name": "foo"}, ["id"])
+        assert first == second
+        assert first != ResponseCache.key("events", {"name": "foo", "version": "1.0.0"}, ["id", "name"])
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set("events", "a", {"data": "a"})
+        cache.set("events", "b", {"data": "b"})
+        assert cache.get("a") == {"data": "a"}
+        cache.set("events", "c", {"data": "c"})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"data": "a"}
+        assert cache.stats == {"hits": 2, "misses": 1, "evictions": 1, "size": 2}
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl=10)
+        with mock.patch("epr.cache.time.time", return_value=1000.0):
+            cache.set("events", "a", {"data": "a"})
+        with mock.patch("epr.cache.time.time", return_value=1005.0):
+            assert cache.get("a") == {"data": "a"}
+        with mock.patch("epr.cache.time.time", return_value=1011.0):
+            assert cache.get("a") is None
+
+    def test_returned_values_are_private(self):
+        cache = ResponseCache()
+        cache.set("events", "a", {"data": {"events": [1]}})
+        cache.get("a")["data"]["events"].append(2)
+        assert cache.get("a") == {"data": {"events": [1]}}
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        cache.set("events", "a", {"data": "a"})
+        cache.set("event_receivers", "b", {"data": "b"})
+        cache.invalidate("events")
+        assert cache.get("a") is None
+        assert cache.get("b") == {"data": "b"}
+
+    def test_persistent_tier(self):
+        path = os.path.join(self.test_dir, "cache", "responses.db")
+        first = ResponseCache(store=SQLiteStore(path))
+        first.set("events", "a", {"data": "a"})
+        first.close()
+        second = ResponseCache(store=SQLiteStore(path))
+        assert second.get("a") == {"data": "a"}
+        second.invalidate("events")
+        second.close()
+        assert ResponseCache(store=SQLiteStore(path)).get("a") is None
+
+
+class ClientCacheTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientCacheTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.cache = ResponseCache()
+        self.client = Client(self.server.url, cache=self.cache)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        if query["query"].startswith("mutation"):
+            return {"data": {"create_event_receiver": "01HPW652DSJBHR5K4KCZQ97GJP"}}
+        if query["variables"]["obj"].get("name") == "broken":
+            return {"errors": [{"message": "boom"}]}
+        return {"data": {"event_receivers": [{"id": str(len(self.server.requests))}]}}
+
+    def test_search_hits_cache(self):
+        first = self.client.search_event_receivers(params={"name": "foo"}, fields=["id"])
+        second = self.client.search_event_receivers(params={"name": "foo"}, fields=["id"])
+        assert first == second
+        assert len(self.server.requests) == 1
+        assert self.cache.stats["hits"] == 1
+
+    def test_errors_not_cached(self):
+        self.client.search_event_receivers(params={"name": "broken"})
+        self.client.search_event_receivers(params={"name": "broken"})
+        assert len(self.server.requests) == 2
+
+    def test_mutation_invalidates(self):
+        self.client.search_event_receivers(params={"name": "foo"})
+        self.client.create_event_receiver(params={"name": "foo"})
+        self.client.search_event_receivers(params={"name": "foo"})
+        assert len(self.server.requests) == 3
+
+    def test_shared_cache_dir_scoped_by_server(self):
+        cache_dir = os.path.join(self.test_dir, "cache")
+        servers = {}
+        for name in ("A", "B"):
+            servers[name] = base.StubServer(
+                lambda headers, body, name=name: {"data": {"event_receivers": [{"id": name}]}}
+            )
+            servers[name].start()
+            self.addCleanup(servers[name].stop)
+        results = {}
+        for name in ("A", "B"):
+            cache = ResponseCache.from_dir(cache_dir)
+            with Client(servers[name].url, cache=cache) as client:
+                results[name] = client.search_event_receivers(params={"name": "foo"}, fields=["id"])
+            cache.close()
+        assert results == {name: {"data": {"event_receivers": [{"id": name}]}} for name in ("A", "B")}
+        assert len(servers["B"].requests) == 1
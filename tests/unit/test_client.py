@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import mock
+
+from epr import common, errors
+from epr.client import Client
+from epr.models import Event, EventBatch
+from tests import base
+
+
+class ClientTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        if query["query"].startswith("mutation"):
+            return {"data": {"create_event": "01HPW652DSJBHR5K4KCZQ97GJP"}}
+        return {"data": {"events": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP", "name": "foo"}]}}
+
+    def test_search_events(self):
+        result = self.client.search_events(params={"name": "foo"}, fields=["id", "name"])
+        assert result["data"]["events"][-1]["name"] == "foo"
+        sent = json.loads(self.server.requests[-1][2])
+        assert sent["query"] == "query ($obj: FindEventInput!){events(event: $obj) { id,name }}"
+        assert sent["variables"] == {"obj": {"name": "foo"}}
+
+    def test_create_event(self):
+        result = self.client.create_event(params={"name": "foo"})
+        assert result["data"]["create_event"] == "01HPW652DSJBHR5K4KCZQ97GJP"
+
+    def test_connection_reuse(self):
+        for _ in range(5):
+            self.client.search_events(params={"name": "foo"})
+        ports = {address for address, _, _ in self.server.requests}
+        assert len(self.server.requests) == 5
+        assert len(ports) == 1
+
+    def test_pool_settings(self):
+        client = Client(self.server.url, maxsize=3, block=True)
+        self.addCleanup(client.close)
+        assert client.http.connection_pool_kw["maxsize"] == 3
+        assert client.http.connection_pool_kw["block"] is True
+
+    def test_context_manager(self):
+        with Client(self.server.url) as client:
+            client.search_events(params={"name": "foo"})
+            assert len(client.http.pools) == 1
+        assert len(client.http.pools) == 0
+
+
+class ClientBatchTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientBatchTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        data, errors = {}, []
+        for key, params in query["variables"].items():
+            alias = "e" + key[1:]
+            if params["name"] == "bad":
+                data[alias] = None
+                errors.append({"message": "invalid event", "path": [alias]})
+            else:
+                data[alias] = "id-" + params["name"]
+        return {"data": data, "errors": errors}
+
+    def test_batch_mutation_query(self):
+        query = self.client._new_graphql_batch_mutation_query("create_event", [{"name": "foo"}, {"name": "bar"}])
+        assert query.query == (
+            "mutation ($o0: CreateEventInput!, $o1: CreateEventInput!)"
+            "{e0: create_event(event: $o0) e1: create_event(event: $o1)}"
+        )
+        assert query.variables == {"o0": {"name": "foo"}, "o1": {"name": "bar"}}
+
+    def test_create_events_in_order(self):
+        params = [{"name": str(i)} for i in range(25)]
+        results = self.client.create_events(params, batch_size=10)
+        assert results == ["id-" + str(i) for i in range(25)]
+        assert len(self.server.requests) == 3
+
+    def test_create_events_max_batch_bytes(self):
+        params = [{"name": str(i) * 100} for i in range(6)]
+        results = self.client.create_event_receivers(params, batch_size=100, max_batch_bytes=250)
+        assert results == ["id-" + p["name"] for p in params]
+        assert len(self.server.requests) == 3
+
+    def test_create_events_partial_failure(self):
+        results = self.client.create_event_receiver_groups([{"name": "foo"}, {"name": "bad"}, {"name": "bar"}])
+        assert results[0] == "id-foo"
+        assert isinstance(results[1], errors.GraphQLError)
+        assert "invalid event" in str(results[1].message)
+        assert results[2] == "id-bar"
+
+    def test_batch_results_data_nulled(self):
+        response = {"data": None, "errors": [{"message": "invalid event", "path": ["e1", "id"]}]}
+        results = self.client._batch_results(response, 3)
+        assert type(results[1]) is errors.GraphQLError
+        assert "invalid event" in str(results[1].message)
+        assert isinstance(results[0], errors.OutcomeUnknownError)
+        assert isinstance(results[2], errors.OutcomeUnknownError)
+
+    def test_batch_results_request_error(self):
+        results = self.client._batch_results({"errors": [{"message": "syntax error"}]}, 2)
+        assert [type(r) for r in results] == [errors.GraphQLError, errors.GraphQLError]
+        assert all("syntax error" in str(r.message) for r in results)
+
+    def test_create_events_lost_batch(self):
+        respond = self.respond
+        self.server._server.responder = lambda headers, body: b"<html>" if b'"lost"' in body else respond(headers, body)
+        params = [{"name": "foo"}, {"name": "lost"}, {"name": "bar"}]
+        with mock.patch.object(self.client, "_cache_invalidate") as invalidate:
+            results = self.client.create_events(params, batch_size=1)
+        assert results[0] == "id-foo"
+        assert isinstance(results[1], errors.OutcomeUnknownError)
+        assert results[2] == "id-bar"
+        invalidate.assert_called_once_with("create_event")
+
+    def test_create_events_invalidates_on_error(self):
+        with mock.patch.object(self.client, "_cache_invalidate") as invalidate:
+            with mock.patch.object(self.client, "_batch_results", side_effect=RuntimeError("boom")):
+                self.assertRaises(RuntimeError, self.client.create_events, [{"name": "foo"}])
+        invalidate.assert_called_once_with("create_event")
+
+    def test_create_events_from_event_batch(self):
+        events = [Event(name=str(i), version="1.0.0", payload={"n": i}) for i in range(25)]
+        results = self.client.create_events(EventBatch(events), batch_size=10)
+        assert results == ["id-" + str(i) for i in range(25)]
+        assert len(self.server.requests) == 3
+        variables = json.loads(self.server.requests[0][2])["variables"]
+        assert variables["o3"] == json.loads(json.dumps(events[3].as_dict()))
+
+    def test_search_many(self):
+        self.server._server.responder = lambda headers, body: {
+            "data": {
+                "e" + key[1:]: [{"id": params["name"]}, {"id": "shared"}]
+                for key, params in json.loads(body)["variables"].items()
+            }
+        }
+        results = self.client.search_event_receivers_many([{"name": str(i)} for i in range(5)], ["id"], batch_size=2)
+        assert results == [[{"id": str(i)}, {"id": "shared"}] for i in range(5)]
+        assert len(self.server.requests) == 3
+        merged = common.merge_hits(results)
+        assert merged == [{"id": "0"}, {"id": "shared"}, {"id": "1"}, {"id": "2"}, {"id": "3"}, {"id": "4"}]
+
+    def test_encode_spliced_variables(self):
+        query = self.client._new_graphql_batch_mutation_query("create_event", [b'{"name":"foo"}', b'{"name":"bar"}'])
+        assert json.loads(self.client._encode(query)) == {
+            "query": query.query,
+            "variables": {"o0": {"name": "foo"}, "o1": {"name": "bar"}},
+        }
+        body = self.client._encode(self.client._persisted_request(query, full=False))
+        assert json.loads(body)["variables"] == {"o0": {"name": "foo"}, "o1": {"name": "bar"}}
+
+
+class ClientPersistedQueryTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientPersistedQueryTestCase, self).setUp()
+        self.known = set()
+        self.supported = True
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url, persisted_queries=True)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        request = json.loads(body)
+        digest = request.get("extensions", {}).get("persistedQuery", {}).get("sha256Hash")
+        if "query" not in request:
+            if not self.supported:
+                return {"data": None, "errors": [{"message": "PersistedQueryNotSupported"}]}
+            if digest not in self.known:
+                return {"errors": [{"message": "PersistedQueryNotFound"}]}
+        elif self.supported and digest:
+            assert digest == common.hash_string(request["query"])
+            self.known.add(digest)
+        if request["variables"]["obj"].get("name") == "bad":
+            return {"data": None, "errors": [{"message": "invalid input"}]}
+        return {"data": {"events": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP"}]}}
+
+    def sent(self):
+        return [json.loads(body) for _, _, body in self.server.requests]
+
+    def test_template_cache(self):
+        first = self.client._new_graphql_search_query("events", {"name": "foo"}, ["id", "name"])
+        second = self.client._new_graphql_search_query("events", {"name": "bar"}, ["id", "name"])
+        assert first.query is second.query
+        assert second.variables == {"obj": {"name": "bar"}}
+
+    def test_hash_only_after_first_use(self):
+        for _ in range(3):
+            result = self.client.search_events(params={"name": "foo"})
+            assert result["data"]["events"][0]["id"] == "01HPW652DSJBHR5K4KCZQ97GJP"
+        sent = self.sent()
+        assert len(sent) == 3
+        assert "query" in sent[0]
+        assert "query" not in sent[1] and "query" not in sent[2]
+
+    def test_fallback_when_hash_unknown(self):
+        self.client.search_events(params={"name": "foo"})
+        self.known.clear()
+        result = self.client.search_events(params={"name": "foo"})
+        assert result["data"]["events"]
+        sent = self.sent()
+        assert len(sent) == 3
+        assert "query" not in sent[1] and "query" in sent[2]
+        assert self.client.persisted_queries is True
+
+    def test_unsupported_server(self):
+        self.supported = False
+        for _ in range(3):
+            assert self.client.search_events(params={"name": "foo"})["data"]["events"]
+        assert self.client.persisted_queries is False
+        sent = self.sent()
+        assert "extensions" not in sent[-1]
+
+    def test_query_error_keeps_persisted_mode(self):
+        self.client.search_events(params={"name": "bad"})
+        result = self.client.search_events(params={"name": "bad"})
+        assert result["errors"] == [{"message": "invalid input"}]
+        sent = self.sent()
+        assert len(sent) == 2
+        assert "query" not in sent[1]
+        assert self.client.persisted_queries is True
+
+
+class ClientCompressionTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientCompressionTestCase, self).setUp()
+        self.server = base.StubServer(self.respond, compress_responses=True).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        return {"data": {"events": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP", "payload": json.loads(body)["variables"]}]}}
+
+    def test_compressed_request_and_response(self):
+        with Client(self.server.url, compress="gzip", compress_threshold=64) as client:
+            params = {"name": "foo", "payload": {"data": "x" * 1000}}
+            result = client.search_events(params=params, fields=["id", "payload"])
+        assert result["data"]["events"][0]["payload"] == {"obj": params}
+        _, headers, _ = self.server.requests[-1]
+        assert headers["Content-Encoding"] == "gzip"
+        assert "gzip" in headers["Accept-Encoding"]
+
+    def test_small_body_not_compressed(self):
+        with Client(self.server.url, compress="gzip", compress_threshold=4096) as client:
+            client.search_events(params={"name": "foo"})
+        _, headers, _ = self.server.requests[-1]
+        assert "Content-Encoding" not in headers
+
+    def test_invalid_compression(self):
+        self.assertRaises(ValueError, Client, self.server.url, compress="lzma")
+
+
+class ClientPagingTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientPagingTestCase, self).setUp()
+        self.total = 7
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        params = json.loads(body)["variables"]["obj"]
+        start = params.get("offset", 0)
+        end = min(start + params.get("limit", self.total), self.total)
+        return {"data": {"events": [{"id": str(i)} for i in range(start, end)]}}
+
+    def windows(self):
+        sent = [json.loads(body)["variables"]["obj"] for _, _, body in self.server.requests]
+        return sorted((p["offset"], p["limit"]) for p in sent)
+
+    def test_iter_events_pages(self):
+        hits = list(self.client.iter_events(params={"name": "foo"}, fields=["id"], page_size=3))
+        assert [h["id"] for h in hits] == [str(i) for i in range(7)]
+        assert self.windows() == [(0, 3), (3, 3), (6, 3)]
+
+    def test_iter_events_exact_pages(self):
+        hits = list(self.client.iter_events(params={"name": "foo"}, page_size=7))
+        assert len(hits) == 7
+        # a full last page needs one more, empty, page to know it is the last
+        assert self.windows() == [(0, 7), (7, 7)]
+
+    def test_iter_events_lazy(self):
+        hits = self.client.iter_events(params={"name": "foo"}, page_size=2)
+        assert len(self.server.requests) == 0
+        assert next(hits) == {"id": "0"}
+        hits.close()
+        # the first page and at most one prefetched page were requested
+        assert len(self.server.requests) <= 2
+
+    def test_iter_events_unpaginated_server(self):
+        self.server._server.responder = lambda headers, body: {"data": {"events": [{"id": str(i)} for i in range(5)]}}
+        hits = list(self.client.iter_events(page_size=2))
+        assert len(hits) == 5
+        assert len(self.server.requests) == 1
+
+    def test_iter_events_ignored_offset(self):
+        # a server that ignores limit and offset and happens to have exactly page_size records
+        self.server._server.responder = lambda headers, body: {"data": {"events": [{"id": "0"}, {"id": "1"}]}}
+        hits = list(self.client.iter_events(page_size=2))
+        assert [h["id"] for h in hits] == ["0", "1"]
+        assert len(self.server.requests) == 2
+
+    def test_iter_events_paging_rejected(self):
+        def respond(headers, body):
+            params = json.loads(body)["variables"]["obj"]
+            if "limit" in params or "offset" in params:
+                message = 'unknown field "limit" in FindEventInput'
+                return {"errors": [{"message": message, "extensions": {"code": "GRAPHQL_VALIDATION_FAILED"}}]}
+            return {"data": {"events": [{"id": str(i)} for i in range(5)]}}
+
+        self.server._server.responder = respond
+        hits = list(self.client.iter_events(params={"name": "foo"}, page_size=2))
+        assert len(hits) == 5
+        sent = [json.loads(body)["variables"]["obj"] for _, _, body in self.server.requests]
+        assert sent[-1] == {"name": "foo"}
+        assert len(sent) == 2
+
+    def test_iter_events_other_errors_not_paging(self):
+        for message in ("rate limit exceeded", "connection limit reached", 'invalid offset "x"'):
+            error = {"data": None, "errors": [{"message": message}]}
+            self.server._server.responder = lambda headers, body, error=error: error
+            with self.assertRaises(errors.GraphQLError):
+                list(self.client.iter_events(page_size=2))
+        # nothing was sent again without paging
+        assert all("limit" in json.loads(body)["variables"]["obj"] for _, _, body in self.server.requests)
+
+    def test_iter_events_errors(self):
+        self.server._server.responder = lambda headers, body: {"errors": [{"message": "boom"}]}
+        with self.assertRaises(errors.GraphQLError):
+            list(self.client.iter_events(page_size=2))
@@ -2,9 +2,16 @@
 # SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
 # SPDX-License-Identifier: Apache-2.0
 
+import dataclasses
+import hashlib
+import io
+import json
 import os
 
+import mock
+
 from epr import common
+from epr.models import Event
 from tests import base
 
 
@@ -22,8 +29,98 @@ class CommonTestCase(base.BaseTestCase):
             == "sha256:e51488766057cda286f75aad9108fccca523878b91d12e4a977d456b003c5679"
         )
 
+    def test_hash_file_mmap(self):
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        path = self.mkfile("big.bin", data)
+        expected = "sha256:" + hashlib.sha256(data).hexdigest()
+        with mock.patch.object(common, "MMAP_THRESHOLD", 1024), mock.patch.object(common, "HASH_BLOCKSIZE", 65536):
+            assert common.hash_file(path) == expected
+        assert common.hash_file(path) == expected
+        assert common.hash_file(self.mkfile("empty", b"")) == "sha256:" + hashlib.sha256(b"").hexdigest()
+
+    def test_hash_files(self):
+        self.mkdir("dist/sub")
+        for name in ("dist/b", "dist/a", "dist/sub/c", "top"):
+            self.mkfile(name, name)
+        paths = ["top", "dist", "missing"]
+        for workers in (1, 4):
+            results = list(common.hash_files(paths, workers=workers))
+            assert [path for path, _ in results] == ["top", "dist/a", "dist/b", "dist/sub/c", "missing"]
+            assert results[1][1] == "sha256:" + hashlib.sha256(b"dist/a").hexdigest()
+            assert isinstance(results[-1][1], OSError)
+
     def test_find_jsonpath(self):
         assert common.find_jsonpath({"hello": "world"}, "$.hello") == ["world"]
 
     def test_find_jsonpath_missing(self):
         assert common.find_jsonpath({"hello": "world"}, "$.missing") == []
+
+    def test_compile_jsonpath_cached(self):
+        common.compile_jsonpath.cache_clear()
+        with mock.patch("epr.common.parse", wraps=common.parse) as parse:
+            for _ in range(3):
+                assert common.find_jsonpath({"events": [{"id": 1}]}, "$.events[*].id") == [1]
+        assert parse.call_count == 1
+
+    def test_split_jsonpath(self):
+        key, rest = common.split_jsonpath("$.events[*].payload.name")
+        assert key == "events"
+        assert [m.value for m in rest.find({"payload": {"name": "foo"}})] == ["foo"]
+        assert common.split_jsonpath("events[*]")[0] == "events"
+        for expr in ("$..id", "$.events[0].id", "$.events", "$.*[*].id"):
+            assert common.split_jsonpath(expr) is None
+
+    def test_jsonpath_output(self):
+        results = {"events": [{"id": "a", "tags": [1, 2]}, {"id": "b", "tags": []}], "event_receivers": [{"id": "c"}]}
+        for expr in ("$.events[*].id", "$.events[*].tags[*]", "$.events[*]", "$..id", "$.events[1].id"):
+            out = io.StringIO()
+            output = common.JSONPathOutput(expr, out)
+            for key, records in results.items():
+                for record in records:
+                    output.record(key, record)
+            output.finish(results)
+            assert [json.loads(line) for line in out.getvalue().splitlines()] == common.find_jsonpath(results, expr)
+
+    def test_imap_ordered(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = common.imap_ordered(lambda x: x * 2, items(), workers=4)
+        assert next(results) == 0
+        assert len(consumed) <= 9
+        assert list(results) == [x * 2 for x in range(1, 100)]
+
+    def test_map_ordered(self):
+        assert common.map_ordered(lambda x: x * 2, range(10)) == [x * 2 for x in range(10)]
+        assert common.map_ordered(lambda x: x * 2, range(10), workers=4) == [x * 2 for x in range(10)]
+
+    def test_json_dumps_models(self):
+        event = Event(name="foo", payload={"nested": {"a": [1, 2]}}, success=True)
+        expected = dataclasses.asdict(event)
+        assert json.loads(common.json_dumps({"obj": event})) == {"obj": expected}
+        with mock.patch("epr.common.orjson", None):
+            encoded = common.json_dumps({"obj": event})
+            assert isinstance(encoded, bytes)
+            assert json.loads(encoded) == {"obj": expected}
+
+    def test_json_dumps_does_not_copy(self):
+        event = Event(name="foo", payload={"a": 1})
+        with mock.patch("epr.common.dataclasses.asdict") as asdict:
+            common.json_dumps(event)
+            with mock.patch("epr.common.orjson", None):
+                common.json_dumps(event)
+        asdict.assert_not_called()
+
+    def test_json_loads(self):
+        assert common.json_loads(b'{"data": {"events": []}}') == {"data": {"events": []}}
+        with mock.patch("epr.common.orjson", None):
+            assert common.json_loads(b'{"data": {"events": []}}') == {"data": {"events": []}}
+
+    def test_merge_hits(self):
+        results = [[{"id": "a"}, {"id": "b"}], [], [{"id": "b", "name": "dup"}, {"name": "no id"}, {"id": "c"}]]
+        assert common.merge_hits(results) == [{"id": "a"}, {"id": "b"}, {"name": "no id"}, {"id": "c"}]
+        self.assertRaises(ValueError, common.merge_hits, [[{"id": "a"}], ValueError("boom")])
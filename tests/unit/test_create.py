@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import time
+
+from epr.config import Config
+from epr.create import create
+from epr.models import Event, EventReceiver, EventReceiverGroup
+from tests import base
+
+
+class CreateTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(CreateTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        if operation == "create_event_receiver":
+            # slow receivers make an out of order run visible
+            time.sleep(0.02)
+        return {"data": {operation: operation + "-" + params["name"]}}
+
+    def config(self, workers):
+        cfg = Config(url=self.server.url, token=None, workers=workers)
+        cfg.event_receivers = [EventReceiver(name=f"r{i}") for i in range(4)]
+        cfg.event_receiver_groups = [EventReceiverGroup(name=f"g{i}") for i in range(4)]
+        cfg.events = [Event(name=f"e{i}") for i in range(8)]
+        return cfg
+
+    def test_create_sequential(self):
+        results = create(self.config(1))
+        assert results["event_receivers"] == [f"create_event_receiver-r{i}" for i in range(4)]
+        assert results["event_receiver_groups"] == [f"create_event_receiver_group-g{i}" for i in range(4)]
+        assert results["events"] == [f"create_event-e{i}" for i in range(8)]
+
+    def test_create_workers(self):
+        results = create(self.config(8))
+        assert results["event_receivers"] == [f"create_event_receiver-r{i}" for i in range(4)]
+        assert results["event_receiver_groups"] == [f"create_event_receiver_group-g{i}" for i in range(4)]
+        assert results["events"] == [f"create_event-e{i}" for i in range(8)]
+        operations = [json.loads(body)["query"] for _, _, body in self.server.requests]
+        receivers = [i for i, q in enumerate(operations) if "create_event_receiver(" in q]
+        others = [i for i, q in enumerate(operations) if "create_event_receiver(" not in q]
+        assert max(receivers) < min(others)
+
+
+class CreateIfAbsentTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(CreateIfAbsentTestCase, self).setUp()
+        # what the server holds, keyed by operation
+        self.stored = {"event_receivers": [], "event_receiver_groups": []}
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        if query["query"].startswith("query"):
+            data = {}
+            for key, params in query["variables"].items():
+                operation = query["query"].split(f"e{key[1:]}: ", 1)[1].split("(", 1)[0]
+                data["e" + key[1:]] = [r for r in self.stored[operation] if r["name"] == params["name"]]
+            return {"data": data}
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        record = dict(params, id=f"{operation}-{params['name']}-{len(self.server.requests)}")
+        if operation == "create_event_receiver":
+            self.stored["event_receivers"].append(record)
+        elif operation == "create_event_receiver_group":
+            self.stored["event_receiver_groups"].append(record)
+        return {"data": {operation: record["id"]}}
+
+    def config(self, cache_dir):
+        cfg = Config(url=self.server.url, token=None, cache_dir=cache_dir, if_absent=True)
+        receiver = dict(type="dev.events.foo", version="1.0.0", description="foo")
+        cfg.event_receivers = [EventReceiver(name=f"r{i % 3}", **receiver) for i in range(6)]
+        cfg.event_receiver_groups = [
+            EventReceiverGroup(name="g", enabled=True, event_receiver_ids=["r0"], **receiver),
+            EventReceiverGroup(name="incomplete"),
+        ]
+        return cfg
+
+    def mutations(self):
+        return [r for r in self.server.requests if json.loads(r[2])["query"].startswith("mutation")]
+
+    def test_identical_definitions_created_once(self):
+        results = create(self.config(self.mkdir("cache")))
+        assert len(set(results["event_receivers"])) == 3
+        assert results["event_receivers"][:3] == results["event_receivers"][3:]
+        # the group without a fingerprint is always sent
+        assert len(self.mutations()) == 5
+
+    def test_rerun_uses_the_index(self):
+        cache_dir = self.mkdir("cache")
+        first = create(self.config(cache_dir))
+        self.server.requests.clear()
+        second = create(self.config(cache_dir))
+        assert second["event_receivers"] == first["event_receivers"]
+        assert second["event_receiver_groups"][0] == first["event_receiver_groups"][0]
+        assert [json.loads(r[2])["variables"]["obj"]["name"] for r in self.server.requests] == ["incomplete"]
+
+    def test_misses_verified_with_one_search(self):
+        first = create(self.config(self.mkdir("first")))
+        self.server.requests.clear()
+        second = create(self.config(self.mkdir("second")))
+        assert second["event_receivers"] == first["event_receivers"]
+        queries = [json.loads(r[2])["query"] for r in self.server.requests]
+        searches = [q for q in queries if q.startswith("query")]
+        assert len(searches) == 2
+        assert searches[0].count("event_receivers(") == 3
+        assert len(self.mutations()) == 1
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+
+import mock
+
+from epr import fingerprint
+from epr.models import EventReceiver, EventReceiverGroup
+from tests import base
+
+
+def seed_fingerprint(data, keys):
+    """The original string-concatenation v1 fingerprint"""
+    seed = "v1"
+    for k in keys:
+        v = data.get(k)
+        if isinstance(v, (list, tuple)):
+            for x in v:
+                seed += " " + str(x)
+        elif isinstance(v, dict):
+            for x, y in v.items():
+                seed += " " + str(x) + " " + str(y)
+        else:
+            seed += " " + str(v)
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+
+class FingerprintTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(FingerprintTestCase, self).setUp()
+        self.receiver = dict(
+            name="foo-receiver", type="dev.events.foo", version="1.0.0", description="The Foo of Brixton ✓"
+        )
+        self.group = dict(
+            name="foo-group",
+            type="dev.events.foo",
+            version="1.0.0",
+            description="The Foo of Brixton",
+            enabled=True,
+            event_receiver_ids=["01HPW652DSJBHR5K4KCZQ97GJP", "01HPW652DSJBHR5K4KCZQ97GJQ"],
+        )
+
+    def test_receiver_v1(self):
+        expected = seed_fingerprint(self.receiver, ("type", "description", "name", "version"))
+        assert fingerprint.ReceiverFingerprint.new(self.receiver).fingerprint == expected
+        assert fingerprint.ReceiverFingerprint.new(EventReceiver(**self.receiver)).fingerprint == expected
+
+    def test_group_v1(self):
+        keys = ("type", "description", "name", "version", "enabled", "event_receiver_ids")
+        expected = seed_fingerprint(self.group, keys)
+        assert fingerprint.GroupFingerprint.new(self.group).fingerprint == expected
+        assert fingerprint.GroupFingerprint.new(EventReceiverGroup(**self.group)).fingerprint == expected
+
+    def test_generic_keys_sorted(self):
+        data = {"b": {"x": 1}, "a": ("y", "z")}
+        assert fingerprint.Fingerprint.new(data, ["b", "a"]).fingerprint == seed_fingerprint(data, ["a", "b"])
+
+    def test_missing_values(self):
+        receiver = dict(self.receiver, description="")
+        assert fingerprint.ReceiverFingerprint.new(receiver).fingerprint is None
+        del receiver["description"]
+        assert fingerprint.ReceiverFingerprint.new(receiver).fingerprint is None
+
+    def test_disabled_group(self):
+        group = dict(self.group, enabled=False)
+        keys = ("type", "description", "name", "version", "enabled", "event_receiver_ids")
+        assert fingerprint.GroupFingerprint.new(group).fingerprint == seed_fingerprint(group, keys)
+
+    def test_no_output(self):
+        with mock.patch("builtins.print") as mock_print:
+            fingerprint.ReceiverFingerprint.new(self.receiver)
+        mock_print.assert_not_called()
+
+    def test_fingerprint_many(self):
+        receivers = [dict(self.receiver, name=f"foo-{i}") for i in range(50)]
+        expected = [fingerprint.ReceiverFingerprint.new(r).fingerprint for r in receivers]
+        assert fingerprint.fingerprint_many(receivers) == expected
+        assert fingerprint.fingerprint_many(receivers, processes=2, threshold=10, chunksize=7) == expected
+        groups = [dict(self.group, name=f"foo-{i}") for i in range(5)]
+        assert fingerprint.fingerprint_many(groups, kind=fingerprint.GroupFingerprint) == [
+            fingerprint.GroupFingerprint.new(g).fingerprint for g in groups
+        ]
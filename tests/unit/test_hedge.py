@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from epr.client import Client
+from epr.hedge import HedgePolicy, Hedger, LatencyTracker
+from tests import base
+
+
+class HedgeTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(HedgeTestCase, self).setUp()
+        self.hedger = Hedger(HedgePolicy(initial_delay=0.05, min_samples=5))
+        self.addCleanup(self.hedger.close)
+
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100)
+        assert tracker.percentile(95) is None
+        for i in range(1, 101):
+            tracker.record(i / 1000.0)
+        assert tracker.percentile(50) == 0.05
+        assert tracker.percentile(95) == 0.095
+        assert tracker.percentile(100) == 0.1
+
+    def test_delay_follows_latency(self):
+        assert self.hedger.delay == 0.05
+        for _ in range(10):
+            self.hedger.latency.record(0.2)
+        assert self.hedger.delay == 0.2
+        self.hedger.latency.record(60.0)
+        assert self.hedger.delay == self.hedger.policy.max_delay
+
+    def test_fast_call_not_hedged(self):
+        assert self.hedger.call(lambda: "ok") == "ok"
+        assert self.hedger.stats["hedged"] == 0
+
+    def test_slow_call_hedged(self):
+        attempts = itertools.count()
+
+        def fn():
+            if next(attempts) == 0:
+                time.sleep(1.0)
+                return "slow"
+            return "fast"
+
+        start = time.monotonic()
+        assert self.hedger.call(fn) == "fast"
+        assert time.monotonic() - start < 0.5
+        assert self.hedger.stats["hedged"] == 1
+        assert self.hedger.stats["hedge_wins"] == 1
+
+    def test_queued_call_not_hedged(self):
+        hedger = Hedger(HedgePolicy(initial_delay=0.2, max_workers=1))
+        self.addCleanup(hedger.close)
+
+        def fn():
+            time.sleep(0.05)
+            return "ok"
+
+        # every call but the first waits in the queue for longer than the hedge delay
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            results = list(callers.map(lambda _: hedger.call(fn), range(8)))
+        assert results == ["ok"] * 8
+        assert hedger.stats["calls"] == 8
+        assert hedger.stats["hedged"] == 0
+
+    def test_failed_attempt_waits_for_other(self):
+        attempts = itertools.count()
+
+        def fn():
+            if next(attempts) == 0:
+                time.sleep(0.1)
+                raise ConnectionError("boom")
+            time.sleep(0.2)
+            return "ok"
+
+        assert self.hedger.call(fn) == "ok"
+
+    def test_all_attempts_fail(self):
+        def fn():
+            time.sleep(0.1)
+            raise ConnectionError("boom")
+
+        self.assertRaises(ConnectionError, self.hedger.call, fn)
+
+
+class ClientHedgeTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientHedgeTestCase, self).setUp()
+        self.counter = itertools.count()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url, hedge=HedgePolicy(initial_delay=0.05))
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        if next(self.counter) == 0:
+            time.sleep(0.5)
+        if json.loads(body)["query"].startswith("mutation"):
+            return {"data": {"create_event": "01HPW652DSJBHR5K4KCZQ97GJP"}}
+        return {"data": {"events": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP"}]}}
+
+    def test_search_hedged(self):
+        result = self.client.search_events(params={"name": "foo"})
+        assert result["data"]["events"][0]["id"] == "01HPW652DSJBHR5K4KCZQ97GJP"
+        assert self.client.hedger.stats["hedged"] == 1
+
+    def test_mutation_never_hedged(self):
+        self.client.create_event(params={"name": "foo"})
+        assert len(self.server.requests) == 1
+        assert self.client.hedger.stats["calls"] == 0
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+from epr.index import FingerprintIndex
+from tests import base
+
+
+class FingerprintIndexTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(FingerprintIndexTestCase, self).setUp()
+        self.index = FingerprintIndex.from_dir(os.path.join(self.test_dir, "cache"))
+        self.addCleanup(self.index.close)
+
+    def test_get_many(self):
+        items = [(f"fp{i}", f"id{i}") for i in range(2000)]
+        self.index.set_many("http://a", "event_receivers", items)
+        found = self.index.get_many("http://a", "event_receivers", [f"fp{i}" for i in range(0, 2500, 2)])
+        assert found == {f"fp{i}": f"id{i}" for i in range(0, 2000, 2)}
+
+    def test_scoped_by_url_and_kind(self):
+        self.index.set_many("http://a", "event_receivers", [("fp", "id-a")])
+        assert self.index.get("http://a", "event_receivers", "fp") == "id-a"
+        assert self.index.get("http://b", "event_receivers", "fp") is None
+        assert self.index.get("http://a", "event_receiver_groups", "fp") is None
+
+    def test_persistent(self):
+        self.index.set_many("http://a", "event_receivers", [("fp", "id-a")])
+        other = FingerprintIndex(self.index.path)
+        self.addCleanup(other.close)
+        assert other.get("http://a", "event_receivers", "fp") == "id-a"
+        other.clear()
+        assert self.index.get("http://a", "event_receivers", "fp") is None
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import json
+import os
+
+from epr import ingest
+from epr.cache import ResponseCache
+from epr.config import Config
+from epr.models import Event
+from tests import base
+
+
+class IngestTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(IngestTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        variables = json.loads(body)["variables"]
+        return {"data": {"e" + k[1:]: "id-" + v["name"] for k, v in variables.items()}}
+
+    def test_parse_records(self):
+        lines = ['{"name": "foo"}\n', "\n", "not json\n", '{"name": "bar"}\n']
+        records = list(ingest.parse_records(lines))
+        assert records[0] == (1, {"name": "foo"})
+        assert records[1][0] == 3 and isinstance(records[1][1], ValueError)
+        assert records[2] == (4, {"name": "bar"})
+
+    def test_to_models(self):
+        models = list(ingest.to_models([(1, {"name": "foo"}), (2, {"bogus": "x"})]))
+        assert models[0] == (1, Event(name="foo"))
+        assert isinstance(models[1][1], TypeError)
+
+    def test_pipeline_is_lazy(self):
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield json.dumps({"name": str(i)})
+
+        stream = ingest.to_models(ingest.parse_records(lines()))
+        batches = ingest.iter_batches(stream, 10)
+        assert len(next(batches)) == 10
+        assert len(consumed) == 10
+
+    def test_create_from_file(self):
+        records = [json.dumps({"name": str(i), "payload": {"n": i}}) for i in range(25)]
+        records.insert(3, "{broken")
+        path = self.mkfile("events.ndjson", "\n".join(records) + "\n")
+        for workers in (1, 3):
+            out = io.StringIO()
+            cfg = Config(url=self.server.url, token=None, workers=workers)
+            summary = ingest.create_from_file(cfg, path, batch_size=10, out=out)
+            assert summary == {"created": 25, "failed": 1}
+            results = [json.loads(line) for line in out.getvalue().splitlines()]
+            assert [r["line"] for r in results] == list(range(1, 27))
+            assert "error" in results[3]
+            assert [r["id"] for r in results if "id" in r] == ["id-" + str(i) for i in range(25)]
+
+    def test_create_from_file_invalidates_cache(self):
+        cache_dir = os.path.join(self.test_dir, "cache")
+        cache = ResponseCache.from_dir(cache_dir)
+        key = cache.key("events", {"name": "0"}, ["id"], "http://example")
+        cache.set("events", key, {"data": {"events": []}})
+        cache.close()
+        path = self.mkfile("events.ndjson", json.dumps({"name": "0"}) + "\n")
+        cfg = Config(url=self.server.url, token=None, cache_dir=cache_dir)
+        ingest.create_from_file(cfg, path, out=io.StringIO())
+        cache = ResponseCache.from_dir(cache_dir)
+        self.addCleanup(cache.close)
+        assert cache.get(key) is None
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+
+import mock
+
+from epr.main import CmdLine
+from tests import base
+
+_EVENT_ARGS = (
+    "--name foo --version 1.0.0 --release 2024.01 --platform-id x86-64-gnu-linux-9 --package rpm "
+    "--description foo --event-receiver-id 01HPW652DSJBHR5K4KCZQ97GJP"
+).split()
+
+
+class CmdLineTestCase(base.BaseTestCase):
+    def run_cmdline(self, *args):
+        with mock.patch("sys.argv", ["eprcli", *args]):
+            with mock.patch("epr.main.create.create") as create:
+                CmdLine()
+        return create.call_args[0][0]
+
+    def test_create_event_payload(self):
+        cfg = self.run_cmdline("create", "event", *_EVENT_ARGS, "--payload", '{"name": "foo"}')
+        assert cfg.events[0].payload == '{"name": "foo"}'
+
+    def test_create_event_artifacts(self):
+        path = self.mkfile("foo.bin", b"foo")
+        cfg = self.run_cmdline("create", "event", *_EVENT_ARGS, "--payload", '{"name": "foo"}', "--artifacts", path)
+        payload = cfg.events[0].payload
+        # sent as a JSON string, the same type as --payload on its own
+        assert isinstance(payload, str)
+        digest = "sha256:" + hashlib.sha256(b"foo").hexdigest()
+        assert json.loads(payload) == {"name": "foo", "artifacts": [{"path": path, "digest": digest}]}
+
+    def test_create_event_artifacts_without_payload(self):
+        path = self.mkfile("foo.bin", b"foo")
+        cfg = self.run_cmdline("create", "event", *_EVENT_ARGS, "--artifacts", path)
+        assert [a["path"] for a in json.loads(cfg.events[0].payload)["artifacts"]] == [path]
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import dataclasses
+import json
+import pickle
+import sys
+import unittest
+
+import mock
+
+from epr import models
+from epr.fingerprint import GroupFingerprint, ReceiverFingerprint, fingerprint_of
+from epr.models import Data, Event, EventBatch, EventReceiver, EventReceiverGroup, Message
+from tests import base
+
+
+class ModelsTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ModelsTestCase, self).setUp()
+        self.event = Event(
+            id="01HPW652DSJBHR5K4KCZQ97GJP",
+            name="foo",
+            version="1.0.0",
+            payload={"name": "foo"},
+            success=True,
+            created_at="2024-01-01T00:00:00Z",
+        )
+
+    @unittest.skipIf(sys.version_info < (3, 10), "slotted dataclasses need python 3.10")
+    def test_slotted(self):
+        for model in (self.event, EventReceiver(), EventReceiverGroup()):
+            assert not hasattr(model, "__dict__")
+        with self.assertRaises(AttributeError):
+            self.event.bogus = "x"
+
+    def test_equality_ignores_id_and_created_at(self):
+        other = Event(name="foo", version="1.0.0", payload={"name": "foo"}, success=True)
+        assert self.event == other
+        other.version = "1.0.1"
+        assert self.event != other
+
+    def test_as_dict(self):
+        data = self.event.as_dict()
+        assert data["id"] == "01HPW652DSJBHR5K4KCZQ97GJP"
+        assert data["payload"] == {"name": "foo"}
+        assert data["event_receiver"] == {}
+        assert self.event.as_dict_query() == {
+            "id": "01HPW652DSJBHR5K4KCZQ97GJP",
+            "name": "foo",
+            "version": "1.0.0",
+            "payload": {"name": "foo"},
+            "success": True,
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+
+    def test_pickle(self):
+        assert pickle.loads(pickle.dumps(self.event)).as_dict() == self.event.as_dict()
+
+    def test_fingerprint_is_cached(self):
+        receiver = EventReceiver(name="foo", type="dev.events.foo", version="1.0.0", description="foo")
+        expected = ReceiverFingerprint.new(receiver.as_dict()).fingerprint
+        with mock.patch("epr.models.fingerprint_of", wraps=fingerprint_of) as calc:
+            assert receiver.compute_fingerprint() == expected
+            assert receiver.compute_fingerprint() == expected
+            receiver.id = "01HPW652DSJBHR5K4KCZQ97GJP"
+            receiver.schema = {"name": "string"}
+            assert receiver.compute_fingerprint() == expected
+        assert calc.call_count == 1
+
+    def test_fingerprint_cache_check(self):
+        receiver = EventReceiver(name="foo", type="dev.events.foo", version="1.0.0", description="foo")
+        group = EventReceiverGroup(name="foo", type="dev.events.foo", version="1.0.0", description="foo")
+        group.event_receiver_ids = ["a", "b"]
+        receiver.compute_fingerprint()
+        group.compute_fingerprint()
+        with mock.patch("epr.models._snapshot", wraps=models._snapshot) as snapshot:
+            receiver.compute_fingerprint()
+            assert snapshot.call_count == 0
+            # only the receiver ids of a group can change without an assignment
+            group.compute_fingerprint()
+            assert [c.args[0] for c in snapshot.call_args_list] == [["a", "b"]]
+
+    def test_fingerprinted_model_init(self):
+        receiver = EventReceiver("01HPW652DSJBHR5K4KCZQ97GJP", "foo", type="dev.events.foo")
+        assert receiver.as_dict() == dataclasses.asdict(receiver)
+        assert (receiver.id, receiver.name, receiver.type, receiver.version) == (
+            "01HPW652DSJBHR5K4KCZQ97GJP",
+            "foo",
+            "dev.events.foo",
+            "",
+        )
+        assert EventReceiverGroup().event_receiver_ids is not EventReceiverGroup().event_receiver_ids
+        self.assertRaises(TypeError, EventReceiver, nmae="foo")
+
+    def test_fingerprint_cache_never_stale(self):
+        group = EventReceiverGroup(
+            name="foo",
+            type="dev.events.foo",
+            version="1.0.0",
+            description="foo",
+            enabled=True,
+            event_receiver_ids=["a", "b"],
+        )
+
+        def check():
+            assert group.compute_fingerprint() == GroupFingerprint.new(group.as_dict()).fingerprint
+
+        check()
+        group.name = "bar"
+        check()
+        group.event_receiver_ids.append("c")
+        check()
+        group.event_receiver_ids[0] = "z"
+        check()
+        group.event_receiver_ids.reverse()
+        check()
+        group.event_receiver_ids = ["z", "b", "c"]
+        check()
+        group.event_receiver_ids = [1, 2]
+        check()
+        group.event_receiver_ids = [True, 2.0]
+        check()
+        group.event_receiver_ids = [["a"], "b"]
+        check()
+        group.event_receiver_ids[0].append("x")
+        check()
+        group.enabled = 1
+        check()
+        group.enabled = False
+        check()
+        group.description = ""
+        assert group.compute_fingerprint() is None
+        group.description = "foo"
+        check()
+
+    def test_fingerprint_cache_pickle_and_copy(self):
+        receiver = EventReceiver(name="foo", type="dev.events.foo", version="1.0.0", description="foo")
+        fingerprint = receiver.compute_fingerprint()
+        assert receiver.__getstate__() == receiver.as_dict()
+        assert b"_fingerprint_cache" not in pickle.dumps(receiver)
+        clone = pickle.loads(pickle.dumps(receiver))
+        assert clone == receiver
+        assert getattr(clone, "_fingerprint_cache", None) is None
+        assert clone.compute_fingerprint() == fingerprint
+        other = copy.copy(receiver)
+        other.version = "2.0.0"
+        assert other.compute_fingerprint() != fingerprint
+        assert receiver.compute_fingerprint() == fingerprint
+        assert "_fingerprint_cache" not in receiver.as_dict()
+
+    def test_as_dict_matches_asdict(self):
+        models = [
+            self.event,
+            Event(),
+            EventReceiver(name="foo", schema={"type": "object"}),
+            EventReceiverGroup(name="foo", enabled=True, event_receiver_ids=["a"]),
+        ]
+        for model in models:
+            assert model.as_dict() == dataclasses.asdict(model)
+            assert model.as_dict(deep=True) == dataclasses.asdict(model)
+            assert model.as_dict_query() == {k: v for k, v in dataclasses.asdict(model).items() if v}
+            assert model.as_dict_query(deep=True) == model.as_dict_query()
+
+    def test_as_dict_copies_only_when_deep(self):
+        assert self.event.as_dict()["payload"] is self.event.payload
+        assert self.event.as_dict_query()["payload"] is self.event.payload
+        assert self.event.as_dict(deep=True)["payload"] is not self.event.payload
+        assert self.event.as_dict_query(deep=True)["payload"] is not self.event.payload
+
+    def test_as_dict_nested_model(self):
+        message = Message(True, "1", "1.0", "foo", "bar", "v1", "foo", "1.0.0", "1", "x86_64", "rpm", Data())
+        assert message.as_dict() == dataclasses.asdict(message)
+        assert message.as_dict()["data"] == {}
+        assert "data" not in message.as_dict_query()
+
+
+class EventBatchTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(EventBatchTestCase, self).setUp()
+        self.events = [
+            Event(
+                name="foo",
+                version="1.0.0",
+                release="2024.01.01",
+                platform_id="x86_64-gnu-linux-9",
+                package="rpm",
+                description=f"build {i}",
+                payload={"build": i},
+                success=i % 2 == 0,
+                event_receiver_id="01HPW652DSJBHR5K4KCZQ97GJP",
+            )
+            for i in range(10)
+        ]
+        self.batch = EventBatch.from_events(self.events)
+
+    def test_round_trip(self):
+        assert len(self.batch) == 10
+        assert self.batch.to_events() == self.events
+        assert self.batch[-1] == self.events[-1]
+        assert self.batch.column("success") == [e.success for e in self.events]
+        with self.assertRaises(IndexError):
+            self.batch[10]
+
+    def test_interned_columns(self):
+        assert self.batch.distinct("name") == ("foo",)
+        assert self.batch.distinct("event_receiver_id") == ("01HPW652DSJBHR5K4KCZQ97GJP",)
+        assert len(self.batch.distinct("description")) == 10
+        assert self.batch.column("name") == ["foo"] * 10
+
+    def test_validate(self):
+        assert self.batch.validate() == []
+        self.batch.append(Event(name="foo", version="1.0.0", event_receiver_id="not-a-ulid"))
+        errors = self.batch.validate()
+        assert {row for row, _ in errors} == {10}
+        assert (10, "missing release") in errors
+        assert (10, "missing payload") in errors
+        assert (10, "event_receiver_id is not a ULID") in errors
+
+    def test_encoded_rows(self):
+        self.batch.append(Event(name="é", payload={"nested": [1, None]}))
+        events = self.batch.to_events()
+        for row, event in zip(self.batch.encoded_rows(), events):
+            assert json.loads(row) == json.loads(json.dumps(event.as_dict()))
+        assert json.loads(list(self.batch.encoded_rows())[-1])["name"] == "é"
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+from epr import projection
+from epr.errors import InvalidKeyError
+from tests import base
+
+
+class ProjectionTestCase(base.BaseTestCase):
+    def test_model_fields(self):
+        assert projection.model_fields("event_receivers") == (
+            "id",
+            "name",
+            "type",
+            "version",
+            "description",
+            "schema",
+            "fingerprint",
+            "created_at",
+        )
+
+    def test_jsonpath_fields(self):
+        assert projection.jsonpath_fields("$.events[*].id", "events") == ["id"]
+        assert projection.jsonpath_fields("$.events[*].payload.build", "events") == ["payload"]
+        assert projection.jsonpath_fields('$.events[*]["id","name"]', "events") == ["id", "name"]
+        assert projection.jsonpath_fields("$.events[*].id", "event_receivers") == ["id"]
+
+    def test_jsonpath_fields_whole_records(self):
+        assert projection.jsonpath_fields("$.events[*]", "events") is None
+        assert projection.jsonpath_fields("$.events[*].*", "events") is None
+        assert projection.jsonpath_fields("$..id", "events") is None
+        assert projection.jsonpath_fields("$.events[0].id", "events") is None
+
+    def test_jsonpath_fields_unknown(self):
+        with self.assertRaises(InvalidKeyError) as ctx:
+            projection.jsonpath_fields("$.events[*].nmae", "events")
+        assert "Event has no field nmae" in str(ctx.exception)
+
+    def test_template_fields(self):
+        template = "{id} {name!r:>10} {payload[build]} {{literal}}"
+        assert projection.template_fields(template, "events") == ["id", "name", "payload"]
+        self.assertRaises(InvalidKeyError, projection.template_fields, "{0}", "events")
+        self.assertRaises(InvalidKeyError, projection.template_fields, "{}", "events")
+        self.assertRaises(InvalidKeyError, projection.template_fields, "{enabled}", "events")
+
+    def test_nested_fields_not_planned(self):
+        # event_receiver is an object, selecting it without a sub-selection is invalid GraphQL
+        assert projection.jsonpath_fields("$.events[*].event_receiver.name", "events") is None
+        assert projection.template_fields("{id} {event_receiver[name]}", "events") is None
+        assert projection.plan("events", template="{event_receiver.name}") is None
+
+    def test_plan(self):
+        assert projection.plan("events", ["id", "foo"], jsonpath="$.events[*].name") == ["id", "foo"]
+        assert projection.plan("events", [], template="{name}", jsonpath="$.events[*].id") == ["name"]
+        assert projection.plan("events", None, jsonpath="$.events[*].id") == ["id"]
+        assert projection.plan("events") is None
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import json
+import os
+
+import mock
+
+from epr.client import Client
+from epr.config import Config
+from epr.models import EventReceiver
+from epr.replica import Replica, sync, sync_fields
+from epr.search import search
+from tests import base
+
+
+def receiver(i, created_at="2024-01-01T00:00:00Z"):
+    return {
+        "id": f"id{i}",
+        "name": f"r{i % 3}",
+        "type": "dev.events.foo",
+        "version": f"1.0.{i}",
+        "description": "foo",
+        "schema": {"type": "object"},
+        "fingerprint": f"fp{i}",
+        "created_at": created_at,
+    }
+
+
+class ReplicaTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ReplicaTestCase, self).setUp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.replica = Replica.from_dir(self.cache_dir)
+        self.addCleanup(self.replica.close)
+        self.receivers = [receiver(i) for i in range(5)]
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        records = self.receivers if operation == "event_receivers" else []
+        if "offset" in params:
+            records = records[params["offset"] : params["offset"] + params["limit"]]
+        return {"data": {operation: records}}
+
+    def test_search_before_sync(self):
+        assert self.replica.search(self.client.url, "event_receivers", {"name": "r0"}) is None
+
+    def test_sync_and_search(self):
+        written = sync(self.client, self.replica, page_size=2)
+        assert written == {"event_receivers": 5, "event_receiver_groups": 0}
+        sent = json.loads(self.server.requests[0][2])
+        assert "fingerprint,created_at" in sent["query"]
+        url = self.client.url
+        assert [r["id"] for r in self.replica.search(url, "event_receivers", {"name": "r0"})] == ["id0", "id3"]
+        assert self.replica.search(url, "event_receivers", {"name": "r0", "version": "1.0.3"}) == [self.receivers[3]]
+        assert self.replica.search(url, "event_receivers", {"schema": {"type": "object"}}) == self.receivers
+        assert self.replica.search(url, "event_receivers", {"fingerprint": "nope"}) == []
+        assert self.replica.search(url, "event_receiver_groups") == []
+        assert self.replica.search(url, "events") is None
+        # parameters that are not model fields, such as paging, go to the server
+        assert self.replica.search(url, "event_receivers", {"name": "r0", "limit": 2}) is None
+
+    def test_incremental_sync(self):
+        sync(self.client, self.replica, kinds=["event_receivers"])
+        assert self.replica.watermark(self.client.url, "event_receivers") == "2024-01-01T00:00:00Z"
+        self.receivers.append(receiver(5, created_at="2024-02-01T00:00:00Z"))
+        self.receivers[0] = dict(self.receivers[0], description="changed")
+        written = sync(self.client, self.replica, kinds=["event_receivers"])
+        # only records at or after the watermark are written, the unchanged timestamp of id0 hides its edit
+        assert written == {"event_receivers": 6}
+        assert self.replica.watermark(self.client.url, "event_receivers") == "2024-02-01T00:00:00Z"
+        written = sync(self.client, self.replica, kinds=["event_receivers"])
+        assert written == {"event_receivers": 1}
+        assert self.replica.count(self.client.url, "event_receivers") == 6
+
+    def test_client_answers_from_replica(self):
+        sync(self.client, self.replica, kinds=["event_receivers"])
+        requests = len(self.server.requests)
+        with Client(self.server.url, replica=self.replica) as client:
+            result = client.search_event_receivers(params={"name": "r1"}, fields=["id", "version"])
+            assert result == {
+                "data": {"event_receivers": [{"id": "id1", "version": "1.0.1"}, {"id": "id4", "version": "1.0.4"}]}
+            }
+            assert client.search_event_receivers(params={"id": "id2"}) == {"data": {"event_receivers": [{"id": "id2"}]}}
+            assert len(self.server.requests) == requests
+            # kinds that were never synced are still searched on the server
+            client.search_events(params={"name": "foo"})
+            assert len(self.server.requests) == requests + 1
+
+    def test_search_local(self):
+        sync(self.client, self.replica, kinds=["event_receivers"])
+        requests = len(self.server.requests)
+        cfg = Config(url=self.server.url, token=None, cache_dir=self.cache_dir, local=True)
+        cfg.event_receivers = [EventReceiver(name="r2")]
+        cfg.event_receiver_fields = ["id", "name"]
+        with mock.patch("sys.stdout", new_callable=io.StringIO):
+            results = search(cfg)
+        assert results["event_receivers"] == [{"id": "id2", "name": "r2"}]
+        assert len(self.server.requests) == requests
+
+    def test_sync_fields(self):
+        assert "event_receiver" not in sync_fields("events")
+        assert "event_receiver_id" in sync_fields("events")
+        assert sync_fields("event_receiver_groups")[-3:] == ["created_at", "updated_at", "fingerprint"]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import mock
+
+from epr import errors
+from epr.client import Client
+from epr.models import Event, EventReceiver
+from epr.results import ModelView, ResultSet
+from tests import base
+
+
+class ResultsTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ResultsTestCase, self).setUp()
+        self.response = {
+            "data": {
+                "events": [
+                    {"id": "01HPW652DSJBHR5K4KCZQ97GJP", "name": "foo", "payload": {"name": "foo"}, "extra": 1},
+                    {"id": "01HPW652DSJBHR5K4KCZQ97GJQ", "name": "bar", "success": True},
+                ]
+            }
+        }
+
+    def test_views(self):
+        results = ResultSet.from_response(self.response, "events")
+        assert len(results) == 2
+        view = results[0]
+        assert isinstance(view, ModelView)
+        assert view.name == "foo"
+        assert view["payload"] is self.response["data"]["events"][0]["payload"]
+        assert view.version == ""
+        assert view.event_receiver == {}
+        assert "version" not in view
+        self.assertRaises(AttributeError, getattr, view, "extra")
+        with self.assertRaises(AttributeError):
+            view.name = "bar"
+        assert [v.name for v in results] == ["foo", "bar"]
+        assert results[1:][0] == results[1]
+
+    def test_to_model(self):
+        results = ResultSet.from_response(self.response, "events")
+        assert results[0].to_model() == Event(name="foo", payload={"name": "foo"})
+        assert results[0].to_model().id == "01HPW652DSJBHR5K4KCZQ97GJP"
+        assert [e.success for e in results.to_models()] == [False, True]
+
+    def test_fields_read_on_access(self):
+        record = mock.MagicMock()
+        view = ModelView(record, EventReceiver)
+        record.__contains__.return_value = True
+        assert view.name is record.__getitem__.return_value
+        record.__getitem__.assert_called_once_with("name")
+
+    def test_errors(self):
+        with self.assertRaises(errors.GraphQLError):
+            ResultSet.from_response({"data": None, "errors": [{"message": "bad input"}]}, "events")
+        assert len(ResultSet.from_response({"data": {"events": []}}, "events")) == 0
+
+
+class ClientFindTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientFindTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        assert "event_receivers(" in query["query"]
+        return {"data": {"event_receivers": [{"id": "01HPW652DSJBHR5K4KCZQ97GJP", "name": "foo", "type": "x"}]}}
+
+    def test_find_event_receivers(self):
+        results = self.client.find_event_receivers(params={"name": "foo"}, fields=["id", "name", "type"])
+        assert results.model is EventReceiver
+        assert results[0].type == "x"
+        assert results[0].to_model() == EventReceiver(name="foo", type="x")
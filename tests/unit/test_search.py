@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import json
+
+import mock
+
+from epr import errors
+from epr.config import Config
+from epr.models import Event, EventReceiver, EventReceiverGroup
+from epr.search import search
+from tests import base
+
+
+class SearchTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(SearchTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        return {"data": {operation: [{"id": "old"}, {"id": params["name"]}]}}
+
+    def test_search_workers(self):
+        cfg = Config(url=self.server.url, token=None, workers=4)
+        cfg.events = [Event(name=f"e{i}") for i in range(6)]
+        cfg.event_receivers = [EventReceiver(name=f"r{i}") for i in range(3)]
+        cfg.event_receiver_groups = [EventReceiverGroup(name=f"g{i}") for i in range(2)]
+        cfg.event_fields = cfg.event_receiver_fields = cfg.event_receiver_group_fields = ["id"]
+        results = search(cfg)
+        assert results["events"] == [{"id": f"e{i}"} for i in range(6)]
+        assert results["event_receivers"] == [{"id": f"r{i}"} for i in range(3)]
+        assert results["event_receiver_groups"] == [{"id": f"g{i}"} for i in range(2)]
+        assert len(self.server.requests) == 11
+
+    def test_search_jsonpath_streams(self):
+        cfg = Config(url=self.server.url, token=None, jsonpath="$.events[*].id")
+        cfg.events = [Event(name=f"e{i}") for i in range(3)]
+        cfg.event_receivers = [EventReceiver(name="r0")]
+        cfg.event_fields = cfg.event_receiver_fields = ["id"]
+        printed = []
+
+        def record(output, key, record):
+            # each match is printed before the next search is sent
+            printed.append((len(self.server.requests), key))
+
+        with mock.patch("epr.common.JSONPathOutput.record", autospec=True, side_effect=record):
+            search(cfg)
+        assert printed == [(1, "events"), (2, "events"), (3, "events"), (4, "event_receivers")]
+
+    def test_search_jsonpath_output(self):
+        cfg = Config(url=self.server.url, token=None, jsonpath="$.events[*].id")
+        cfg.events = [Event(name=f"e{i}") for i in range(3)]
+        cfg.event_receivers = [EventReceiver(name="r0")]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == ['"e0"', '"e1"', '"e2"']
+        cfg.jsonpath = "$..id"
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == ['"e0"', '"e1"', '"e2"', '"r0"']
+
+
+class SearchAllTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(SearchAllTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        end = min(params["offset"] + params["limit"], 5)
+        return {"data": {operation: [{"id": f"{params['name']}-{i}"} for i in range(params["offset"], end)]}}
+
+    def test_search_all_streams_every_hit(self):
+        cfg = Config(url=self.server.url, token=None, search_all=True, page_size=2)
+        cfg.events = [Event(name="e")]
+        cfg.event_receivers = [EventReceiver(name="r")]
+        cfg.event_fields = cfg.event_receiver_fields = ["id"]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            counts = search(cfg)
+        assert counts == {"events": 5, "event_receivers": 5, "event_receiver_groups": 0}
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert lines == [{"id": f"e-{i}"} for i in range(5)] + [{"id": f"r-{i}"} for i in range(5)]
+        assert len(self.server.requests) == 6
+
+    def test_search_all_jsonpath(self):
+        cfg = Config(url=self.server.url, token=None, search_all=True, page_size=3, jsonpath="$.events[*].id")
+        cfg.events = [Event(name="e")]
+        cfg.event_fields = ["id"]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == [f'"e-{i}"' for i in range(5)]
+        cfg.jsonpath = "$..id"
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == [f'"e-{i}"' for i in range(5)]
+
+
+class SearchBulkTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(SearchBulkTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        data = {}
+        for key, params in query["variables"].items():
+            data["e" + key[1:]] = [{"id": "shared"}, {"id": params["name"]}]
+        return {"data": data}
+
+    def test_search_bulk(self):
+        cfg = Config(url=self.server.url, token=None, bulk=True, batch_size=4)
+        cfg.event_receivers = [EventReceiver(name=f"r{i}", version="1.0.0") for i in range(10)]
+        cfg.event_receiver_groups = [EventReceiverGroup(name="g0")]
+        cfg.event_receiver_fields = cfg.event_receiver_group_fields = ["id"]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            results = search(cfg)
+        assert results["event_receivers"] == [{"id": "shared"}] + [{"id": f"r{i}"} for i in range(10)]
+        assert results["event_receiver_groups"] == [{"id": "shared"}, {"id": "g0"}]
+        assert results["events"] == []
+        assert json.loads(stdout.getvalue()) == results
+        # 10 receivers in batches of 4 and one group
+        assert len(self.server.requests) == 4
+        sent = json.loads(self.server.requests[0][2])
+        assert sent["variables"]["o0"] == {"name": "r0", "version": "1.0.0"}
+
+    def test_search_bulk_jsonpath(self):
+        cfg = Config(url=self.server.url, token=None, bulk=True, jsonpath="$.event_receivers[*].id", workers=2)
+        cfg.event_receivers = [EventReceiver(name=f"r{i}") for i in range(3)]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == ['"shared"', '"r0"', '"r1"', '"r2"']
+
+    def test_search_bulk_error(self):
+        self.server._server.responder = lambda headers, body: {"data": {"e0": None}, "errors": [{"message": "boom"}]}
+        cfg = Config(url=self.server.url, token=None, bulk=True)
+        cfg.events = [Event(name="e0")]
+        with self.assertRaises(errors.GraphQLError):
+            search(cfg)
+
+
+class SearchProjectionTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(SearchProjectionTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        operation = query["query"].split("{", 1)[1].split("(", 1)[0]
+        params = query["variables"]["obj"]
+        return {"data": {operation: [{"id": params["name"], "name": params["name"], "version": "1.0.0"}]}}
+
+    def selections(self):
+        return [json.loads(body)["query"].rsplit("{", 1)[1] for _, _, body in self.server.requests]
+
+    def test_search_jsonpath_projection(self):
+        cfg = Config(url=self.server.url, token=None, jsonpath="$.events[*].name")
+        cfg.events = [Event(name="e0")]
+        cfg.event_receivers = [EventReceiver(name="r0")]
+        with mock.patch("sys.stdout", new_callable=io.StringIO):
+            search(cfg)
+        assert self.selections() == [" name }}", " id }}"]
+
+    def test_search_template(self):
+        cfg = Config(url=self.server.url, token=None, template="{name} {version}")
+        cfg.event_receivers = [EventReceiver(name="r0"), EventReceiver(name="r1")]
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == ["r0 1.0.0", "r1 1.0.0"]
+        assert self.selections() == [" name,version }}", " name,version }}"]
+
+    def test_search_template_receiver_fields(self):
+        # type is not a field of Event, which is not searched here
+        cfg = Config(url=self.server.url, token=None, template="{id} {type}")
+        cfg.event_receivers = [EventReceiver(name="r0")]
+        self.server._server.responder = lambda headers, body: {
+            "data": {"event_receivers": [{"id": "r0", "type": "dev.cdevents.foo"}]}
+        }
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            search(cfg)
+        assert stdout.getvalue().splitlines() == ["r0 dev.cdevents.foo"]
+        assert self.selections() == [" id,type }}"]
+
+    def test_search_defaults_without_projection(self):
+        cfg = Config(url=self.server.url, token=None, jsonpath="$..name")
+        cfg.event_receivers = [EventReceiver(name="r0")]
+        with mock.patch("sys.stdout", new_callable=io.StringIO):
+            search(cfg)
+        assert self.selections() == [" id,name,type,version,description,schema,fingerprint,created_at }}"]
+
+    def test_search_unknown_field(self):
+        cfg = Config(url=self.server.url, token=None, template="{nmae}")
+        cfg.events = [Event(name="e0")]
+        self.assertRaises(errors.InvalidKeyError, search, cfg)
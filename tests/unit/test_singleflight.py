@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from epr.aio import AsyncClient
+from epr.client import Client
+from epr.singleflight import AsyncSingleFlight, SingleFlight
+from tests import base
+
+
+class SingleFlightTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(SingleFlightTestCase, self).setUp()
+        self.flights = SingleFlight()
+        self.release = threading.Event()
+        self.runs = 0
+
+    def slow(self, value="ok"):
+        def fn():
+            self.runs += 1
+            self.release.wait(5)
+            return value
+
+        return fn
+
+    def run_threads(self, calls):
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            futures = [pool.submit(self.flights.do, key, fn) for key, fn in calls]
+            while self.flights.calls < len(calls):
+                time.sleep(0.001)
+            self.release.set()
+            return [f.result() for f in futures]
+
+    def test_coalesces_identical_calls(self):
+        results = self.run_threads([("a", self.slow())] * 8)
+        assert results == ["ok"] * 8
+        assert self.runs == 1
+        assert self.flights.stats == {"calls": 8, "coalesced": 7, "in_flight": 0}
+
+    def test_distinct_keys(self):
+        results = self.run_threads([("a", self.slow("a")), ("b", self.slow("b")), ("a", self.slow("c"))])
+        assert results == ["a", "b", "a"]
+        assert self.runs == 2
+
+    def test_sequential_calls_not_coalesced(self):
+        self.release.set()
+        assert self.flights.do("a", self.slow()) == "ok"
+        assert self.flights.do("a", self.slow()) == "ok"
+        assert self.runs == 2
+        assert self.flights.coalesced == 0
+
+    def test_error_shared(self):
+        def fail():
+            self.release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(self.flights.do, "a", fail) for _ in range(3)]
+            while self.flights.calls < 3:
+                time.sleep(0.001)
+            self.release.set()
+            for future in futures:
+                self.assertRaises(ValueError, future.result)
+        assert self.flights.stats["in_flight"] == 0
+
+    def test_async(self):
+        flights = AsyncSingleFlight()
+        runs = []
+
+        async def fn():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        async def main():
+            return await asyncio.gather(*[flights.do("a", fn) for _ in range(5)], flights.do("b", fn))
+
+        assert asyncio.run(main()) == ["ok"] * 6
+        assert len(runs) == 2
+        assert flights.stats == {"calls": 6, "coalesced": 4, "in_flight": 0}
+
+
+class ClientSingleFlightTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientSingleFlightTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+
+    def respond(self, headers, body):
+        time.sleep(0.1)
+        name = json.loads(body)["variables"]["obj"]["name"]
+        return {"data": {"event_receivers": [{"id": name}]}}
+
+    def test_client_coalesces(self):
+        with Client(self.server.url, maxsize=8, coalesce=True) as client:
+            names = ["foo"] * 8 + ["bar"] * 4
+            with ThreadPoolExecutor(max_workers=len(names)) as pool:
+                results = list(pool.map(lambda n: client.search_event_receivers(params={"name": n}), names))
+            assert [r["data"]["event_receivers"][0]["id"] for r in results] == names
+            assert len(self.server.requests) == 2
+            assert client.flights.stats == {"calls": 12, "coalesced": 10, "in_flight": 0}
+
+    def test_async_client_coalesces(self):
+        async def main():
+            async with AsyncClient(self.server.url, coalesce=True) as client:
+                results = await asyncio.gather(
+                    *[client.search_event_receivers(params={"name": "foo"}) for _ in range(6)]
+                )
+                return results, client.flights.stats
+
+        results, stats = asyncio.run(main())
+        assert all(r["data"]["event_receivers"] == [{"id": "foo"}] for r in results)
+        assert len(self.server.requests) == 1
+        assert stats["coalesced"] == 5
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: © 2024 Brett Smith <xbcsmith@gmail.com>
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+from epr import errors
+from epr.client import Client
+from epr.stream import iter_json_array
+from tests import base
+
+
+def chunked(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class StreamTestCase(base.BaseTestCase):
+    def test_items_across_chunk_boundaries(self):
+        events = [{"id": str(i), "name": "é" * (i % 5), "payload": {"n": [i, None]}} for i in range(200)]
+        events += [12345, 1.5e-07, True, None, "}]"]
+        document = json.dumps({"extensions": {"x": [1, {"data": 2}]}, "data": {"events": events}}).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(document)):
+            assert list(iter_json_array(chunked(document, size), ("data", "events"))) == events
+
+    def test_items_are_yielded_before_the_end(self):
+        chunks = iter([b'{"data": {"events": [{"id": "1"}, ', b'{"id": "2"}'])
+        items = iter_json_array(chunks, ("data", "events"))
+        assert next(items) == {"id": "1"}
+
+    def test_empty_and_null(self):
+        assert list(iter_json_array([b'{"data": {"events": []}}'], ("data", "events"))) == []
+        assert list(iter_json_array([b'{"data": {"events": null}}'], ("data", "events"))) == []
+        assert list(iter_json_array([b"{}"], ("data", "events"))) == []
+
+    def test_errors(self):
+        document = b'{"data": null, "errors": [{"message": "bad input"}]}'
+        with self.assertRaises(errors.GraphQLError):
+            list(iter_json_array([document], ("data", "events")))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"data": {"events": [{"id": 1}'], ("data", "events")))
+
+
+class ClientIterSearchTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ClientIterSearchTestCase, self).setUp()
+        self.server = base.StubServer(self.respond).start()
+        self.addCleanup(self.server.stop)
+        self.client = Client(self.server.url)
+        self.addCleanup(self.client.close)
+
+    def respond(self, headers, body):
+        query = json.loads(body)
+        assert "events(" in query["query"]
+        return {"data": {"events": [{"id": str(i), "name": "foo"} for i in range(1000)]}}
+
+    def test_iter_search_events(self):
+        hits = list(self.client.iter_search_events(params={"name": "foo"}, fields=["id", "name"], chunk_size=256))
+        assert [hit["id"] for hit in hits] == [str(i) for i in range(1000)]
+
+    def test_iter_search_events_stopped_early(self):
+        hits = self.client.iter_search_events(params={"name": "foo"}, fields=["id"], chunk_size=256)
+        assert next(hits)["id"] == "0"
+        hits.close()
+        assert len(list(self.client.iter_search_events(params={"name": "foo"}, fields=["id"]))) == 1000
+        assert len(self.server.requests) == 2